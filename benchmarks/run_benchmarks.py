@@ -0,0 +1,295 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from importlib import metadata
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+from Archives.client import ArchivesApiClient
+from Archives.mirror import ArchiveMirror
+from Assets.client import AssetsApiClient
+from Assets.dtos import AssetInfoPathParams, ListAssetsQueryParameters
+from Assets.enums import AssetStatus, AssetType
+from Assets.query import AssetQuery
+from Tokens.client import TokensApiClient
+from Tokens.dtos import ListTokensQueryParameters
+from User.client import UserApiClient
+from concurrency import map_bounded
+from http_client import AsyncClient
+from instrumentation import Instrumentation, RequestMetrics
+from stand_in_server import IonStandInServer, StandInConfig
+
+logger = logging.getLogger(__name__)
+
+REGRESSION_THRESHOLD = 0.1
+
+
+class DurationRecorder:
+    def __init__(self):
+        self.durations: List[float] = []
+
+    def on_request_end(self, metrics: RequestMetrics) -> None:
+        self.durations.append(metrics.duration)
+
+
+async def list_assets(http_client: AsyncClient, config: StandInConfig) -> None:
+    client = AssetsApiClient(http_client)
+    async for _ in client.iterate_assets(ListAssetsQueryParameters(limit=100)):
+        pass
+
+
+async def list_assets_filtered(http_client: AsyncClient, config: StandInConfig) -> None:
+    # Many small pages with search and status filters keep URL building hot.
+    client = AssetsApiClient(http_client)
+    query_params = ListAssetsQueryParameters(
+        limit=10,
+        search="asset",
+        status=[AssetStatus.COMPLETE],
+        type=[AssetType.THREEDTILES],
+    )
+    async for _ in client.iterate_assets(query_params):
+        pass
+
+
+async def list_tokens(http_client: AsyncClient, config: StandInConfig) -> None:
+    client = TokensApiClient(http_client)
+    async for _ in client.iterate_tokens(ListTokensQueryParameters(limit=100)):
+        pass
+
+
+async def bulk_get_assets(http_client: AsyncClient, config: StandInConfig) -> None:
+    client = AssetsApiClient(http_client)
+    await map_bounded(
+        lambda asset_id: client.get_info_about_asset(
+            AssetInfoPathParams(assetId=asset_id)
+        ),
+        range(1, config.asset_count + 1),
+        limit=20,
+    )
+
+
+async def get_profile(http_client: AsyncClient, config: StandInConfig) -> None:
+    client = UserApiClient(http_client)
+    await map_bounded(lambda _: client.get_profile_info(), range(200), limit=20)
+
+
+async def download_archives(http_client: AsyncClient, config: StandInConfig) -> None:
+    with tempfile.TemporaryDirectory() as destination:
+        mirror = ArchiveMirror(
+            AssetsApiClient(http_client),
+            ArchivesApiClient(http_client),
+            destination,
+            concurrency=4,
+            poll_interval=0,
+        )
+        await mirror.run(AssetQuery(max_results=20))
+
+
+SCENARIOS: Dict[str, Callable[[AsyncClient, StandInConfig], Awaitable[None]]] = {
+    "list_assets": list_assets,
+    "list_assets_filtered": list_assets_filtered,
+    "list_tokens": list_tokens,
+    "bulk_get_assets": bulk_get_assets,
+    "get_profile": get_profile,
+    "download_archives": download_archives,
+}
+
+# Cold import of the module in a fresh interpreter, the clients are meant to be
+# cheap to import and to load their transport and DTOs on first use.
+IMPORT_SCENARIOS: Dict[str, str] = {
+    "import_http_client": "http_client",
+    "import_client_factory": "client_factory",
+}
+IMPORT_TIMER = """
+import time
+started = time.perf_counter()
+import {module}
+print(time.perf_counter() - started)
+"""
+
+
+async def run_scenario(
+    name: str, config: StandInConfig, repeat: int
+) -> Dict[str, float]:
+    recorder = DurationRecorder()
+    async with IonStandInServer(config) as server:
+        async with AsyncClient(
+            server.url, "benchmark-token", instrumentation=Instrumentation([recorder])
+        ) as http_client:
+            errors = 0
+            started = time.perf_counter()
+            for _ in range(repeat):
+                errors += await _run_once(name, http_client, config)
+            elapsed = time.perf_counter() - started
+            durations = sorted(recorder.durations)
+
+            # Memory is traced in a separate pass, tracemalloc skews timings.
+            tracemalloc.start()
+            await _run_once(name, http_client, config)
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    return {
+        "requests": len(durations),
+        "errors": errors,
+        "requests_per_second": len(durations) / elapsed,
+        "p50_ms": _percentile(durations, 50) * 1000,
+        "p99_ms": _percentile(durations, 99) * 1000,
+        "mean_ms": statistics.fmean(durations) * 1000 if durations else 0.0,
+        "peak_memory_kib": peak_memory / 1024,
+    }
+
+
+def run_import_scenario(name: str, repeat: int) -> Dict[str, float]:
+    src_path = Path(sys.modules["http_client"].__file__).parent
+    environment = {**os.environ, "PYTHONPATH": str(src_path)}
+    durations = []
+    errors = 0
+    for _ in range(repeat):
+        try:
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    IMPORT_TIMER.format(module=IMPORT_SCENARIOS[name]),
+                ],
+                capture_output=True,
+                check=True,
+                env=environment,
+                text=True,
+            )
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Benchmark scenario {name} has failed: {e.stderr}")
+            errors += 1
+            continue
+        durations.append(float(result.stdout))
+
+    return {
+        "errors": errors,
+        "import_ms": statistics.median(durations) * 1000 if durations else 0.0,
+    }
+
+
+async def _run_once(name: str, http_client: AsyncClient, config: StandInConfig) -> int:
+    try:
+        await SCENARIOS[name](http_client, config)
+    except Exception:
+        logger.exception(f"Benchmark scenario {name} has failed.")
+        return 1
+    return 0
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]
+) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if "requests_per_second" in result and result["requests_per_second"] < previous[
+            "requests_per_second"
+        ] * (1 - REGRESSION_THRESHOLD):
+            regressions.append(
+                f"{name}: requests/s dropped from {previous['requests_per_second']:.1f} "
+                f"to {result['requests_per_second']:.1f}"
+            )
+        for key in ("p99_ms", "peak_memory_kib", "import_ms"):
+            if key not in result or key not in previous:
+                continue
+            if result[key] > previous[key] * (1 + REGRESSION_THRESHOLD):
+                regressions.append(
+                    f"{name}: {key} grew from {previous[key]:.1f} to {result[key]:.1f}"
+                )
+    return regressions
+
+
+def _percentile(values: List[float], percentile: int) -> float:
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, round(percentile / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def _version() -> str:
+    try:
+        return metadata.version("cesium-ion-api-client")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+async def main(arguments: argparse.Namespace) -> int:
+    config = StandInConfig(
+        asset_count=arguments.assets,
+        token_count=arguments.tokens,
+        latency=arguments.latency,
+        max_page_size=arguments.page_size,
+        error_rate=arguments.error_rate,
+    )
+    scenarios = arguments.scenario or [*SCENARIOS, *IMPORT_SCENARIOS]
+    results = {}
+    for name in scenarios:
+        if name in IMPORT_SCENARIOS:
+            results[name] = run_import_scenario(name, arguments.repeat)
+            print(
+                f"{name:>20}: {results[name]['import_ms']:8.1f} ms  "
+                f"failed runs {results[name]['errors']}"
+            )
+            continue
+        results[name] = await run_scenario(name, config, arguments.repeat)
+        print(
+            f"{name:>20}: {results[name]['requests_per_second']:8.1f} req/s  "
+            f"p50 {results[name]['p50_ms']:6.2f} ms  "
+            f"p99 {results[name]['p99_ms']:6.2f} ms  "
+            f"peak {results[name]['peak_memory_kib']:8.1f} KiB  "
+            f"failed runs {results[name]['errors']}"
+        )
+
+    if arguments.output:
+        arguments.output.write_text(
+            json.dumps({"version": _version(), "results": results}, indent=2)
+        )
+
+    # Timings of runs that broke off early are meaningless, unless failures
+    # were injected on purpose with --error-rate.
+    failures = [
+        name
+        for name, result in results.items()
+        if result["errors"] and not arguments.error_rate
+    ]
+    for name in failures:
+        print(f"FAILED {name}: {results[name]['errors']} of the runs raised")
+
+    regressions = []
+    if arguments.baseline:
+        baseline = json.loads(arguments.baseline.read_text())["results"]
+        regressions = find_regressions(results, baseline)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+    return 1 if failures or regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the API clients against a local Cesium ion stand-in."
+    )
+    parser.add_argument(
+        "--scenario", action="append", choices=[*SCENARIOS, *IMPORT_SCENARIOS]
+    )
+    parser.add_argument("--assets", type=int, default=1000)
+    parser.add_argument("--tokens", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -1,9 +1,20 @@
+import asyncio
 import logging
-from typing import Dict
+from pathlib import Path
+from typing import (
+    AsyncContextManager,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from Archives.dtos import (
     ListArchivesPathParams,
     ListArchivesResponse,
+    ArchiveMetadata,
     CreateArchivePathParams,
     CreateArchiveRequest,
     CreateArchiveResponse,
@@ -12,7 +23,11 @@ from Archives.dtos import (
     DeleteArchivePathParams,
     DownloadArchivePathParams,
 )
-from http_client import HTTPClientProtocol
+from dtos import PaginationLinks
+from http_client import STREAM_CHUNK_BYTES, HTTPClientProtocol, StreamedResponse
+from instrumentation import operation
+from pagination import iterate_link_pages
+import routes
 
 logger = logging.getLogger(__name__)
 
@@ -24,21 +39,57 @@ class ArchivesApiClient:
     async def list_archive(
         self, path_params: ListArchivesPathParams
     ) -> ListArchivesResponse:
-        endpoint_url = f"/v1/assets/{path_params.asset_id}/archives"
+        endpoint_url = routes.ARCHIVES.path(asset_id=path_params.asset_id)
+        list_archives_response, _ = await self._list_archives_page(endpoint_url)
+        return list_archives_response
+
+    def iterate_archives(
+        self, path_params: ListArchivesPathParams, prefetch: bool = False
+    ) -> AsyncIterator[ArchiveMetadata]:
+        endpoint_url = routes.ARCHIVES.path(asset_id=path_params.asset_id)
+        return iterate_link_pages(self._fetch_archives_items, endpoint_url, prefetch)
+
+    @operation("list_archive")
+    async def _list_archives_page(
+        self, endpoint_url: str
+    ) -> Tuple[ListArchivesResponse, Optional[PaginationLinks]]:
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
         )
+        pagination_links = await self._retrieve_pagination_links(dict(headers))
         list_archives_response = ListArchivesResponse.parse_obj(response_body)
-        return list_archives_response
+        return list_archives_response, pagination_links
+
+    async def _fetch_archives_items(
+        self, endpoint_url: str
+    ) -> Tuple[List[ArchiveMetadata], Optional[PaginationLinks]]:
+        list_archives_response, pagination_links = await self._list_archives_page(
+            endpoint_url
+        )
+        return list_archives_response.items or [], pagination_links
+
+    async def _retrieve_pagination_links(
+        self, headers: Dict
+    ) -> Optional[PaginationLinks]:
+        try:
+            link_header = headers["Link"]
+        except KeyError:
+            logging.debug("`Link` header is NOT present in the response.`")
+            pagination_links = None
+        else:
+            logging.debug("`Link` header is present in the response.`")
+            pagination_links = PaginationLinks.from_header(link_header)
+        return pagination_links
 
+    @operation("create_archive")
     async def create_archive(
         self,
         path_params: CreateArchivePathParams,
         request_body_dto: CreateArchiveRequest,
     ) -> CreateArchiveResponse:
-        endpoint_url = f"/v1/assets/{path_params.asset_id}/archives"
+        endpoint_url = routes.ARCHIVES.path(asset_id=path_params.asset_id)
         headers = {"Content-type": "application/json"}
-        request_body = request_body_dto.dict()
+        request_body = request_body_dto.dict(by_alias=True, exclude_none=True)
 
         status, response_body, headers = await self._http_client.post(
             endpoint=endpoint_url, headers=headers, data=request_body
@@ -46,11 +97,12 @@ class ArchivesApiClient:
         create_archive_response = CreateArchiveResponse.parse_obj(response_body)
         return create_archive_response
 
+    @operation("get_info_about_archive")
     async def get_info_about_archive(
         self, path_params: GetArchivePathParams
     ) -> GetArchiveResponse:
-        endpoint_url = (
-            f"/v1/assets/{path_params.asset_id}/archives/{path_params.archive_id}"
+        endpoint_url = routes.ARCHIVE.path(
+            asset_id=path_params.asset_id, archive_id=path_params.archive_id
         )
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
@@ -58,16 +110,54 @@ class ArchivesApiClient:
         get_info_response = GetArchiveResponse.parse_obj(response_body)
         return get_info_response
 
+    @operation("delete_archive")
     async def delete_archive(self, path_params: DeleteArchivePathParams) -> None:
-        endpoint_url = (
-            f"/v1/assets/{path_params.asset_id}/archives/{path_params.archive_id}"
+        endpoint_url = routes.ARCHIVE.path(
+            asset_id=path_params.asset_id, archive_id=path_params.archive_id
         )
         await self._http_client.delete(endpoint=endpoint_url, headers={})
 
     # TODO: handle downloaded object
+    @operation("download_archive")
     async def download_archive(self, path_params: DownloadArchivePathParams) -> Dict:
-        endpoint_url = f"/v1/assets/{path_params.asset_id}/archives/{path_params.archive_id}/download"  # noqa: F501
+        endpoint_url = routes.ARCHIVE_DOWNLOAD.path(
+            asset_id=path_params.asset_id, archive_id=path_params.archive_id
+        )
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
         )
         return response_body
+
+    def stream_archive(
+        self,
+        path_params: DownloadArchivePathParams,
+        chunk_size: int = STREAM_CHUNK_BYTES,
+    ) -> AsyncContextManager[StreamedResponse]:
+        endpoint_url = routes.ARCHIVE_DOWNLOAD.path(
+            asset_id=path_params.asset_id, archive_id=path_params.archive_id
+        )
+        return self._http_client.stream(
+            endpoint=endpoint_url, headers={}, chunk_size=chunk_size
+        )
+
+    @operation("download_archive")
+    async def download_archive_to_file(
+        self,
+        path_params: DownloadArchivePathParams,
+        destination: Union[str, Path],
+        chunk_size: int = STREAM_CHUNK_BYTES,
+    ) -> int:
+        destination = Path(destination)
+        partial = destination.with_name(destination.name + ".part")
+        written = 0
+        try:
+            async with self.stream_archive(path_params, chunk_size) as response:
+                with open(partial, "wb") as f:
+                    async for chunk in response.chunks:
+                        await asyncio.to_thread(f.write, chunk)
+                        written += len(chunk)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        partial.replace(destination)
+        return written
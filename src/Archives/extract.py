@@ -0,0 +1,468 @@
+import asyncio
+import logging
+import mmap
+import os
+import queue
+import struct
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from Archives.client import ArchivesApiClient
+from Archives.dtos import DownloadArchivePathParams
+from exceptions import ArchiveExtractionError, UnsupportedZipStreamError
+from http_client import STREAM_CHUNK_BYTES
+from instrumentation import operation
+
+logger = logging.getLogger(__name__)
+
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+LOCAL_HEADER_SIGNATURE = 0x04034B50
+DATA_DESCRIPTOR_MAGIC = b"PK\x07\x08"
+ZIP64_EXTRA_ID = 0x0001
+FLAG_ENCRYPTED = 0x1
+FLAG_DATA_DESCRIPTOR = 0x8
+FLAG_UTF8 = 0x800
+WRITE_CHUNK_BYTES = 1024 * 1024
+# Chunks waiting for an entry's writer before the download waits for it.
+ENTRY_QUEUE_CHUNKS = 4
+
+
+@dataclass
+class ZipEntry:
+    name: str
+    method: int
+    # Entries followed by a data descriptor only learn their CRC from it.
+    crc: int
+
+
+@dataclass
+class EntryEnd:
+    crc: int
+
+
+# The parser emits an entry, then its raw (still compressed) data in pieces,
+# then its end.
+ZipEvent = Union[ZipEntry, bytes, EntryEnd]
+
+
+class ZipStreamParser:
+    def __init__(self):
+        self.finished = False
+        self._buffer = bytearray()
+        self._state = "header"
+        self._events: List[ZipEvent] = []
+        self._entry: Optional[ZipEntry] = None
+        self._zip64 = False
+        self._remaining = 0
+        self._scanned = 0
+
+    def feed(self, data: bytes) -> List[ZipEvent]:
+        if self.finished:
+            return []
+        self._buffer += data
+        while not self.finished and getattr(self, f"_read_{self._state}")():
+            pass
+        events, self._events = self._events, []
+        return events
+
+    def close(self) -> None:
+        if self.finished:
+            return
+        if self._state == "scan":
+            raise UnsupportedZipStreamError(
+                f"Data descriptor of entry `{self._entry.name}` has not been found."
+            )
+        raise ArchiveExtractionError(
+            "Archive stream has ended before its central directory."
+        )
+
+    def _read_header(self) -> bool:
+        if len(self._buffer) < 4:
+            return False
+        if struct.unpack_from("<I", self._buffer)[0] != LOCAL_HEADER_SIGNATURE:
+            # The central directory follows the last entry.
+            self.finished = True
+            self._buffer.clear()
+            return False
+        if len(self._buffer) < LOCAL_HEADER.size:
+            return False
+        fields = LOCAL_HEADER.unpack_from(self._buffer)
+        flags, method, crc, compressed_size = fields[2], fields[3], fields[6], fields[7]
+        name_end = LOCAL_HEADER.size + fields[9]
+        header_end = name_end + fields[10]
+        if len(self._buffer) < header_end:
+            return False
+        raw_name = bytes(self._buffer[LOCAL_HEADER.size : name_end])
+        zip64_sizes = _zip64_sizes(bytes(self._buffer[name_end:header_end]))
+        del self._buffer[:header_end]
+
+        name = raw_name.decode("utf-8" if flags & FLAG_UTF8 else "cp437")
+        if flags & FLAG_ENCRYPTED:
+            raise UnsupportedZipStreamError(f"Entry `{name}` is encrypted.")
+        if method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise UnsupportedZipStreamError(
+                f"Entry `{name}` uses unsupported compression method {method}."
+            )
+        self._entry = ZipEntry(name, method, crc)
+        self._events.append(self._entry)
+        self._zip64 = zip64_sizes is not None
+        if flags & FLAG_DATA_DESCRIPTOR:
+            self._scanned = 0
+            self._state = "scan"
+        else:
+            if zip64_sizes is not None and compressed_size == 0xFFFFFFFF:
+                compressed_size = zip64_sizes[1]
+            self._remaining = compressed_size
+            self._state = "data"
+        return True
+
+    def _read_data(self) -> bool:
+        take = min(self._remaining, len(self._buffer))
+        if take:
+            self._events.append(bytes(self._buffer[:take]))
+            del self._buffer[:take]
+            self._remaining -= take
+        if self._remaining:
+            return False
+        self._events.append(EntryEnd(self._entry.crc))
+        self._state = "header"
+        return True
+
+    def _read_scan(self) -> bool:
+        # The entry ends at the first descriptor signature whose compressed
+        # size matches the bytes seen so far. Nothing is inflated here, the
+        # CRC check in the writer catches the (unlikely) false match.
+        size_format, size_mask = (
+            ("<Q", 2**64 - 1) if self._zip64 else ("<I", 2**32 - 1)
+        )
+        descriptor_length = 8 + 2 * struct.calcsize(size_format)
+        position = self._buffer.find(DATA_DESCRIPTOR_MAGIC)
+        while position != -1 and len(self._buffer) >= position + descriptor_length:
+            crc, compressed_size = struct.unpack_from(
+                f"<I{size_format[1]}", self._buffer, position + 4
+            )
+            if compressed_size == (self._scanned + position) & size_mask:
+                if position:
+                    self._events.append(bytes(self._buffer[:position]))
+                del self._buffer[: position + descriptor_length]
+                self._events.append(EntryEnd(crc))
+                self._state = "header"
+                return True
+            position = self._buffer.find(DATA_DESCRIPTOR_MAGIC, position + 1)
+
+        # Everything before a candidate that is still incomplete (or before a
+        # possibly split signature) is entry data.
+        keep_from = position if position != -1 else max(len(self._buffer) - 3, 0)
+        if keep_from:
+            self._events.append(bytes(self._buffer[:keep_from]))
+            del self._buffer[:keep_from]
+            self._scanned += keep_from
+        return False
+
+
+def _zip64_sizes(extra: bytes) -> Optional[Tuple[int, int]]:
+    offset = 0
+    while offset + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<HH", extra, offset)
+        if header_id == ZIP64_EXTRA_ID and length >= 16:
+            return struct.unpack_from("<QQ", extra, offset + 4)
+        offset += 4 + length
+    return None
+
+
+def safe_path(destination: Path, name: str) -> Path:
+    path = PurePosixPath(name.replace("\\", "/"))
+    if (
+        not path.parts
+        or path.is_absolute()
+        or ".." in path.parts
+        or ":" in path.parts[0]
+    ):
+        raise ArchiveExtractionError(f"Entry `{name}` points outside of {destination}.")
+    return destination.joinpath(*path.parts)
+
+
+def write_entry(
+    destination: Path, entry: ZipEntry, chunks: Iterable[bytes]
+) -> Optional[Path]:
+    path = safe_path(destination, entry.name)
+    if entry.name.endswith("/"):
+        path.mkdir(parents=True, exist_ok=True)
+        return None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = path.with_name(f"{path.name}.part")
+    crc = 0
+    try:
+        with open(partial_path, "wb") as f:
+            for data in _decoded(entry, chunks):
+                crc = zlib.crc32(data, crc)
+                f.write(data)
+        # Read after the chunks, a data descriptor sets it at the very end.
+        if crc != entry.crc:
+            raise ArchiveExtractionError(f"Entry `{entry.name}` has a bad CRC.")
+        os.replace(partial_path, path)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def _decoded(entry: ZipEntry, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    if entry.method == zipfile.ZIP_STORED:
+        yield from chunks
+        return
+    # Output is capped per call, a small chunk of a highly compressed entry
+    # does not inflate into memory all at once.
+    inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = inflater.decompress(chunk, WRITE_CHUNK_BYTES)
+        yield data
+        while inflater.unconsumed_tail:
+            yield inflater.decompress(inflater.unconsumed_tail, WRITE_CHUNK_BYTES)
+    yield inflater.flush()
+    if not inflater.eof:
+        raise ArchiveExtractionError(f"Entry `{entry.name}` is truncated.")
+
+
+def _write_queued_entry(
+    destination: Path, entry: ZipEntry, chunks: queue.Queue
+) -> Optional[Path]:
+    def received() -> Iterator[bytes]:
+        while True:
+            item = chunks.get()
+            if item is None:
+                raise ArchiveExtractionError(
+                    f"Extraction of `{entry.name}` has been aborted."
+                )
+            if isinstance(item, EntryEnd):
+                entry.crc = item.crc
+                return
+            yield item
+
+    items = received()
+    try:
+        return write_entry(destination, entry, items)
+    finally:
+        # A failed writer keeps taking chunks, so the download never waits on it.
+        for _ in items:
+            pass
+
+
+class StreamingZipExtractor:
+    def __init__(
+        self,
+        destination: Union[str, Path],
+        max_workers: int = 4,
+        skip: Optional[Set[str]] = None,
+    ):
+        self.destination = Path(destination)
+        self.extracted: List[Path] = []
+        self._skip = skip or set()
+        self._parser = ZipStreamParser()
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._pending: Set[asyncio.Future] = set()
+        self._chunks: Optional[queue.Queue] = None
+        self._skipping = False
+
+    async def __aenter__(self) -> "StreamingZipExtractor":
+        self.destination.mkdir(parents=True, exist_ok=True)
+        return self
+
+    async def __aexit__(self, exc_type, *exc_info) -> None:
+        try:
+            if exc_type is None:
+                await self._drain(0)
+        finally:
+            await self.abort()
+            self._executor.shutdown(wait=True)
+
+    @property
+    def names(self) -> Set[str]:
+        return {
+            path.relative_to(self.destination).as_posix() for path in self.extracted
+        }
+
+    async def feed(self, chunk: bytes) -> None:
+        loop = asyncio.get_running_loop()
+        for event in self._parser.feed(chunk):
+            if isinstance(event, ZipEntry):
+                self._skipping = event.name in self._skip
+                if self._skipping:
+                    continue
+                # Every writer gets a thread of its own, a queued one could
+                # not take the chunks sent to it.
+                await self._drain(self._max_workers - 1)
+                self._chunks = queue.Queue(ENTRY_QUEUE_CHUNKS)
+                self._pending.add(
+                    loop.run_in_executor(
+                        self._executor,
+                        _write_queued_entry,
+                        self.destination,
+                        event,
+                        self._chunks,
+                    )
+                )
+            elif not self._skipping:
+                await _put(self._chunks, event)
+                if isinstance(event, EntryEnd):
+                    self._chunks = None
+
+    def finish(self) -> None:
+        self._parser.close()
+
+    async def abort(self) -> None:
+        # Stops the entry being received, its partial file is removed.
+        if self._chunks is not None:
+            await _put(self._chunks, None)
+            self._chunks = None
+        if self._pending:
+            await asyncio.wait(self._pending)
+            for future in self._pending:
+                if future.exception() is None and future.result() is not None:
+                    self.extracted.append(future.result())
+            self._pending = set()
+
+    async def _drain(self, max_pending: int) -> None:
+        while len(self._pending) > max_pending:
+            done, self._pending = await asyncio.wait(
+                self._pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                path = future.result()
+                if path is not None:
+                    self.extracted.append(path)
+
+
+async def _put(chunks: queue.Queue, item: Optional[ZipEvent]) -> None:
+    try:
+        chunks.put_nowait(item)
+    except queue.Full:
+        # The writer is behind the download, wait for it off the event loop.
+        await asyncio.to_thread(chunks.put, item)
+
+
+async def extract_archive_file(
+    archive_path: Union[str, Path],
+    destination: Union[str, Path],
+    max_workers: int = 4,
+    skip: Optional[Set[str]] = None,
+) -> List[Path]:
+    destination = Path(destination)
+    skip = skip or set()
+    loop = asyncio.get_running_loop()
+    with open(archive_path, "rb") as f, zipfile.ZipFile(f) as archive, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped, ThreadPoolExecutor(max_workers) as executor:
+        infos = [info for info in archive.infolist() if info.filename not in skip]
+        for info in infos:
+            if info.flag_bits & FLAG_ENCRYPTED:
+                raise ArchiveExtractionError(f"Entry `{info.filename}` is encrypted.")
+        paths = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor, _extract_mapped_entry, mapped, info, destination
+                )
+                if info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+                else loop.run_in_executor(
+                    executor, _extract_zipfile_entry, archive_path, info, destination
+                )
+                for info in infos
+            )
+        )
+    return [path for path in paths if path is not None]
+
+
+def _extract_mapped_entry(
+    mapped: mmap.mmap, info: zipfile.ZipInfo, destination: Path
+) -> Optional[Path]:
+    # Each entry is read from the shared mapping in slices, workers never seek
+    # a shared file handle.
+    name_length, extra_length = struct.unpack_from(
+        "<HH", mapped, info.header_offset + 26
+    )
+    start = info.header_offset + LOCAL_HEADER.size + name_length + extra_length
+    chunks = (
+        mapped[offset : min(offset + WRITE_CHUNK_BYTES, start + info.compress_size)]
+        for offset in range(start, start + info.compress_size, WRITE_CHUNK_BYTES)
+    )
+    entry = ZipEntry(info.filename, info.compress_type, info.CRC)
+    return write_entry(destination, entry, chunks)
+
+
+def _extract_zipfile_entry(
+    archive_path: Union[str, Path], info: zipfile.ZipInfo, destination: Path
+) -> Optional[Path]:
+    # Methods the stream parser leaves alone (bzip2, lzma) are decoded by
+    # zipfile, with a handle per worker.
+    with zipfile.ZipFile(archive_path) as archive:
+        try:
+            source = archive.open(info)
+        except NotImplementedError as e:
+            raise ArchiveExtractionError(f"Entry `{info.filename}`: {str(e)}.")
+        with source:
+            entry = ZipEntry(info.filename, zipfile.ZIP_STORED, info.CRC)
+            return write_entry(
+                destination,
+                entry,
+                iter(lambda: source.read(WRITE_CHUNK_BYTES), b""),
+            )
+
+
+@operation("download_archive")
+async def download_and_extract(
+    archives_client: ArchivesApiClient,
+    path_params: DownloadArchivePathParams,
+    destination: Union[str, Path],
+    max_workers: int = 4,
+    archive_path: Optional[Union[str, Path]] = None,
+    chunk_size: int = STREAM_CHUNK_BYTES,
+) -> List[Path]:
+    archive_file: Optional[BinaryIO] = None
+    if archive_path is not None:
+        archive_path = Path(archive_path)
+        archive_file = open(archive_path, "wb")
+    try:
+        async with StreamingZipExtractor(destination, max_workers) as extractor:
+            async with archives_client.stream_archive(
+                path_params, chunk_size
+            ) as response:
+                streaming = True
+                async for chunk in response.chunks:
+                    if archive_file is not None:
+                        await asyncio.to_thread(archive_file.write, chunk)
+                    if streaming:
+                        try:
+                            await extractor.feed(chunk)
+                        except UnsupportedZipStreamError as e:
+                            streaming = await _fall_back(extractor, archive_file, e)
+                if streaming:
+                    try:
+                        extractor.finish()
+                    except UnsupportedZipStreamError as e:
+                        streaming = await _fall_back(extractor, archive_file, e)
+    finally:
+        if archive_file is not None:
+            archive_file.close()
+
+    if streaming:
+        return extractor.extracted
+    return extractor.extracted + await extract_archive_file(
+        archive_path, destination, max_workers, skip=extractor.names
+    )
+
+
+async def _fall_back(
+    extractor: StreamingZipExtractor,
+    archive_file: Optional[BinaryIO],
+    error: UnsupportedZipStreamError,
+) -> bool:
+    if archive_file is None:
+        raise error
+    logger.info(f"Falling back to extracting the downloaded file: {str(error)}.")
+    await extractor.abort()
+    return False
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from Archives.client import ArchivesApiClient
+from Archives.dtos import (
+    CreateArchivePathParams,
+    CreateArchiveRequest,
+    DownloadArchivePathParams,
+    GetArchivePathParams,
+    GetArchiveResponse,
+)
+from Archives.enums import ArchiveStatus
+from Archives.extract import download_and_extract
+from Assets.client import AssetsApiClient
+from Assets.dtos import AssetMetadata
+from Assets.query import AssetQuery
+from concurrency import ProgressCallback, map_bounded
+from exceptions import ArchiveFailedError
+from http_client import STREAM_CHUNK_BYTES
+from journal import Journal
+from polling import poll_until
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = (ArchiveStatus.COMPLETE, ArchiveStatus.ERROR)
+FINGERPRINT_FIELDS = (
+    "name",
+    "description",
+    "attribution",
+    "type",
+    "bytes",
+    "date_added",
+    "status",
+)
+
+
+def asset_fingerprint(asset: AssetMetadata) -> str:
+    fields = asset.dict(include=set(FINGERPRINT_FIELDS))
+    payload = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class MirrorResult:
+    downloaded: Dict[int, Path] = field(default_factory=dict)
+    unchanged: List[int] = field(default_factory=list)
+    failed: Dict[int, Exception] = field(default_factory=dict)
+
+
+class ArchiveMirror:
+    JOURNAL_NAME = ".mirror-journal.jsonl"
+
+    def __init__(
+        self,
+        assets_client: AssetsApiClient,
+        archives_client: ArchivesApiClient,
+        destination: Union[str, Path],
+        concurrency: int = 4,
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+        chunk_size: int = STREAM_CHUNK_BYTES,
+        extract: bool = False,
+        extract_workers: int = 4,
+        progress_callback: Optional[ProgressCallback] = None,
+    ):
+        self._assets_client = assets_client
+        self._archives_client = archives_client
+        self.destination = Path(destination)
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._chunk_size = chunk_size
+        self._extract = extract
+        self._extract_workers = extract_workers
+        self._progress_callback = progress_callback
+
+    def path_for(self, asset_id: int) -> Path:
+        return self.destination / f"{asset_id}.zip"
+
+    def extracted_path_for(self, asset_id: int) -> Path:
+        return self.destination / str(asset_id)
+
+    async def run(self, query: Optional[AssetQuery] = None) -> MirrorResult:
+        self.destination.mkdir(parents=True, exist_ok=True)
+        query = (query or AssetQuery()).copy(update={"archivable": True})
+        assets = [asset async for asset in self._assets_client.query_assets(query)]
+        journal = Journal(self.destination / self.JOURNAL_NAME)
+        result = MirrorResult()
+
+        async def mirror(asset: AssetMetadata) -> None:
+            asset_id = int(asset.id)
+            try:
+                path = await self._mirror_asset(asset_id, asset, journal)
+            except Exception as e:
+                logger.warning(f"Mirroring asset {asset_id} has failed: {str(e)}.")
+                result.failed[asset_id] = e
+            else:
+                if path is None:
+                    result.unchanged.append(asset_id)
+                else:
+                    result.downloaded[asset_id] = path
+
+        await map_bounded(
+            mirror,
+            assets,
+            self._concurrency,
+            progress_callback=self._progress_callback,
+        )
+        return result
+
+    async def _mirror_asset(
+        self, asset_id: int, asset: AssetMetadata, journal: Journal
+    ) -> Optional[Path]:
+        key = str(asset_id)
+        fingerprint = asset_fingerprint(asset)
+        entry = journal.get(key) or {}
+        path = self.path_for(asset_id)
+        if entry.get("fingerprint") == fingerprint:
+            if entry.get("state") == "downloaded" and self._is_intact(path, entry):
+                return None
+            archive_id = entry.get("archive_id")
+        else:
+            archive_id = None
+
+        if archive_id is None:
+            archive = await self._archives_client.create_archive(
+                CreateArchivePathParams(assetId=asset_id), CreateArchiveRequest()
+            )
+            archive_id = archive.id
+            journal.record(
+                key, state="archived", fingerprint=fingerprint, archive_id=archive_id
+            )
+
+        archive = await self._wait_for_final_status(asset_id, archive_id)
+        if archive.status != ArchiveStatus.COMPLETE:
+            journal.record(key, state="failed", archive_id=None)
+            raise ArchiveFailedError(
+                f"Archive {archive_id} of asset {asset_id} has finished with status {archive.status.value}."
+            )
+        path_params = DownloadArchivePathParams(assetId=asset_id, archiveId=archive_id)
+        if self._extract:
+            partial = path.with_name(path.name + ".part")
+            await download_and_extract(
+                self._archives_client,
+                path_params,
+                self.extracted_path_for(asset_id),
+                self._extract_workers,
+                archive_path=partial,
+                chunk_size=self._chunk_size,
+            )
+            partial.replace(path)
+        else:
+            await self._archives_client.download_archive_to_file(
+                path_params, path, self._chunk_size
+            )
+        journal.record(key, state="downloaded", bytes_archived=archive.bytes_archived)
+        return path
+
+    def _is_intact(self, path: Path, entry: Dict) -> bool:
+        bytes_archived = entry.get("bytes_archived")
+        return path.exists() and (
+            bytes_archived is None or path.stat().st_size == bytes_archived
+        )
+
+    async def _wait_for_final_status(
+        self, asset_id: int, archive_id: int
+    ) -> GetArchiveResponse:
+        return await poll_until(
+            lambda: self._archives_client.get_info_about_archive(
+                GetArchivePathParams(assetId=asset_id, archiveId=archive_id)
+            ),
+            lambda archive: archive.status in FINAL_STATUSES,
+            interval=self._poll_interval,
+            max_interval=self._max_poll_interval,
+        )
@@ -1,9 +1,10 @@
 import logging
-from typing import Tuple, Optional, Dict, Union
+from typing import Tuple, Optional, Dict, List, Union, AsyncIterator
 
 from Assets.dtos import (
     ListAssetsQueryParameters,
     ListAssetsResponse,
+    AssetMetadata,
     CreateAssetRequest,
     CreateAssetResponse,
     AssetInfoPathParams,
@@ -14,10 +15,15 @@ from Assets.dtos import (
     AccessTilesPathParams,
     AssetEndpoints,
     ExternalAssetEndpoints,
+    OnComplete,
 )
+from Assets.query import AssetQuery
 from dtos import PaginationLinks
 from exceptions import MalformedResponseError
 from http_client import HTTPClientProtocol
+from instrumentation import operation
+from pagination import iterate_link_pages
+import routes
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +35,19 @@ class AssetsApiClient:
     async def list_assets(
         self, query_params: ListAssetsQueryParameters
     ) -> Tuple[ListAssetsResponse, Optional[PaginationLinks]]:
-        endpoint_url = "/v1/assets" + query_params.to_query_params()
+        endpoint_url = routes.ASSETS.path() + query_params.to_query_params()
+        return await self._list_assets_page(endpoint_url)
+
+    def iterate_assets(
+        self, query_params: ListAssetsQueryParameters, prefetch: bool = False
+    ) -> AsyncIterator[AssetMetadata]:
+        endpoint_url = routes.ASSETS.path() + query_params.to_query_params()
+        return iterate_link_pages(self._fetch_assets_items, endpoint_url, prefetch)
+
+    @operation("list_assets")
+    async def _list_assets_page(
+        self, endpoint_url: str
+    ) -> Tuple[ListAssetsResponse, Optional[PaginationLinks]]:
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
         )
@@ -37,6 +55,24 @@ class AssetsApiClient:
         list_assets_response = ListAssetsResponse.parse_obj(response_body)
         return list_assets_response, pagination_links
 
+    async def _fetch_assets_items(
+        self, endpoint_url: str
+    ) -> Tuple[List[AssetMetadata], Optional[PaginationLinks]]:
+        list_assets_response, pagination_links = await self._list_assets_page(
+            endpoint_url
+        )
+        return list_assets_response.items, pagination_links
+
+    async def query_assets(self, query: AssetQuery) -> AsyncIterator[AssetMetadata]:
+        matched = 0
+        async for asset in self.iterate_assets(query.to_list_query_parameters()):
+            if not query.matches(asset):
+                continue
+            yield asset
+            matched += 1
+            if query.max_results is not None and matched >= query.max_results:
+                break
+
     async def _retrieve_pagination_links(
         self, headers: Dict
     ) -> Optional[PaginationLinks]:
@@ -50,12 +86,13 @@ class AssetsApiClient:
             pagination_links = PaginationLinks.from_header(link_header)
         return pagination_links
 
+    @operation("create_a_new_asset")
     async def create_a_new_asset(
         self, request_body_dto: CreateAssetRequest
     ) -> CreateAssetResponse:
-        endpoint_url = "/v1/assets"
+        endpoint_url = routes.ASSETS.path()
         headers = {"Content-type": "application/json"}
-        request_body = request_body_dto.dict()
+        request_body = request_body_dto.dict(by_alias=True, exclude_none=True)
 
         status, response_body, headers = await self._http_client.post(
             endpoint=endpoint_url, headers=headers, data=request_body
@@ -64,36 +101,48 @@ class AssetsApiClient:
 
         return create_asset_response
 
+    @operation("complete_upload")
+    async def complete_upload(self, on_complete: OnComplete) -> None:
+        endpoint_url = routes.relative_url(on_complete.url)
+        headers = {"Content-type": "application/json"}
+        await self._http_client.post(
+            endpoint=endpoint_url, headers=headers, data=on_complete.fields or {}
+        )
+
+    @operation("get_info_about_asset")
     async def get_info_about_asset(
         self, path_params: AssetInfoPathParams
     ) -> AssetInfoResponse:
-        endpoint_url = f"/v1/assets/{path_params.asset_id}"
+        endpoint_url = routes.ASSET.path(asset_id=path_params.asset_id)
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
         )
         info_asset_response = AssetInfoResponse.parse_obj(response_body)
         return info_asset_response
 
+    @operation("modify_asset_info")
     async def modify_asset_info(
         self,
         path_params: ModifyAssetInfoPathParams,
         request_body_dto: ModifyAssetInfoRequest,
     ) -> None:
-        endpoint_url = f"/v1/assets/{path_params.asset_id}"
-        request_body = request_body_dto.dict()
+        endpoint_url = routes.ASSET.path(asset_id=path_params.asset_id)
+        request_body = request_body_dto.dict(by_alias=True, exclude_none=True)
         headers = {"Content-type": "application/json"}
         await self._http_client.patch(
             endpoint=endpoint_url, headers=headers, data=request_body
         )
 
+    @operation("delete_asset")
     async def delete_asset(self, path_params: DeleteAssetPathParams) -> None:
-        endpoint_url = f"/v1/assets/{path_params.asset_id}"
+        endpoint_url = routes.ASSET.path(asset_id=path_params.asset_id)
         await self._http_client.delete(endpoint=endpoint_url, headers={})
 
+    @operation("access_tiles")
     async def access_tiles(
         self, path_params: AccessTilesPathParams
     ) -> Union[AssetEndpoints, ExternalAssetEndpoints]:
-        endpoint_url = f"/v1/assets/{path_params.asset_id}/endpoint"
+        endpoint_url = routes.ASSET_ENDPOINT.path(asset_id=path_params.asset_id)
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
         )
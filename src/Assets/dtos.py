@@ -13,6 +13,7 @@ from Assets.enums import (
     GeometryCompression,
     TextureFormat,
 )
+from routes import QueryItems, encode_query_fragment
 
 
 ### List assets
@@ -28,18 +29,26 @@ class ListAssetsQueryParameters(BaseModel):
     type: Optional[List[AssetType]]
 
     def to_query_params(self) -> str:
-        query_params = f"?limit={self.limit}&page={self.page}&sortBy={self.sortBy.name}&sortOrder={self.sortOrder.value}"
+        return f"?limit={self.limit}&page={self.page}" + encode_query_fragment(
+            self._static_query_items()
+        )
+
+    def _static_query_items(self) -> QueryItems:
+        query_items = [
+            ("sortBy", self.sortBy.name),
+            ("sortOrder", self.sortOrder.value),
+        ]
         if self.search:
-            query_params += f"&search={self.search}"
+            query_items.append(("search", self.search))
         if self.status:
             for status in self.status:
-                query_params += f"&status={status.value}"
+                query_items.append(("status", status.value))
 
         if self.type:
             for type in self.type:
-                query_params += f"&type={type.value}"
+                query_items.append(("type", type.value))
 
-        return query_params
+        return tuple(query_items)
 
 
 class AssetMetadata(BaseModel):
@@ -136,7 +145,7 @@ class RasterTerrain(AssetOptions):
     height_reference: Optional[HeightReference] = Field(alias="heightReference")
     to_meters: Optional[float] = Field(alias="toMeters")
     base_terrain_id: Optional[int] = Field(alias="baseTerrainId")
-    water_mask: Optional[bool] = Field(aliast="waterMask")
+    water_mask: Optional[bool] = Field(alias="waterMask")
 
 
 class AwsCredentials(BaseModel):
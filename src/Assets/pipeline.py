@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from Assets.client import AssetsApiClient
+from Assets.dtos import (
+    AssetInfoPathParams,
+    AssetInfoResponse,
+    CreateAssetRequest,
+    CreateAssetResponse,
+    UploadLocation,
+)
+from Assets.enums import AssetStatus
+from concurrency import ProgressCallback
+from polling import poll_until
+
+logger = logging.getLogger(__name__)
+
+Uploader = Callable[[CreateAssetRequest, UploadLocation], Awaitable[None]]
+
+FINAL_STATUSES = (AssetStatus.COMPLETE, AssetStatus.ERROR, AssetStatus.DATA_ERROR)
+
+
+@dataclass
+class AssetPipelineResult:
+    request: CreateAssetRequest
+    asset_id: Optional[int] = None
+    status: Optional[AssetStatus] = None
+    error: Optional[Exception] = None
+
+
+class AssetCreationPipeline:
+    def __init__(
+        self,
+        client: AssetsApiClient,
+        uploader: Optional[Uploader] = None,
+        create_concurrency: int = 5,
+        upload_concurrency: int = 5,
+        wait_concurrency: int = 20,
+        queue_size: int = 50,
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+        wait_timeout: Optional[float] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ):
+        self._client = client
+        self._uploader = uploader
+        self._create_concurrency = create_concurrency
+        self._upload_concurrency = upload_concurrency
+        self._wait_concurrency = wait_concurrency
+        self._queue_size = queue_size
+        self._poll_interval = poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._wait_timeout = wait_timeout
+        self._progress_callback = progress_callback
+
+    async def run(
+        self, requests: Iterable[CreateAssetRequest]
+    ) -> List[AssetPipelineResult]:
+        results = [AssetPipelineResult(request=request) for request in requests]
+        done = 0
+        create_queue: asyncio.Queue = asyncio.Queue(self._queue_size)
+        upload_queue: asyncio.Queue = asyncio.Queue(self._queue_size)
+        wait_queue: asyncio.Queue = asyncio.Queue(self._queue_size)
+
+        def finish(result: AssetPipelineResult) -> None:
+            nonlocal done
+            done += 1
+            if self._progress_callback is not None:
+                self._progress_callback(done, len(results))
+
+        async def create(result: AssetPipelineResult, _) -> None:
+            response = await self._client.create_a_new_asset(result.request)
+            result.asset_id = int(response.asset_metadata.id)
+            result.status = response.asset_metadata.status
+            if response.upload_location is not None:
+                await upload_queue.put((result, response))
+            else:
+                await wait_queue.put((result, None))
+
+        async def upload(
+            result: AssetPipelineResult, response: CreateAssetResponse
+        ) -> None:
+            if self._uploader is None:
+                raise ValueError(
+                    f"Asset {result.asset_id} is awaiting files but no uploader has been provided."
+                )
+            await self._uploader(result.request, response.upload_location)
+            if response.on_complete is not None:
+                await self._client.complete_upload(response.on_complete)
+            await wait_queue.put((result, None))
+
+        async def wait(result: AssetPipelineResult, _) -> None:
+            asset = await self._wait_for_final_status(result.asset_id)
+            result.status = asset.status
+            finish(result)
+
+        stages: List[Tuple[asyncio.Queue, Callable, int]] = [
+            (create_queue, create, self._create_concurrency),
+            (upload_queue, upload, self._upload_concurrency),
+            (wait_queue, wait, self._wait_concurrency),
+        ]
+        async with asyncio.TaskGroup() as task_group:
+            workers = [
+                task_group.create_task(self._worker(queue, handle, finish))
+                for queue, handle, concurrency in stages
+                for _ in range(concurrency)
+            ]
+            for result in results:
+                await create_queue.put((result, None))
+            # Stages only hand items forward, so draining them in order means
+            # every asset has left the pipeline.
+            for queue, _, _ in stages:
+                await queue.join()
+            for worker in workers:
+                worker.cancel()
+
+        return results
+
+    async def _worker(
+        self,
+        queue: asyncio.Queue,
+        handle: Callable,
+        finish: Callable[[AssetPipelineResult], None],
+    ) -> None:
+        while True:
+            result, payload = await queue.get()
+            try:
+                await handle(result, payload)
+            except Exception as e:
+                logger.warning(
+                    f"Asset `{result.request.name}` has failed in the pipeline because of {str(e)}."
+                )
+                result.error = e
+                finish(result)
+            finally:
+                queue.task_done()
+
+    async def _wait_for_final_status(self, asset_id: int) -> AssetInfoResponse:
+        return await poll_until(
+            lambda: self._client.get_info_about_asset(
+                AssetInfoPathParams(assetId=asset_id)
+            ),
+            lambda asset: asset.status in FINAL_STATUSES,
+            interval=self._poll_interval,
+            max_interval=self._max_poll_interval,
+            timeout=self._wait_timeout,
+        )
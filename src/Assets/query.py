@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from pydantic import BaseModel
+from pydantic.fields import Field
+
+from Assets.dtos import AssetMetadata, ListAssetsQueryParameters
+from Assets.enums import AssetStatus, AssetType, SortByType, SortOrder
+
+
+class AssetQuery(BaseModel):
+    # Pushed down to the server through `ListAssetsQueryParameters`.
+    search: Optional[str]
+    status: Optional[List[AssetStatus]]
+    type: Optional[List[AssetType]]
+    sort_by: SortByType = SortByType.ID
+    sort_order: SortOrder = SortOrder.ASC
+    page_size: int = Field(ge=1, le=1000, default=1000)
+
+    # Evaluated client-side over the streamed pages.
+    min_bytes: Optional[int] = Field(ge=0)
+    max_bytes: Optional[int] = Field(ge=0)
+    date_added_from: Optional[datetime]
+    date_added_to: Optional[datetime]
+    archivable: Optional[bool]
+    exportable: Optional[bool]
+    max_results: Optional[int] = Field(ge=1)
+
+    def to_list_query_parameters(self) -> ListAssetsQueryParameters:
+        return ListAssetsQueryParameters(
+            limit=self.page_size,
+            search=self.search,
+            sortBy=self.sort_by,
+            sortOrder=self.sort_order,
+            status=self.status,
+            type=self.type,
+        )
+
+    def matches(self, asset: AssetMetadata) -> bool:
+        if self.min_bytes is not None and (
+            asset.bytes is None or asset.bytes < self.min_bytes
+        ):
+            return False
+        if self.max_bytes is not None and (
+            asset.bytes is None or asset.bytes > self.max_bytes
+        ):
+            return False
+        if self.archivable is not None and asset.archivable is not self.archivable:
+            return False
+        if self.exportable is not None and asset.exportable is not self.exportable:
+            return False
+        if self.date_added_from is not None or self.date_added_to is not None:
+            if asset.date_added is None:
+                return False
+            date_added = _parse_date(asset.date_added)
+            if self.date_added_from is not None and date_added < _aware(
+                self.date_added_from
+            ):
+                return False
+            if self.date_added_to is not None and date_added >= _aware(
+                self.date_added_to
+            ):
+                return False
+        return True
+
+
+def _parse_date(value: str) -> datetime:
+    return _aware(datetime.fromisoformat(value))
+
+
+def _aware(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
@@ -0,0 +1,69 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple
+
+from Assets.tileset import Region
+
+QUANTIZED_MESH_MEDIA_TYPE = "application/vnd.quantized-mesh"
+
+
+@dataclass
+class TerrainLayer:
+    tiles: List[str]
+    version: str = "1.0.0"
+    extensions: List[str] = field(default_factory=list)
+    max_zoom: int = 0
+
+    @classmethod
+    def parse(cls, layer: Dict) -> "TerrainLayer":
+        if layer.get("projection", "EPSG:4326") != "EPSG:4326":
+            raise ValueError(
+                f"Only geographic terrain layers are supported, got `{layer['projection']}`."
+            )
+        if layer.get("scheme", "tms") != "tms":
+            raise ValueError(f"Unsupported terrain tiling scheme `{layer['scheme']}`.")
+        return cls(
+            tiles=layer["tiles"],
+            version=layer.get("version", "1.0.0"),
+            extensions=layer.get("extensions", []),
+            max_zoom=layer.get("maxzoom", 0),
+        )
+
+    def tile_path(self, level: int, x: int, y: int) -> str:
+        return (
+            self.tiles[0]
+            .replace("{z}", str(level))
+            .replace("{x}", str(x))
+            .replace("{y}", str(y))
+            .replace("{version}", self.version)
+        )
+
+    def accept_header(self) -> str:
+        media_type = QUANTIZED_MESH_MEDIA_TYPE
+        if self.extensions:
+            media_type += f";extensions={'-'.join(self.extensions)}"
+        return f"{media_type},application/octet-stream;q=0.9,*/*;q=0.01"
+
+
+# Geographic tiling scheme, two tiles on level 0 and TMS rows counted from
+# the south.
+def tile_range(region: Region, level: int) -> Tuple[int, int, int, int]:
+    columns = 2 ** (level + 1)
+    rows = 2**level
+    return (
+        _tile_index(region.west + math.pi, 2 * math.pi, columns),
+        _tile_index(region.south + math.pi / 2, math.pi, rows),
+        _tile_index(region.east + math.pi, 2 * math.pi, columns),
+        _tile_index(region.north + math.pi / 2, math.pi, rows),
+    )
+
+
+def tiles_in_region(region: Region, level: int) -> Iterator[Tuple[int, int]]:
+    x_min, y_min, x_max, y_max = tile_range(region, level)
+    for y in range(y_min, y_max + 1):
+        for x in range(x_min, x_max + 1):
+            yield x, y
+
+
+def _tile_index(offset: float, extent: float, count: int) -> int:
+    return min(max(int(offset / extent * count), 0), count - 1)
@@ -0,0 +1,221 @@
+import asyncio
+import gzip
+import json
+import logging
+import struct
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from Assets.client import AssetsApiClient
+from Assets.terrain import TerrainLayer
+from Assets.tileset import TileAccess, resolve_uri
+from concurrency import map_bounded
+from http_client import HTTPClientProtocol
+
+logger = logging.getLogger(__name__)
+
+QUANTIZED_MESH_HEADER = struct.Struct("<3d2f4d3d")
+QUANTIZED_MESH_MAX = 32767
+GZIP_MAGIC = b"\x1f\x8b"
+# Upper bound of point/triangle pairs tested at once while sampling a tile.
+SAMPLE_BATCH_CELLS = 1 << 22
+
+TileXY = Tuple[int, int]
+
+
+@dataclass
+class QuantizedMesh:
+    u: np.ndarray
+    v: np.ndarray
+    heights: np.ndarray
+    triangles: np.ndarray
+
+    def sample(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        # Barycentric interpolation inside the triangle that contains each
+        # point, points outside every triangle come back as NaN.
+        u = np.asarray(u, dtype=np.float64)
+        v = np.asarray(v, dtype=np.float64)
+        heights = np.full(u.shape, np.nan)
+        a, b, c = self.triangles.T
+        ua, ub, uc = self.u[a], self.u[b], self.u[c]
+        va, vb, vc = self.v[a], self.v[b], self.v[c]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denominator = (vb - vc) * (ua - uc) + (uc - ub) * (va - vc)
+        batch = max(1, SAMPLE_BATCH_CELLS // max(len(self.triangles), 1))
+        for start in range(0, len(u), batch):
+            pu = u[start : start + batch, None] - uc
+            pv = v[start : start + batch, None] - vc
+            with np.errstate(divide="ignore", invalid="ignore"):
+                first = ((vb - vc) * pu + (uc - ub) * pv) / denominator
+                second = ((vc - va) * pu + (ua - uc) * pv) / denominator
+            third = 1.0 - first - second
+            inside = (first >= -1e-9) & (second >= -1e-9) & (third >= -1e-9)
+            triangle = inside.argmax(axis=1)
+            rows = np.arange(len(triangle))
+            found = inside[rows, triangle]
+            sampled = (
+                first[rows, triangle] * self.heights[a[triangle]]
+                + second[rows, triangle] * self.heights[b[triangle]]
+                + third[rows, triangle] * self.heights[c[triangle]]
+            )
+            heights[start : start + batch] = np.where(found, sampled, np.nan)
+        return heights
+
+
+def decode_quantized_mesh(data: bytes) -> QuantizedMesh:
+    # Tiles copied to buckets as-is are gzipped without a Content-Encoding
+    # header, the transport cannot undo that for us.
+    if data[:2] == GZIP_MAGIC:
+        data = gzip.decompress(data)
+    header = QUANTIZED_MESH_HEADER.unpack_from(data)
+    min_height, max_height = header[3], header[4]
+    offset = QUANTIZED_MESH_HEADER.size
+    (vertex_count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    encoded = np.frombuffer(
+        data, dtype="<u2", count=3 * vertex_count, offset=offset
+    ).reshape(3, vertex_count)
+    offset += encoded.nbytes
+    u, v, quantized_heights = (_decode_zigzag_deltas(values) for values in encoded)
+
+    index_type = np.dtype("<u2" if vertex_count <= 65536 else "<u4")
+    offset += -offset % index_type.itemsize
+    (triangle_count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    codes = np.frombuffer(
+        data, dtype=index_type, count=3 * triangle_count, offset=offset
+    )
+
+    heights = min_height + quantized_heights / QUANTIZED_MESH_MAX * (
+        max_height - min_height
+    )
+    return QuantizedMesh(
+        u.astype(np.float64),
+        v.astype(np.float64),
+        heights,
+        _decode_high_water_marks(codes).reshape(-1, 3),
+    )
+
+
+def _decode_zigzag_deltas(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.int64)
+    return np.cumsum((values >> 1) ^ -(values & 1)) & 0xFFFF
+
+
+def _decode_high_water_marks(codes: np.ndarray) -> np.ndarray:
+    codes = codes.astype(np.int64)
+    is_new = codes == 0
+    highest = np.cumsum(is_new) - is_new
+    return highest - codes
+
+
+def tile_size(level: int) -> float:
+    return 180.0 / 2**level
+
+
+def tile_coordinates(
+    lons: np.ndarray, lats: np.ndarray, level: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    size = tile_size(level)
+    x = np.clip(np.floor((np.asarray(lons) + 180.0) / size), 0, 2 ** (level + 1) - 1)
+    y = np.clip(np.floor((np.asarray(lats) + 90.0) / size), 0, 2**level - 1)
+    return x.astype(np.int64), y.astype(np.int64)
+
+
+def densify_polyline(
+    lons: np.ndarray, lats: np.ndarray, spacing: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    lons = np.asarray(lons, dtype=np.float64)
+    lats = np.asarray(lats, dtype=np.float64)
+    if len(lons) < 2:
+        return lons, lats
+    lon_steps, lat_steps = np.diff(lons), np.diff(lats)
+    counts = np.maximum(np.ceil(np.hypot(lon_steps, lat_steps) / spacing), 1)
+    counts = counts.astype(np.int64)
+    segments = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    fractions = offsets / counts[segments]
+    return (
+        np.append(lons[segments] + lon_steps[segments] * fractions, lons[-1]),
+        np.append(lats[segments] + lat_steps[segments] * fractions, lats[-1]),
+    )
+
+
+class TerrainBatchFetcher:
+    def __init__(
+        self,
+        assets_client: AssetsApiClient,
+        http_client: HTTPClientProtocol,
+        concurrency: int = 16,
+    ):
+        self._assets_client = assets_client
+        self._http_client = http_client
+        self._concurrency = concurrency
+        self._layers: Dict[int, Tuple[TileAccess, TerrainLayer]] = {}
+
+    async def fetch_tiles(
+        self, asset_id: int, level: int, tiles: Iterable[TileXY]
+    ) -> Dict[TileXY, QuantizedMesh]:
+        access, layer = await self._layer(asset_id)
+        if level > layer.max_zoom:
+            raise ValueError(
+                f"Terrain of asset {asset_id} only goes down to level {layer.max_zoom}."
+            )
+        tiles = list(dict.fromkeys((int(x), int(y)) for x, y in tiles))
+        headers = {"Accept": layer.accept_header()}
+
+        async def fetch(tile: TileXY) -> QuantizedMesh:
+            url = resolve_uri(access.endpoint.url, layer.tile_path(level, *tile))
+            data = await access.read(url, headers)
+            return await asyncio.to_thread(decode_quantized_mesh, data)
+
+        meshes = await map_bounded(fetch, tiles, self._concurrency)
+        return dict(zip(tiles, meshes))
+
+    async def sample_points(
+        self, asset_id: int, lons: np.ndarray, lats: np.ndarray, level: int
+    ) -> np.ndarray:
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        x, y = tile_coordinates(lons, lats, level)
+        tiles, inverse = np.unique(
+            np.stack([x, y], axis=1), axis=0, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        meshes = await self.fetch_tiles(asset_id, level, tiles)
+
+        size = tile_size(level)
+        u = ((lons + 180.0) - x * size) / size * QUANTIZED_MESH_MAX
+        v = ((lats + 90.0) - y * size) / size * QUANTIZED_MESH_MAX
+        heights = np.full(lons.shape, np.nan)
+        for index, (tile_x, tile_y) in enumerate(tiles):
+            in_tile = inverse == index
+            heights[in_tile] = meshes[(int(tile_x), int(tile_y))].sample(
+                u[in_tile], v[in_tile]
+            )
+        return heights
+
+    async def sample_polyline(
+        self,
+        asset_id: int,
+        lons: np.ndarray,
+        lats: np.ndarray,
+        level: int,
+        spacing: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # ion terrain tiles are at most 65 vertices across, sampling any denser
+        # than that only interpolates further along the same triangles.
+        spacing = spacing or tile_size(level) / 64
+        lons, lats = densify_polyline(lons, lats, spacing)
+        return lons, lats, await self.sample_points(asset_id, lons, lats, level)
+
+    async def _layer(self, asset_id: int) -> Tuple[TileAccess, TerrainLayer]:
+        if asset_id not in self._layers:
+            access = await TileAccess.for_asset(
+                self._assets_client, self._http_client, asset_id
+            )
+            body = await access.read(resolve_uri(access.endpoint.url, "layer.json"))
+            self._layers[asset_id] = (access, TerrainLayer.parse(json.loads(body)))
+        return self._layers[asset_id]
@@ -0,0 +1,370 @@
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+from Assets.client import AssetsApiClient
+from Assets.dtos import AccessTilesPathParams
+from Assets.terrain import TerrainLayer, tiles_in_region
+from Assets.tileset import Region, TileAccess, TilesetWalker, resolve_uri
+from http_client import HTTPClientProtocol
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b"TCIX"
+INDEX_HEADER = struct.Struct("<4sIQQ")
+INDEX_HEADER_BYTES = 64
+INDEX_SLOT = struct.Struct("<16s32s")
+EMPTY_KEY = bytes(16)
+MAX_LOAD_FACTOR = 0.7
+
+CONTENT_TYPES = {
+    ".json": "application/json",
+    ".terrain": "application/vnd.quantized-mesh",
+    ".b3dm": "application/octet-stream",
+    ".glb": "model/gltf-binary",
+}
+
+
+class CacheIndex:
+    # Open addressing table of key hash -> content digest kept in a memory
+    # mapped file, lookups touch a few pages instead of loading the index.
+    def __init__(self, path: Union[str, Path], initial_capacity: int = 1024):
+        self.path = Path(path)
+        if not self.path.exists():
+            _write_empty_index(self.path, _power_of_two(initial_capacity))
+        self._open()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, key_hash: bytes) -> Optional[bytes]:
+        slot, found = self._find(key_hash)
+        if not found:
+            return None
+        return INDEX_SLOT.unpack_from(self._map, _slot_offset(slot))[1]
+
+    def set(self, key_hash: bytes, digest: bytes) -> None:
+        slot, found = self._find(key_hash)
+        INDEX_SLOT.pack_into(self._map, _slot_offset(slot), key_hash, digest)
+        if found:
+            return
+        self._count += 1
+        self._write_header()
+        if self._count > self._capacity * MAX_LOAD_FACTOR:
+            self._grow()
+
+    def close(self) -> None:
+        if self._map.closed:
+            return
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+
+    def _open(self) -> None:
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, _, self._capacity, self._count = INDEX_HEADER.unpack_from(self._map)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a tile cache index.")
+
+    def _write_header(self) -> None:
+        INDEX_HEADER.pack_into(
+            self._map, 0, INDEX_MAGIC, 1, self._capacity, self._count
+        )
+
+    def _find(self, key_hash: bytes) -> Tuple[int, bool]:
+        mask = self._capacity - 1
+        slot = int.from_bytes(key_hash[:8], "little") & mask
+        while True:
+            stored = self._map[_slot_offset(slot) : _slot_offset(slot) + 16]
+            if stored == key_hash:
+                return slot, True
+            if stored == EMPTY_KEY:
+                return slot, False
+            slot = (slot + 1) & mask
+
+    def _grow(self) -> None:
+        entries = [
+            INDEX_SLOT.unpack_from(self._map, _slot_offset(slot))
+            for slot in range(self._capacity)
+        ]
+        capacity = self._capacity * 2
+        self.close()
+        # Rebuilt next to the old index and swapped in, a crash mid-way leaves
+        # the previous index intact.
+        grown_path = self.path.with_suffix(".grow")
+        _write_empty_index(grown_path, capacity)
+        os.replace(grown_path, self.path)
+        self._open()
+        self._count = 0
+        for key_hash, digest in entries:
+            if key_hash != EMPTY_KEY:
+                slot, _ = self._find(key_hash)
+                INDEX_SLOT.pack_into(self._map, _slot_offset(slot), key_hash, digest)
+                self._count += 1
+        self._write_header()
+
+
+def _write_empty_index(path: Path, capacity: int) -> None:
+    with open(path, "wb") as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, 1, capacity, 0))
+        f.truncate(INDEX_HEADER_BYTES + capacity * INDEX_SLOT.size)
+
+
+def _slot_offset(slot: int) -> int:
+    return INDEX_HEADER_BYTES + slot * INDEX_SLOT.size
+
+
+def _power_of_two(value: int) -> int:
+    return 1 << max(value - 1, 1).bit_length()
+
+
+class TileCache:
+    # Tiles are stored once per content digest, empty and repeated tiles that
+    # are common in terrain and sparse tilesets take no extra space.
+    def __init__(self, directory: Union[str, Path], initial_capacity: int = 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index = CacheIndex(self.directory / "index.bin", initial_capacity)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "TileCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return self.path_for(key) is not None
+
+    def path_for(self, key: str) -> Optional[Path]:
+        with self._lock:
+            digest = self._index.get(_key_hash(key))
+        if digest is None:
+            return None
+        return self._object_path(digest)
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.path_for(key)
+        if path is None:
+            return None
+        return path.read_bytes()
+
+    def put(self, key: str, data: bytes) -> Path:
+        digest = hashlib.sha256(data).digest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial_path = path.with_name(f"{path.name}.{threading.get_ident()}.part")
+            partial_path.write_bytes(data)
+            os.replace(partial_path, path)
+        with self._lock:
+            self._index.set(_key_hash(key), digest)
+        return path
+
+    def close(self) -> None:
+        with self._lock:
+            self._index.close()
+
+    def _object_path(self, digest: bytes) -> Path:
+        hex_digest = digest.hex()
+        return self.directory / "objects" / hex_digest[:2] / hex_digest[2:]
+
+
+def _key_hash(key: str) -> bytes:
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
+def cache_key(asset_id: int, root_url: str, url: str) -> str:
+    # Keys mirror the layout under the asset root without query parameters, so
+    # relative URIs in cached tilesets keep resolving when served locally.
+    root = urlsplit(root_url)
+    parts = urlsplit(url)
+    root_directory = root.path.rsplit("/", 1)[0] + "/"
+    if parts.netloc == root.netloc and parts.path.startswith(root_directory):
+        return f"{asset_id}/{parts.path[len(root_directory):]}"
+    return f"{asset_id}/{parts.netloc}{parts.path}"
+
+
+@dataclass
+class PrefetchResult:
+    fetched: int = 0
+    cached: int = 0
+    fetched_bytes: int = 0
+    failed: Dict[str, Exception] = field(default_factory=dict)
+
+
+class TilePrefetcher:
+    def __init__(
+        self,
+        assets_client: AssetsApiClient,
+        http_client: HTTPClientProtocol,
+        cache: TileCache,
+        concurrency: int = 16,
+    ):
+        self.cache = cache
+        self._assets_client = assets_client
+        self._http_client = http_client
+        self._concurrency = concurrency
+
+    async def prefetch_tileset(
+        self,
+        asset_id: int,
+        region: Optional[Region] = None,
+        min_depth: int = 0,
+        max_depth: Optional[int] = None,
+    ) -> PrefetchResult:
+        path_params = AccessTilesPathParams(assetId=asset_id)
+
+        async def store_tileset(url: str, body: bytes) -> None:
+            key = cache_key(asset_id, root_url, url)
+            await asyncio.to_thread(self.cache.put, key, body)
+
+        walker = TilesetWalker(
+            self._http_client,
+            await self._assets_client.access_tiles(path_params),
+            concurrency=self._concurrency,
+            min_depth=min_depth,
+            max_depth=max_depth,
+            region=region,
+            refresh=lambda: self._assets_client.access_tiles(path_params),
+            on_tileset=store_tileset,
+        )
+        root_url = walker.endpoint.url
+
+        async def tiles() -> AsyncIterator[Tuple[str, str]]:
+            async for content in walker.walk():
+                yield cache_key(asset_id, root_url, content.url), content.url
+
+        # Tiles share the walker's access token, and so its refreshes.
+        return await self._download(walker.access, tiles())
+
+    async def prefetch_terrain(
+        self,
+        asset_id: int,
+        region: Region,
+        min_level: int = 0,
+        max_level: Optional[int] = None,
+    ) -> PrefetchResult:
+        access = await TileAccess.for_asset(
+            self._assets_client, self._http_client, asset_id
+        )
+        root_url = access.endpoint.url
+        layer_url = resolve_uri(root_url, "layer.json")
+        layer_body = await access.read(layer_url)
+        await asyncio.to_thread(
+            self.cache.put, cache_key(asset_id, root_url, layer_url), layer_body
+        )
+        layer = TerrainLayer.parse(json.loads(layer_body))
+        max_level = layer.max_zoom if max_level is None else max_level
+
+        async def tiles() -> AsyncIterator[Tuple[str, str]]:
+            for level in range(min_level, max_level + 1):
+                for x, y in tiles_in_region(region, level):
+                    url = resolve_uri(root_url, layer.tile_path(level, x, y))
+                    yield cache_key(asset_id, root_url, url), url
+
+        return await self._download(
+            access, tiles(), headers={"Accept": layer.accept_header()}
+        )
+
+    async def _download(
+        self,
+        access: TileAccess,
+        tiles: AsyncIterator[Tuple[str, str]],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> PrefetchResult:
+        result = PrefetchResult()
+        queue: asyncio.Queue = asyncio.Queue(self._concurrency * 4)
+
+        async def worker() -> None:
+            while True:
+                key, url = await queue.get()
+                try:
+                    data = await access.read(url, headers)
+                    await asyncio.to_thread(self.cache.put, key, data)
+                except Exception as e:
+                    logger.warning(f"Tile `{key}` could not be fetched: {str(e)}.")
+                    result.failed[key] = e
+                else:
+                    result.fetched += 1
+                    result.fetched_bytes += len(data)
+                finally:
+                    queue.task_done()
+
+        async with asyncio.TaskGroup() as task_group:
+            workers = [
+                task_group.create_task(worker()) for _ in range(self._concurrency)
+            ]
+            async for key, url in tiles:
+                if key in self.cache:
+                    result.cached += 1
+                    continue
+                await queue.put((key, url))
+            await queue.join()
+            for task in workers:
+                task.cancel()
+
+        return result
+
+
+class TileCacheServer:
+    def __init__(self, cache: TileCache):
+        self.cache = cache
+        self.url: Optional[str] = None
+        self._runner: Optional[web.AppRunner] = None
+        self.app = web.Application()
+        self.app.router.add_get("/{key:.+}", self._get_tile)
+
+    async def __aenter__(self) -> "TileCacheServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.url = f"http://{bound_host}:{bound_port}"
+        logger.debug(f"Tile cache served on {self.url}.")
+        return self.url
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _get_tile(self, request: web.Request) -> web.Response:
+        key = request.match_info["key"]
+        data = await asyncio.to_thread(self.cache.get, key)
+        if data is None:
+            return web.Response(status=404)
+        return web.Response(
+            body=data,
+            headers={
+                "Content-Type": CONTENT_TYPES.get(
+                    Path(key).suffix, "application/octet-stream"
+                ),
+                # Viewers load the cache from a page on another origin.
+                "Access-Control-Allow-Origin": "*",
+            },
+        )
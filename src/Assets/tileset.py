@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import math
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+)
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from Assets.client import AssetsApiClient
+from Assets.dtos import AccessTilesPathParams, AssetEndpoints
+from Assets.enums import AssetType
+from exceptions import InvalidCredentials
+from http_client import HTTPClientProtocol, decode_json_body
+from instrumentation import operation
+
+logger = logging.getLogger(__name__)
+
+EndpointRefresher = Callable[[], Awaitable[AssetEndpoints]]
+TilesetCallback = Callable[[str, bytes], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class Region:
+    # Radians, like `boundingVolume.region` in 3D Tiles.
+    west: float
+    south: float
+    east: float
+    north: float
+
+    @classmethod
+    def from_degrees(
+        cls, west: float, south: float, east: float, north: float
+    ) -> "Region":
+        return cls(*map(math.radians, (west, south, east, north)))
+
+    def intersects(self, bounding_volume: Dict) -> bool:
+        region = bounding_volume.get("region")
+        if region is None:
+            # Boxes and spheres are given in the tile's own frame, those tiles
+            # are kept rather than pruned on a guess.
+            return True
+        west, south, east, north = region[:4]
+        return (
+            west <= self.east
+            and east >= self.west
+            and south <= self.north
+            and north >= self.south
+        )
+
+
+@dataclass
+class TileContent:
+    url: str
+    depth: int
+    geometric_error: float
+    bounding_volume: Dict
+
+
+def resolve_uri(base_url: str, uri: str) -> str:
+    # ion versions tileset URLs with query parameters that relative tile URIs
+    # have to carry as well, the same way CesiumJS derives tile resources.
+    url = urljoin(base_url, uri)
+    base = urlsplit(base_url)
+    parts = urlsplit(url)
+    if not base.query or parts.netloc != base.netloc:
+        return url
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    names = {name for name, _ in query}
+    query += [
+        (name, value)
+        for name, value in parse_qsl(base.query, keep_blank_values=True)
+        if name not in names
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def is_tileset_url(url: str) -> bool:
+    return urlsplit(url).path.endswith(".json")
+
+
+class TileAccess:
+    def __init__(
+        self,
+        http_client: HTTPClientProtocol,
+        endpoint: AssetEndpoints,
+        refresh: Optional[EndpointRefresher] = None,
+    ):
+        self.endpoint = endpoint
+        self._http_client = http_client
+        self._refresh = refresh
+        self._refresh_lock = asyncio.Lock()
+
+    @classmethod
+    async def for_asset(
+        cls,
+        assets_client: AssetsApiClient,
+        http_client: HTTPClientProtocol,
+        asset_id: int,
+    ) -> "TileAccess":
+        path_params = AccessTilesPathParams(assetId=asset_id)
+        endpoint = await assets_client.access_tiles(path_params)
+        if not isinstance(endpoint, AssetEndpoints):
+            raise ValueError(f"Asset {asset_id} is served by {endpoint.external_type}.")
+        return cls(
+            http_client, endpoint, lambda: assets_client.access_tiles(path_params)
+        )
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        if self.endpoint.access_token is None:
+            return {}
+        return {"Authorization": f"Bearer {self.endpoint.access_token}"}
+
+    async def read(self, url: str, headers: Optional[Dict[str, str]] = None) -> bytes:
+        access_token = self.endpoint.access_token
+        try:
+            return await self._read(url, headers)
+        except InvalidCredentials:
+            if self._refresh is None:
+                raise
+            await self.refresh(access_token)
+            return await self._read(url, headers)
+
+    async def refresh(self, stale_access_token: Optional[str]) -> None:
+        async with self._refresh_lock:
+            # Every request in flight fails once the token expires, only the
+            # first one to get here asks ion for a new one.
+            if self.endpoint.access_token == stale_access_token:
+                logger.info("Tile access token has expired, requesting a new one.")
+                self.endpoint = await self._refresh()
+
+    async def _read(self, url: str, headers: Optional[Dict[str, str]]) -> bytes:
+        async with self._http_client.stream(
+            url, {**self.headers, **(headers or {})}
+        ) as response:
+            return b"".join([chunk async for chunk in response.chunks])
+
+
+class TilesetWalker:
+    def __init__(
+        self,
+        http_client: HTTPClientProtocol,
+        endpoint: AssetEndpoints,
+        concurrency: int = 8,
+        min_depth: int = 0,
+        max_depth: Optional[int] = None,
+        region: Optional[Region] = None,
+        refresh: Optional[EndpointRefresher] = None,
+        on_tileset: Optional[TilesetCallback] = None,
+    ):
+        if (
+            not isinstance(endpoint, AssetEndpoints)
+            or endpoint.type != AssetType.THREEDTILES
+            or endpoint.url is None
+        ):
+            raise ValueError(
+                f"Only 3D Tiles asset endpoints can be walked, got `{endpoint}`."
+            )
+        self.access = TileAccess(http_client, endpoint, refresh)
+        self._concurrency = concurrency
+        self._min_depth = min_depth
+        self._max_depth = max_depth
+        self._region = region
+        self._on_tileset = on_tileset
+
+    @property
+    def endpoint(self) -> AssetEndpoints:
+        return self.access.endpoint
+
+    async def walk(self) -> AsyncIterator[TileContent]:
+        pending: Deque[Tuple[str, int]] = deque([(self.endpoint.url, 0)])
+        seen: Set[str] = {self.endpoint.url}
+        fetches: Dict[asyncio.Task, Tuple[str, int]] = {}
+        try:
+            while pending or fetches:
+                while pending and len(fetches) < self._concurrency:
+                    url, depth = pending.popleft()
+                    fetches[asyncio.create_task(self._fetch_tileset(url))] = (
+                        url,
+                        depth,
+                    )
+                done, _ = await asyncio.wait(
+                    fetches, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    url, depth = fetches.pop(task)
+                    tileset = task.result()
+                    for content in self._traverse(url, tileset["root"], depth):
+                        if not is_tileset_url(content.url):
+                            yield content
+                        elif content.url not in seen:
+                            seen.add(content.url)
+                            pending.append((content.url, content.depth))
+        finally:
+            for task in fetches:
+                task.cancel()
+            # Abandoned fetches are unwound before the caller moves on, their
+            # outcome is of no interest.
+            for task in fetches:
+                with suppress(asyncio.CancelledError, Exception):
+                    await task
+
+    def _traverse(
+        self, tileset_url: str, root: Dict, root_depth: int
+    ) -> Iterator[TileContent]:
+        # The root of an external tileset takes the place of the tile that
+        # references it, so depths follow the level of detail across files.
+        stack = [(root, root_depth)]
+        while stack:
+            tile, depth = stack.pop()
+            if self._max_depth is not None and depth > self._max_depth:
+                continue
+            bounding_volume = tile.get("boundingVolume", {})
+            if self._region is not None and not self._region.intersects(
+                bounding_volume
+            ):
+                continue
+            contents = tile.get("contents") or [tile.get("content") or {}]
+            for content in contents:
+                uri = content.get("uri", content.get("url"))
+                if uri is None:
+                    continue
+                url = resolve_uri(tileset_url, uri)
+                if depth >= self._min_depth or is_tileset_url(url):
+                    yield TileContent(
+                        url, depth, tile.get("geometricError", 0.0), bounding_volume
+                    )
+            for child in reversed(tile.get("children") or []):
+                stack.append((child, depth + 1))
+
+    @operation("fetch_tileset")
+    async def _fetch_tileset(self, url: str) -> Dict:
+        body = await self.access.read(url)
+        if self._on_tileset is not None:
+            await self._on_tileset(url, body)
+        # Tilesets are often served from buckets as `application/octet-stream`,
+        # the body is decoded as JSON whatever the content type says.
+        return decode_json_body(f"GET request to: {url}", "", body)
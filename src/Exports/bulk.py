@@ -0,0 +1,128 @@
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from Assets.client import AssetsApiClient
+from Assets.query import AssetQuery
+from Exports.client import ExportsApiClient
+from Exports.dtos import (
+    ExportAssetPathParams,
+    ExportAssetRequest,
+    GetExportStatusPathParams,
+    GetExportStatusResponse,
+)
+from Exports.enums import ExportsStatus
+from concurrency import ProgressCallback, map_bounded
+from exceptions import ExportFailedError
+from journal import Journal
+from polling import poll_until
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = (ExportsStatus.COMPLETE, ExportsStatus.ERROR)
+
+
+@dataclass
+class BulkExportResult:
+    completed: Dict[int, str] = field(default_factory=dict)
+    failed: Dict[int, Exception] = field(default_factory=dict)
+    skipped: List[int] = field(default_factory=list)
+
+
+class BulkExporter:
+    def __init__(
+        self,
+        assets_client: AssetsApiClient,
+        exports_client: ExportsApiClient,
+        destination: ExportAssetRequest,
+        concurrency: int = 10,
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+        progress_callback: Optional[ProgressCallback] = None,
+    ):
+        self._assets_client = assets_client
+        self._exports_client = exports_client
+        self._destination = destination
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._progress_callback = progress_callback
+
+    def prefix_for(self, asset_id: int) -> str:
+        return f"{self._destination.prefix.rstrip('/')}/{asset_id}/".lstrip("/")
+
+    async def export_all(
+        self,
+        journal_path: Union[str, Path],
+        query: Optional[AssetQuery] = None,
+    ) -> BulkExportResult:
+        query = (query or AssetQuery()).copy(update={"exportable": True})
+        asset_ids = [
+            int(asset.id) async for asset in self._assets_client.query_assets(query)
+        ]
+        return await self.export_assets(asset_ids, journal_path)
+
+    async def export_assets(
+        self, asset_ids: List[int], journal_path: Union[str, Path]
+    ) -> BulkExportResult:
+        journal = Journal(journal_path)
+        result = BulkExportResult()
+
+        async def export(asset_id: int) -> None:
+            entry = journal.get(str(asset_id)) or {}
+            if entry.get("state") == "complete":
+                result.skipped.append(asset_id)
+                return
+            try:
+                export_id = await self._export_asset(asset_id, entry, journal)
+            except Exception as e:
+                logger.warning(f"Export of asset {asset_id} has failed: {str(e)}.")
+                result.failed[asset_id] = e
+            else:
+                result.completed[asset_id] = export_id
+
+        await map_bounded(
+            export,
+            asset_ids,
+            self._concurrency,
+            progress_callback=self._progress_callback,
+        )
+        return result
+
+    async def _export_asset(self, asset_id: int, entry: Dict, journal: Journal) -> str:
+        if entry.get("state") == "submitted":
+            export_id = entry["export_id"]
+        else:
+            prefix = self.prefix_for(asset_id)
+            export = await self._exports_client.export_asset(
+                ExportAssetPathParams(assetId=asset_id),
+                self._destination.copy(update={"prefix": prefix}),
+            )
+            export_id = export.id
+            journal.record(
+                str(asset_id), state="submitted", export_id=export_id, prefix=prefix
+            )
+
+        status = await self._wait_for_final_status(asset_id, export_id)
+        if status.status != ExportsStatus.COMPLETE:
+            # Only a failed export is submitted again, one that could not be
+            # polled is picked up where it was on the next run.
+            journal.record(str(asset_id), state="failed")
+            raise ExportFailedError(
+                f"Export {export_id} of asset {asset_id} has finished with status {status.status.value}."
+            )
+        journal.record(str(asset_id), state="complete")
+        return export_id
+
+    async def _wait_for_final_status(
+        self, asset_id: int, export_id: str
+    ) -> GetExportStatusResponse:
+        return await poll_until(
+            lambda: self._exports_client.get_export_status(
+                GetExportStatusPathParams(assetId=asset_id, exportId=export_id)
+            ),
+            lambda export: export.status in FINAL_STATUSES,
+            interval=self._poll_interval,
+            max_interval=self._max_poll_interval,
+        )
@@ -1,8 +1,9 @@
 import logging
-from typing import Dict, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from Exports.dtos import (
     ListExportsPathParams,
+    ExportMetadata,
     ListExportsResponse,
     ExportAssetPathParams,
     ExportAssetRequest,
@@ -12,6 +13,9 @@ from Exports.dtos import (
 )
 from dtos import PaginationLinks
 from http_client import HTTPClientProtocol
+from instrumentation import operation
+from pagination import iterate_link_pages
+import routes
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +27,19 @@ class ExportsApiClient:
     async def list_exports(
         self, path_params: ListExportsPathParams
     ) -> Tuple[ListExportsResponse, Optional[PaginationLinks]]:
-        endpoint_url = f"/v1/assets/{path_params.asset_id}/exports"
+        endpoint_url = routes.EXPORTS.path(asset_id=path_params.asset_id)
+        return await self._list_exports_page(endpoint_url)
+
+    def iterate_exports(
+        self, path_params: ListExportsPathParams, prefetch: bool = False
+    ) -> AsyncIterator[ExportMetadata]:
+        endpoint_url = routes.EXPORTS.path(asset_id=path_params.asset_id)
+        return iterate_link_pages(self._fetch_exports_items, endpoint_url, prefetch)
+
+    @operation("list_exports")
+    async def _list_exports_page(
+        self, endpoint_url: str
+    ) -> Tuple[ListExportsResponse, Optional[PaginationLinks]]:
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
         )
@@ -31,6 +47,14 @@ class ExportsApiClient:
         list_exports_response = ListExportsResponse.parse_obj(response_body)
         return list_exports_response, pagination_links
 
+    async def _fetch_exports_items(
+        self, endpoint_url: str
+    ) -> Tuple[List[ExportMetadata], Optional[PaginationLinks]]:
+        list_exports_response, pagination_links = await self._list_exports_page(
+            endpoint_url
+        )
+        return list_exports_response.items or [], pagination_links
+
     async def _retrieve_pagination_links(
         self, headers: Dict
     ) -> Optional[PaginationLinks]:
@@ -44,12 +68,13 @@ class ExportsApiClient:
             pagination_links = PaginationLinks.from_header(link_header)
         return pagination_links
 
+    @operation("export_asset")
     async def export_asset(
         self, path_params: ExportAssetPathParams, request_body_dto: ExportAssetRequest
     ) -> ExportAssetResponse:
-        endpoint_url = f"/v1/assets/{path_params.asset_id}/exports"
+        endpoint_url = routes.EXPORTS.path(asset_id=path_params.asset_id)
         headers = {"Content-type": "application/json"}
-        request_body = request_body_dto.dict()
+        request_body = request_body_dto.dict(by_alias=True, exclude_none=True)
 
         status, response_body, headers = await self._http_client.post(
             endpoint=endpoint_url, headers=headers, data=request_body
@@ -57,11 +82,12 @@ class ExportsApiClient:
         export_asset_response = ExportAssetResponse.parse_obj(response_body)
         return export_asset_response
 
+    @operation("get_export_status")
     async def get_export_status(
         self, path_params: GetExportStatusPathParams
     ) -> GetExportStatusResponse:
-        endpoint_url = (
-            f"/v1/assets/{path_params.asset_id}/exports/{path_params.export_id}"
+        endpoint_url = routes.EXPORT.path(
+            asset_id=path_params.asset_id, export_id=path_params.export_id
         )
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
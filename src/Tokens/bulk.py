@@ -0,0 +1,146 @@
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from Tokens.client import TokensApiClient
+from Tokens.dtos import (
+    CreateTokenRequest,
+    CreateTokenResponse,
+    DeleteTokenPathParameters,
+    GetTokenInfoPathParameters,
+    ModifyTokenPathParameters,
+    ModifyTokenRequest,
+    TokenMetadata,
+)
+from concurrency import ProgressCallback, map_bounded
+from exceptions import ResourceNotFound
+from journal import Journal
+
+logger = logging.getLogger(__name__)
+
+SwapCallback = Callable[[TokenMetadata, TokenMetadata], Awaitable[None]]
+
+
+@dataclass
+class RotationResult:
+    rotated: Dict[str, str] = field(default_factory=dict)
+    failed: Dict[str, Exception] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+
+
+class BulkTokensClient:
+    def __init__(
+        self,
+        client: TokensApiClient,
+        concurrency: int = 10,
+        progress_callback: Optional[ProgressCallback] = None,
+    ):
+        self._client = client
+        self._concurrency = concurrency
+        self._progress_callback = progress_callback
+
+    async def create_tokens(
+        self, requests: Sequence[CreateTokenRequest]
+    ) -> List[Union[CreateTokenResponse, Exception]]:
+        return await map_bounded(
+            self._client.create_new_token,
+            requests,
+            self._concurrency,
+            return_exceptions=True,
+            progress_callback=self._progress_callback,
+        )
+
+    async def modify_tokens(
+        self,
+        modifications: Sequence[Tuple[ModifyTokenPathParameters, ModifyTokenRequest]],
+    ) -> List[Optional[Exception]]:
+        async def modify(
+            modification: Tuple[ModifyTokenPathParameters, ModifyTokenRequest]
+        ) -> None:
+            await self._client.modify_token_info(*modification)
+
+        return await map_bounded(
+            modify,
+            modifications,
+            self._concurrency,
+            return_exceptions=True,
+            progress_callback=self._progress_callback,
+        )
+
+    async def delete_tokens(
+        self, path_params: Sequence[DeleteTokenPathParameters]
+    ) -> List[Optional[Exception]]:
+        return await map_bounded(
+            self._client.delete_asset,
+            path_params,
+            self._concurrency,
+            return_exceptions=True,
+            progress_callback=self._progress_callback,
+        )
+
+    async def rotate_tokens(
+        self,
+        token_ids: Sequence[str],
+        swap: SwapCallback,
+        journal_path: Union[str, Path],
+    ) -> RotationResult:
+        journal = Journal(journal_path)
+        result = RotationResult()
+
+        async def rotate(token_id: str) -> None:
+            entry = journal.get(token_id) or {}
+            if entry.get("state") == "deleted":
+                result.skipped.append(token_id)
+                return
+            try:
+                new_token_id = await self._rotate_token(token_id, entry, swap, journal)
+            except Exception as e:
+                logger.warning(f"Rotation of token {token_id} has failed: {str(e)}.")
+                result.failed[token_id] = e
+            else:
+                result.rotated[token_id] = new_token_id
+
+        await map_bounded(
+            rotate,
+            token_ids,
+            self._concurrency,
+            progress_callback=self._progress_callback,
+        )
+        return result
+
+    async def _rotate_token(
+        self, token_id: str, entry: Dict, swap: SwapCallback, journal: Journal
+    ) -> str:
+        state = entry.get("state")
+        if state is None:
+            old_token = await self._client.get_info_about_token(
+                GetTokenInfoPathParameters(tokenId=token_id)
+            )
+            new_token = await self._client.create_new_token(
+                CreateTokenRequest(
+                    name=old_token.name,
+                    scopes=old_token.scopes,
+                    assetIds=old_token.asset_ids,
+                    allowedUrls=old_token.allowed_urls,
+                )
+            )
+            journal.record(token_id, state="created", new_token_id=new_token.id)
+            await swap(old_token, new_token)
+            journal.record(token_id, state="swapped")
+        elif state == "created":
+            old_token = await self._client.get_info_about_token(
+                GetTokenInfoPathParameters(tokenId=token_id)
+            )
+            new_token = await self._client.get_info_about_token(
+                GetTokenInfoPathParameters(tokenId=entry["new_token_id"])
+            )
+            await swap(old_token, new_token)
+            journal.record(token_id, state="swapped")
+
+        try:
+            await self._client.delete_asset(DeleteTokenPathParameters(tokenId=token_id))
+        except ResourceNotFound:
+            logger.debug(f"Token {token_id} was already deleted.")
+        journal.record(token_id, state="deleted")
+        return journal.entries[token_id]["new_token_id"]
@@ -1,9 +1,10 @@
 import logging
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, List, AsyncIterator
 
 from Tokens.dtos import (
     ListTokensQueryParameters,
     ListTokensResponse,
+    TokenMetadata,
     CreateTokenRequest,
     CreateTokenResponse,
     GetTokenInfoPathParameters,
@@ -15,6 +16,9 @@ from Tokens.dtos import (
 )
 from dtos import PaginationLinks
 from http_client import HTTPClientProtocol
+from instrumentation import operation
+from pagination import iterate_link_pages
+import routes
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +30,19 @@ class TokensApiClient:
     async def list_tokens(
         self, query_params: ListTokensQueryParameters
     ) -> Tuple[ListTokensResponse, Optional[PaginationLinks]]:
-        endpoint_url = "/v2/tokens" + query_params.to_query_params()
+        endpoint_url = routes.TOKENS.path() + query_params.to_query_params()
+        return await self._list_tokens_page(endpoint_url)
+
+    def iterate_tokens(
+        self, query_params: ListTokensQueryParameters, prefetch: bool = False
+    ) -> AsyncIterator[TokenMetadata]:
+        endpoint_url = routes.TOKENS.path() + query_params.to_query_params()
+        return iterate_link_pages(self._fetch_tokens_items, endpoint_url, prefetch)
+
+    @operation("list_tokens")
+    async def _list_tokens_page(
+        self, endpoint_url: str
+    ) -> Tuple[ListTokensResponse, Optional[PaginationLinks]]:
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
         )
@@ -34,6 +50,14 @@ class TokensApiClient:
         list_tokens_response = ListTokensResponse.parse_obj(response_body)
         return list_tokens_response, pagination_links
 
+    async def _fetch_tokens_items(
+        self, endpoint_url: str
+    ) -> Tuple[List[TokenMetadata], Optional[PaginationLinks]]:
+        list_tokens_response, pagination_links = await self._list_tokens_page(
+            endpoint_url
+        )
+        return list_tokens_response.items or [], pagination_links
+
     async def _retrieve_pagination_links(
         self, headers: Dict
     ) -> Optional[PaginationLinks]:
@@ -47,12 +71,13 @@ class TokensApiClient:
             pagination_links = PaginationLinks.from_header(link_header)
         return pagination_links
 
+    @operation("create_new_token")
     async def create_new_token(
         self, request_body_dto: CreateTokenRequest
     ) -> CreateTokenResponse:
-        endpoint_url = "/v2/tokens"
+        endpoint_url = routes.TOKENS.path()
         headers = {"Content-type": "application/json"}
-        request_body = request_body_dto.dict()
+        request_body = request_body_dto.dict(by_alias=True, exclude_none=True)
 
         status, response_body, headers = await self._http_client.post(
             endpoint=endpoint_url, headers=headers, data=request_body
@@ -61,34 +86,38 @@ class TokensApiClient:
 
         return create_token_response
 
+    @operation("get_info_about_token")
     async def get_info_about_token(
         self, path_params: GetTokenInfoPathParameters
     ) -> GetTokenInfoResponse:
-        endpoint_url = f"/v2/tokens/{path_params.token_id}"
+        endpoint_url = routes.TOKEN.path(token_id=path_params.token_id)
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
         )
         info_token_response = GetTokenInfoResponse.parse_obj(response_body)
         return info_token_response
 
+    @operation("modify_token_info")
     async def modify_token_info(
         self,
         path_params: ModifyTokenPathParameters,
         request_body_dto: ModifyTokenRequest,
     ) -> None:
-        endpoint_url = f"/v2/tokens/{path_params.token_id}"
-        request_body = request_body_dto.dict()
+        endpoint_url = routes.TOKEN.path(token_id=path_params.token_id)
+        request_body = request_body_dto.dict(by_alias=True, exclude_none=True)
         headers = {"Content-type": "application/json"}
         await self._http_client.patch(
             endpoint=endpoint_url, headers=headers, data=request_body
         )
 
+    @operation("delete_token")
     async def delete_asset(self, path_params: DeleteTokenPathParameters) -> None:
-        endpoint_url = f"/v2/tokens/{path_params.token_id}"
+        endpoint_url = routes.TOKEN.path(token_id=path_params.token_id)
         await self._http_client.delete(endpoint=endpoint_url, headers={})
 
+    @operation("get_default_token")
     async def get_default_token(self) -> GetDefaultTokenResponse:
-        endpoint_url = "/v2/tokens/default"
+        endpoint_url = routes.DEFAULT_TOKEN.path()
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
         )
@@ -6,6 +6,7 @@ from pydantic.main import BaseModel
 
 from Assets.enums import SortOrder
 from Tokens.enums import SortByType, TokenScopes
+from routes import QueryItems, encode_query_fragment
 
 ### List tokens
 
@@ -18,15 +19,18 @@ class ListTokensQueryParameters(BaseModel):
     sortOrder: SortOrder = SortOrder.ASC
 
     def to_query_params(self) -> str:
-        query_params = (
-            f"?limit={self.limit}&page={self.page}&sortOrder={self.sortOrder.value}"
+        return f"?limit={self.limit}&page={self.page}" + encode_query_fragment(
+            self._static_query_items()
         )
+
+    def _static_query_items(self) -> QueryItems:
+        query_items = [("sortOrder", self.sortOrder.value)]
         if self.search:
-            query_params += f"&search={self.search}"
+            query_items.append(("search", self.search))
         if self.sortBy:
-            query_params += f"&sortBy={self.sortBy.name}"
+            query_items.append(("sortBy", self.sortBy.name))
 
-        return query_params
+        return tuple(query_items)
 
 
 class TokenMetadata(BaseModel):
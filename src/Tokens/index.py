@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, FrozenSet, Optional, Set
+
+from Tokens.client import TokensApiClient
+from Tokens.dtos import ListTokensQueryParameters, ModifyTokenRequest, TokenMetadata
+from Tokens.enums import TokenScopes
+
+
+class TokenAuthorizationIndex:
+    def __init__(self):
+        self._tokens: Dict[str, TokenMetadata] = {}
+        self._token_id_by_secret: Dict[str, str] = {}
+        self._token_ids_by_asset: Dict[int, Set[str]] = defaultdict(set)
+        self._token_ids_by_scope: Dict[TokenScopes, Set[str]] = defaultdict(set)
+        self._token_ids_by_url: Dict[str, Set[str]] = defaultdict(set)
+        self._unrestricted_token_ids: Set[str] = set()
+
+    @classmethod
+    async def build(
+        cls,
+        client: TokensApiClient,
+        query_params: Optional[ListTokensQueryParameters] = None,
+    ) -> TokenAuthorizationIndex:
+        index = cls()
+        async for token in client.iterate_tokens(
+            query_params or ListTokensQueryParameters()
+        ):
+            index.add(token)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, token_id: str) -> bool:
+        return token_id in self._tokens
+
+    def get(self, token_id: str) -> Optional[TokenMetadata]:
+        return self._tokens.get(token_id)
+
+    def add(self, token: TokenMetadata) -> None:
+        if token.id is None:
+            return
+        if token.id in self._tokens:
+            self.remove(token.id)
+
+        self._tokens[token.id] = token
+        if token.token:
+            self._token_id_by_secret[token.token] = token.id
+        if token.asset_ids is None:
+            self._unrestricted_token_ids.add(token.id)
+        else:
+            for asset_id in token.asset_ids:
+                self._token_ids_by_asset[asset_id].add(token.id)
+        for scope in token.scopes:
+            self._token_ids_by_scope[scope].add(token.id)
+        for url in token.allowed_urls or []:
+            self._token_ids_by_url[url].add(token.id)
+
+    def apply_modification(
+        self, token_id: str, request_body_dto: ModifyTokenRequest
+    ) -> None:
+        token = self._tokens.get(token_id)
+        if token is None:
+            return
+        changes = {
+            key: value
+            for key, value in request_body_dto.dict().items()
+            if value is not None
+        }
+        self.add(token.copy(update=changes))
+
+    def remove(self, token_id: str) -> None:
+        token = self._tokens.pop(token_id, None)
+        if token is None:
+            return
+
+        if token.token:
+            self._token_id_by_secret.pop(token.token, None)
+        self._unrestricted_token_ids.discard(token_id)
+        for asset_id in token.asset_ids or []:
+            self._discard(self._token_ids_by_asset, asset_id, token_id)
+        for scope in token.scopes:
+            self._discard(self._token_ids_by_scope, scope, token_id)
+        for url in token.allowed_urls or []:
+            self._discard(self._token_ids_by_url, url, token_id)
+
+    def token_id_for_secret(self, secret: str) -> Optional[str]:
+        return self._token_id_by_secret.get(secret)
+
+    def tokens_for_asset(self, asset_id: int) -> FrozenSet[str]:
+        return frozenset(
+            self._token_ids_by_asset.get(asset_id, set()) | self._unrestricted_token_ids
+        )
+
+    def tokens_for_scope(self, scope: TokenScopes) -> FrozenSet[str]:
+        return frozenset(self._token_ids_by_scope.get(scope, set()))
+
+    def tokens_for_url(self, url: str) -> FrozenSet[str]:
+        return frozenset(self._token_ids_by_url.get(url, set()))
+
+    def can_read_asset(self, token_id: str, asset_id: int) -> bool:
+        if token_id not in self._token_ids_by_scope.get(TokenScopes.ASSETS_READ, set()):
+            return False
+        return token_id in self._unrestricted_token_ids or token_id in (
+            self._token_ids_by_asset.get(asset_id, set())
+        )
+
+    def is_url_allowed(self, token_id: str, url: str) -> bool:
+        token = self._tokens.get(token_id)
+        if token is None:
+            return False
+        return not token.allowed_urls or token_id in self._token_ids_by_url.get(
+            url, set()
+        )
+
+    @staticmethod
+    def _discard(mapping: Dict, key, token_id: str) -> None:
+        token_ids = mapping.get(key)
+        if token_ids is None:
+            return
+        token_ids.discard(token_id)
+        if not token_ids:
+            del mapping[key]
@@ -2,6 +2,8 @@ import logging
 
 from User.dtos import ProfileInfoResponse
 from http_client import HTTPClientProtocol
+from instrumentation import operation
+import routes
 
 logger = logging.getLogger(__name__)
 
@@ -10,8 +12,9 @@ class UserApiClient:
     def __init__(self, http_client: HTTPClientProtocol):
         self._http_client = http_client
 
+    @operation("get_profile_info")
     async def get_profile_info(self) -> ProfileInfoResponse:
-        endpoint_url = "/v1/me"
+        endpoint_url = routes.ME.path()
         status, response_body, headers = await self._http_client.get(
             endpoint=endpoint_url, headers={}
         )
@@ -0,0 +1,260 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from Assets.client import AssetsApiClient
+from Assets.dtos import ListAssetsQueryParameters
+from Exports.client import ExportsApiClient
+from Exports.dtos import ListExportsPathParams
+from Tokens.client import TokensApiClient
+from Tokens.dtos import ListTokensQueryParameters, TokenMetadata
+from concurrency import map_bounded
+from enums import ChangeType, Endpoints
+from exceptions import ResourceNotFound
+
+logger = logging.getLogger(__name__)
+
+Snapshot = Dict[str, str]
+Listing = Dict[str, BaseModel]
+
+# Fields that change on mere use, they would report every active item as
+# updated on each poll.
+VOLATILE_FIELDS: Dict[Type[BaseModel], Set[str]] = {
+    TokenMetadata: {"date_last_used"},
+}
+
+
+@dataclass
+class ChangeEvent:
+    resource: Endpoints
+    change: ChangeType
+    key: str
+    # Deleted items are gone from the listing, only their digest was kept.
+    item: Optional[BaseModel]
+
+
+class Subscription:
+    def __init__(
+        self,
+        feed: "ChangeFeed",
+        resources: Optional[Set[Endpoints]] = None,
+        maxsize: int = 0,
+    ):
+        self.resources = resources
+        self._feed = feed
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def __aiter__(self) -> AsyncIterator[ChangeEvent]:
+        return self
+
+    async def __anext__(self) -> ChangeEvent:
+        return await self._queue.get()
+
+    async def get(self) -> ChangeEvent:
+        return await self._queue.get()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        self._feed.unsubscribe(self)
+
+    def wants(self, event: ChangeEvent) -> bool:
+        return self.resources is None or event.resource in self.resources
+
+    def put(self, event: ChangeEvent) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A slow consumer must not hold up the feed for everybody else.
+            self.dropped += 1
+            logger.warning(
+                f"Change feed subscription is full, {event.change.value} "
+                f"{event.resource.value} {event.key} has been dropped."
+            )
+
+
+class ChangeFeed:
+    def __init__(
+        self,
+        assets_client: Optional[AssetsApiClient] = None,
+        tokens_client: Optional[TokensApiClient] = None,
+        exports_client: Optional[ExportsApiClient] = None,
+        export_asset_ids: Iterable[int] = (),
+        interval: float = 60.0,
+        snapshot_path: Optional[Union[str, Path]] = None,
+        emit_initial: bool = False,
+        concurrency: int = 10,
+    ):
+        self.snapshots: Dict[Endpoints, Snapshot] = {}
+        self._assets_client = assets_client
+        self._tokens_client = tokens_client
+        self._exports_client = exports_client
+        self._export_asset_ids = list(export_asset_ids)
+        self._interval = interval
+        self._snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._emit_initial = emit_initial
+        self._concurrency = concurrency
+        self._subscriptions: List[Subscription] = []
+        if self._snapshot_path is not None and self._snapshot_path.exists():
+            self._load_snapshots()
+
+    def subscribe(
+        self, resources: Optional[Iterable[Endpoints]] = None, maxsize: int = 0
+    ) -> Subscription:
+        subscription = Subscription(
+            self, set(resources) if resources is not None else None, maxsize
+        )
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.warning(f"Change feed poll has failed: {str(e)}.")
+            await asyncio.sleep(self._interval)
+
+    async def poll(self) -> List[ChangeEvent]:
+        listers = self._listers()
+        listings = await asyncio.gather(
+            *(list_items() for _, list_items in listers), return_exceptions=True
+        )
+        events: List[ChangeEvent] = []
+        for (resource, _), listing in zip(listers, listings):
+            if isinstance(listing, BaseException):
+                # A partial listing would read as mass deletion, the previous
+                # snapshot stays until a listing succeeds.
+                logger.warning(
+                    f"Listing {resource.value} for the change feed has failed: {str(listing)}."
+                )
+                continue
+            events += self._diff(resource, listing)
+
+        # Events go out before the snapshot is saved, a crash in between
+        # repeats them on restart rather than losing them.
+        for event in events:
+            for subscription in list(self._subscriptions):
+                if subscription.wants(event):
+                    subscription.put(event)
+        if self._snapshot_path is not None:
+            self._save_snapshots()
+        return events
+
+    def _diff(self, resource: Endpoints, listing: Listing) -> List[ChangeEvent]:
+        previous = self.snapshots.get(resource)
+        current = {key: _digest(item) for key, item in listing.items()}
+        self.snapshots[resource] = current
+        if previous is None and not self._emit_initial:
+            return []
+        previous = previous or {}
+        events = [
+            ChangeEvent(
+                resource,
+                ChangeType.UPDATED if key in previous else ChangeType.CREATED,
+                key,
+                listing[key],
+            )
+            for key, digest in current.items()
+            if previous.get(key) != digest
+        ]
+        events += [
+            ChangeEvent(resource, ChangeType.DELETED, key, None)
+            for key in previous
+            if key not in current
+        ]
+        return events
+
+    def _listers(self) -> List[Tuple[Endpoints, Callable[[], Awaitable[Listing]]]]:
+        listers: List[Tuple[Endpoints, Callable[[], Awaitable[Listing]]]] = []
+        if self._assets_client is not None:
+            listers.append((Endpoints.ASSETS, self._list_assets))
+        if self._tokens_client is not None:
+            listers.append((Endpoints.TOKENS, self._list_tokens))
+        if self._exports_client is not None and self._export_asset_ids:
+            listers.append((Endpoints.EXPORTS, self._list_exports))
+        return listers
+
+    async def _list_assets(self) -> Listing:
+        return {
+            str(asset.id): asset
+            async for asset in self._assets_client.iterate_assets(
+                ListAssetsQueryParameters()
+            )
+        }
+
+    async def _list_tokens(self) -> Listing:
+        return {
+            str(token.id): token
+            async for token in self._tokens_client.iterate_tokens(
+                ListTokensQueryParameters()
+            )
+        }
+
+    async def _list_exports(self) -> Listing:
+        async def list_for_asset(asset_id: int) -> List[Tuple[str, BaseModel]]:
+            path_params = ListExportsPathParams(assetId=asset_id)
+            try:
+                return [
+                    (f"{asset_id}/{export.id}", export)
+                    async for export in self._exports_client.iterate_exports(
+                        path_params
+                    )
+                ]
+            except ResourceNotFound:
+                # The asset is gone, and its exports with it.
+                return []
+
+        listings = await map_bounded(
+            list_for_asset, self._export_asset_ids, self._concurrency
+        )
+        return dict(item for listing in listings for item in listing)
+
+    def _load_snapshots(self) -> None:
+        with open(self._snapshot_path) as f:
+            snapshots = json.load(f)
+        self.snapshots = {
+            Endpoints(resource): snapshot for resource, snapshot in snapshots.items()
+        }
+
+    def _save_snapshots(self) -> None:
+        partial_path = self._snapshot_path.with_name(f"{self._snapshot_path.name}.part")
+        with open(partial_path, "w") as f:
+            json.dump(
+                {
+                    resource.value: snapshot
+                    for resource, snapshot in self.snapshots.items()
+                },
+                f,
+            )
+        os.replace(partial_path, self._snapshot_path)
+
+
+def _digest(item: BaseModel) -> str:
+    serialized = item.json(by_alias=True, exclude=VOLATILE_FIELDS.get(type(item)))
+    return hashlib.sha256(serialized.encode()).hexdigest()
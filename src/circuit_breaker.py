@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from urllib.parse import urlsplit
+
+from enums import CircuitState
+from exceptions import ApiError, CircuitOpenError, DeadlineExceeded
+from http_client import STREAM_CHUNK_BYTES, HTTPClientProtocol, StreamedResponse
+from timeouts import remaining_budget
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+StateChangeCallback = Callable[[str, CircuitState, CircuitState], None]
+
+
+def _default_failure_exceptions() -> Tuple[Type[BaseException], ...]:
+    import aiohttp
+
+    failure_exceptions: Tuple[Type[BaseException], ...] = (
+        TimeoutError,
+        OSError,
+        aiohttp.ClientConnectionError,
+    )
+    try:
+        import httpx
+    except ImportError:
+        return failure_exceptions
+    # Connection errors and timeouts of the HTTP/2 transport.
+    return failure_exceptions + (httpx.TransportError,)
+
+
+@dataclass
+class CircuitBreakerConfig:
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    half_open_max_calls: int = 1
+    family_depth: int = 2
+    failure_exceptions: Tuple[Type[BaseException], ...] = field(
+        default_factory=_default_failure_exceptions
+    )
+
+    def is_neutral(self, error: BaseException) -> bool:
+        # The caller gave up, so nothing was learned about the backend. Timeouts
+        # cut short to fit an expired deadline count as the caller giving up.
+        if isinstance(error, (asyncio.CancelledError, DeadlineExceeded)):
+            return True
+        budget = remaining_budget()
+        return isinstance(error, TimeoutError) and budget is not None and budget <= 0
+
+    def is_failure(self, error: BaseException) -> bool:
+        if self.is_neutral(error):
+            return False
+        if isinstance(error, ApiError):
+            return error.status is not None and (
+                error.status >= 500 or error.status == 429
+            )
+        return isinstance(error, self.failure_exceptions)
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        config: Optional[CircuitBreakerConfig] = None,
+        on_state_change: Optional[StateChangeCallback] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.config = config or CircuitBreakerConfig()
+        self._on_state_change = on_state_change
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._half_open_calls = 0
+        self.failures = 0
+        self.successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.config.recovery_timeout
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        probe = self._before_call()
+        try:
+            result = await func()
+        except BaseException as e:
+            if self.config.is_failure(e):
+                self._record_failure()
+            elif isinstance(e, ApiError) and not self.config.is_neutral(e):
+                # The backend has answered, just not with what was asked for.
+                self._record_success()
+            elif probe:
+                # Anything else tells nothing about the backend's health.
+                self._release_probe()
+            raise
+        self._record_success()
+        return result
+
+    def snapshot(self) -> Dict:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._consecutive_failures,
+            "failures": self.failures,
+            "successes": self.successes,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
+
+    def _before_call(self) -> bool:
+        state = self.state
+        if state == CircuitState.OPEN or (
+            state == CircuitState.HALF_OPEN
+            and self._half_open_calls >= self.config.half_open_max_calls
+        ):
+            self.rejected += 1
+            raise CircuitOpenError(
+                f"Circuit `{self.name}` is {state.value}, request has been rejected."
+            )
+        if state == CircuitState.HALF_OPEN:
+            self._half_open_calls += 1
+            return True
+        return False
+
+    def _release_probe(self) -> None:
+        if self._state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def _record_success(self) -> None:
+        self.successes += 1
+        self._consecutive_failures = 0
+        if self._state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.CLOSED)
+
+    def _record_failure(self) -> None:
+        self.failures += 1
+        self._consecutive_failures += 1
+        if (
+            self._state == CircuitState.HALF_OPEN
+            or self._consecutive_failures >= self.config.failure_threshold
+        ):
+            self._opened_at = self._clock()
+            self._transition(CircuitState.OPEN)
+
+    def _transition(self, new_state: CircuitState) -> None:
+        old_state = self._state
+        if old_state == new_state:
+            return
+        self._state = new_state
+        self._half_open_calls = 0
+        if new_state == CircuitState.OPEN:
+            self.times_opened += 1
+        logger.info(
+            f"Circuit `{self.name}` changed from {old_state.value} to {new_state.value}."
+        )
+        if self._on_state_change is not None:
+            self._on_state_change(self.name, old_state, new_state)
+
+
+class CircuitBreakerClient(HTTPClientProtocol):
+    def __init__(
+        self,
+        http_client: HTTPClientProtocol,
+        config: Optional[CircuitBreakerConfig] = None,
+        on_state_change: Optional[StateChangeCallback] = None,
+    ):
+        self._http_client = http_client
+        self.config = config or CircuitBreakerConfig()
+        self._on_state_change = on_state_change
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    @property
+    def host(self) -> str:
+        return self._http_client.host  # type: ignore[attr-defined]
+
+    async def post(
+        self, endpoint: str, headers: dict, data: dict
+    ) -> Tuple[int, dict, dict]:
+        return await self._breaker_for(endpoint).call(
+            lambda: self._http_client.post(endpoint, headers, data)
+        )
+
+    async def get(self, endpoint: str, headers: dict) -> Tuple[int, dict, dict]:
+        return await self._breaker_for(endpoint).call(
+            lambda: self._http_client.get(endpoint, headers)
+        )
+
+    async def patch(
+        self, endpoint: str, headers: dict, data: dict
+    ) -> Tuple[int, dict, dict]:
+        return await self._breaker_for(endpoint).call(
+            lambda: self._http_client.patch(endpoint, headers, data)
+        )
+
+    async def delete(self, endpoint: str, headers: dict) -> None:
+        await self._breaker_for(endpoint).call(
+            lambda: self._http_client.delete(endpoint, headers)
+        )
+
+    @asynccontextmanager
+    async def stream(
+        self, endpoint: str, headers: dict, chunk_size: int = STREAM_CHUNK_BYTES
+    ) -> AsyncIterator[StreamedResponse]:
+        # Only opening the stream counts, a consumer giving up midway is not an
+        # outage.
+        async with AsyncExitStack() as stack:
+            response = await self._breaker_for(endpoint).call(
+                lambda: stack.enter_async_context(
+                    self._http_client.stream(endpoint, headers, chunk_size)
+                )
+            )
+            yield response
+
+    async def close(self) -> None:
+        await self._http_client.close()
+
+    async def warm_up(
+        self, n_connections: int, keepalive_timeout: Optional[float] = None
+    ) -> int:
+        return await self._http_client.warm_up(n_connections, keepalive_timeout)
+
+    def deadline(self, seconds: float) -> AsyncContextManager[None]:
+        return self._http_client.deadline(seconds)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {name: breaker.snapshot() for name, breaker in self.breakers.items()}
+
+    def _breaker_for(self, endpoint: str) -> CircuitBreaker:
+        parts = urlsplit(endpoint)
+        segments = [segment for segment in parts.path.split("/") if segment]
+        family = "/" + "/".join(segments[: self.config.family_depth])
+        name = f"{parts.netloc or self.host}{family}"
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, self.config, self._on_state_change)
+            self.breakers[name] = breaker
+        return breaker
+
+
+class PrometheusCircuitStateHook:
+    # Expects a prometheus_client-like gauge labelled with ("circuit",), the
+    # value is 0 for CLOSED, 1 for HALF_OPEN and 2 for OPEN.
+    STATE_VALUES = {
+        CircuitState.CLOSED: 0,
+        CircuitState.HALF_OPEN: 1,
+        CircuitState.OPEN: 2,
+    }
+
+    def __init__(self, state_gauge: Any):
+        self._state_gauge = state_gauge
+
+    def __call__(
+        self, name: str, old_state: CircuitState, new_state: CircuitState
+    ) -> None:
+        self._state_gauge.labels(circuit=name).set(self.STATE_VALUES[new_state])
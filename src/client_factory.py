@@ -1,38 +1,83 @@
-from typing import Union
-
-from Archives.client import ArchivesApiClient
-from Assets.client import AssetsApiClient
-from Exports.client import ExportsApiClient
-from Tokens.client import TokensApiClient
-from User.client import UserApiClient
-from enums import Endpoints
+import importlib
+from typing import TYPE_CHECKING, Dict, Optional, Union
+
+from circuit_breaker import (
+    CircuitBreakerClient,
+    CircuitBreakerConfig,
+    StateChangeCallback,
+)
+from enums import Endpoints, Transport
 from exceptions import NotSupportedEndpointError
-from http_client import AsyncClient
+from http_client import AsyncClient, HTTPClientProtocol
+from instrumentation import Instrumentation
+from rate_limit import RateLimit, RateLimitedClient
+from timeouts import Timeouts
+
+if TYPE_CHECKING:
+    import aiohttp
+
+    from Archives.client import ArchivesApiClient
+    from Assets.client import AssetsApiClient
+    from Exports.client import ExportsApiClient
+    from Tokens.client import TokensApiClient
+    from User.client import UserApiClient
 
 
 class ClientFactory:
+    # Client modules pull in their pydantic DTOs, they are imported on first
+    # build of the endpoint rather than with the factory.
     ENDPOINT_TO_API_CLIENT_MAP = {
-        Endpoints.ARCHIVES: ArchivesApiClient,
-        Endpoints.ASSETS: AssetsApiClient,
-        Endpoints.EXPORTS: ExportsApiClient,
-        Endpoints.TOKENS: TokensApiClient,
-        Endpoints.USER: UserApiClient,
+        Endpoints.ARCHIVES: "Archives.client:ArchivesApiClient",
+        Endpoints.ASSETS: "Assets.client:AssetsApiClient",
+        Endpoints.EXPORTS: "Exports.client:ExportsApiClient",
+        Endpoints.TOKENS: "Tokens.client:TokensApiClient",
+        Endpoints.USER: "User.client:UserApiClient",
     }
 
-    def __init__(self, host: str, bearer_token: str):
+    def __init__(
+        self,
+        host: str,
+        bearer_token: str,
+        transport: Transport = Transport.AIOHTTP,
+        instrumentation: Optional[Instrumentation] = None,
+        timeouts: Optional[Timeouts] = None,
+        operation_timeouts: Optional[Dict[str, Timeouts]] = None,
+        circuit_breaker: Optional[CircuitBreakerConfig] = None,
+        on_circuit_state_change: Optional[StateChangeCallback] = None,
+        connector: Optional["aiohttp.BaseConnector"] = None,
+        rate_limit: Optional[RateLimit] = None,
+        keepalive_timeout: Optional[float] = None,
+    ):
         self.host = host
         self.bearer_token = bearer_token
+        self.transport = transport
+        self.instrumentation = instrumentation
+        self.timeouts = timeouts
+        self.operation_timeouts = operation_timeouts
+        self.circuit_breaker = circuit_breaker
+        self.on_circuit_state_change = on_circuit_state_change
+        self.connector = connector
+        self.rate_limit = rate_limit
+        self.keepalive_timeout = keepalive_timeout
+        self._http_client: Optional[HTTPClientProtocol] = None
+
+    # The transport keeps a connection pool open between requests, leaving the
+    # block (or calling `close`) is what releases its sockets.
+    async def __aenter__(self) -> "ClientFactory":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
 
     def build(
         self, endpoint: Endpoints
     ) -> Union[
-        ArchivesApiClient,
-        AssetsApiClient,
-        ExportsApiClient,
-        TokensApiClient,
-        UserApiClient,
+        "ArchivesApiClient",
+        "AssetsApiClient",
+        "ExportsApiClient",
+        "TokensApiClient",
+        "UserApiClient",
     ]:
-        http_client = AsyncClient(host=self.host, bearer_token=self.bearer_token)
         try:
             client = self.ENDPOINT_TO_API_CLIENT_MAP[endpoint]
         except KeyError as e:
@@ -40,4 +85,58 @@ class ClientFactory:
                 f"Provided endpoint {str(e)} is not supported."
             )
         else:
-            return client(http_client=http_client)
+            if isinstance(client, str):
+                module_name, class_name = client.split(":")
+                client = getattr(importlib.import_module(module_name), class_name)
+            return client(http_client=self._get_http_client())
+
+    async def warm_up(
+        self, n_connections: int = 10, keepalive_timeout: Optional[float] = None
+    ) -> int:
+        return await self._get_http_client().warm_up(n_connections, keepalive_timeout)
+
+    async def close(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.close()
+            self._http_client = None
+
+    def _get_http_client(self) -> HTTPClientProtocol:
+        if self._http_client is None:
+            # Each transport keeps its own default keep-alive window.
+            keepalive = (
+                {"keepalive_timeout": self.keepalive_timeout}
+                if self.keepalive_timeout is not None
+                else {}
+            )
+            if self.transport == Transport.HTTP2:
+                from http2_client import HTTP2Client
+
+                self._http_client = HTTP2Client(
+                    host=self.host,
+                    bearer_token=self.bearer_token,
+                    instrumentation=self.instrumentation,
+                    timeouts=self.timeouts,
+                    operation_timeouts=self.operation_timeouts,
+                    **keepalive,
+                )
+            else:
+                self._http_client = AsyncClient(
+                    host=self.host,
+                    bearer_token=self.bearer_token,
+                    connector=self.connector,
+                    instrumentation=self.instrumentation,
+                    timeouts=self.timeouts,
+                    operation_timeouts=self.operation_timeouts,
+                    **keepalive,
+                )
+            if self.circuit_breaker is not None:
+                self._http_client = CircuitBreakerClient(
+                    self._http_client,
+                    self.circuit_breaker,
+                    self.on_circuit_state_change,
+                )
+            if self.rate_limit is not None:
+                self._http_client = RateLimitedClient(
+                    self._http_client, self.rate_limit
+                )
+        return self._http_client
@@ -0,0 +1,125 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
+
+from client_factory import ClientFactory
+from enums import Endpoints, Transport
+from rate_limit import RateLimit
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Tenant:
+    factory: ClientFactory
+    last_used_at: float
+
+
+class ClientPool:
+    def __init__(
+        self,
+        host: str,
+        max_tenants: int = 100,
+        idle_timeout: float = 300.0,
+        rate_limit: Optional[RateLimit] = None,
+        connection_limit: int = 100,
+        clock: Callable[[], float] = time.monotonic,
+        **factory_options: Any,
+    ):
+        if "connector" in factory_options:
+            raise ValueError(
+                "The pool shares its own connector between tenants, `connector` "
+                "can not be passed to its factories."
+            )
+        self.host = host
+        self.max_tenants = max_tenants
+        self.idle_timeout = idle_timeout
+        self.rate_limit = rate_limit
+        self.connection_limit = connection_limit
+        self.factory_options = factory_options
+        self._clock = clock
+        self._tenants: "OrderedDict[str, _Tenant]" = OrderedDict()
+        self._connector: Optional["aiohttp.TCPConnector"] = None
+
+    async def __aenter__(self) -> "ClientPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def __contains__(self, bearer_token: str) -> bool:
+        return bearer_token in self._tenants
+
+    async def factory(self, bearer_token: str) -> ClientFactory:
+        tenant = self._tenants.get(bearer_token)
+        if tenant is None:
+            tenant = _Tenant(self._create_factory(bearer_token), self._clock())
+            self._tenants[bearer_token] = tenant
+            await self._evict_least_recently_used()
+        else:
+            self._tenants.move_to_end(bearer_token)
+            tenant.last_used_at = self._clock()
+        return tenant.factory
+
+    async def build(self, bearer_token: str, endpoint: Endpoints):
+        return (await self.factory(bearer_token)).build(endpoint)
+
+    async def close_idle(self) -> int:
+        now = self._clock()
+        idle_tokens = [
+            bearer_token
+            for bearer_token, tenant in self._tenants.items()
+            if now - tenant.last_used_at >= self.idle_timeout
+        ]
+        await self._close_tenants(idle_tokens)
+        return len(idle_tokens)
+
+    async def close(self) -> None:
+        await self._close_tenants(list(self._tenants))
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+    def _create_factory(self, bearer_token: str) -> ClientFactory:
+        connector = None
+        # Connections carry no credentials, the bearer token is sent per request,
+        # so aiohttp tenants can share one pool. httpx clients are not shared.
+        if (
+            self.factory_options.get("transport", Transport.AIOHTTP)
+            == Transport.AIOHTTP
+        ):
+            if self._connector is None or self._connector.closed:
+                import aiohttp
+
+                self._connector = aiohttp.TCPConnector(limit=self.connection_limit)
+            connector = self._connector
+        return ClientFactory(
+            self.host,
+            bearer_token,
+            connector=connector,
+            rate_limit=self.rate_limit,
+            **self.factory_options,
+        )
+
+    async def _evict_least_recently_used(self) -> None:
+        overflow = len(self._tenants) - self.max_tenants
+        if overflow > 0:
+            await self._close_tenants(list(self._tenants)[:overflow])
+
+    async def _close_tenants(self, bearer_tokens: List[str]) -> None:
+        for bearer_token in bearer_tokens:
+            tenant = self._tenants.pop(bearer_token)
+            try:
+                await tenant.factory.close()
+            except Exception as e:
+                logger.warning(
+                    f"Closing a pooled client has failed because of {str(e)}."
+                )
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Awaitable, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+ProgressCallback = Callable[[int, int], None]
+
+
+async def map_bounded(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    limit: int,
+    return_exceptions: bool = False,
+    progress_callback: Optional[ProgressCallback] = None,
+) -> List:
+    items = list(items)
+    results: List = [None] * len(items)
+    pending = iter(enumerate(items))
+    done = 0
+
+    async def worker() -> None:
+        nonlocal done
+        for index, item in pending:
+            try:
+                results[index] = await func(item)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[index] = e
+            done += 1
+            if progress_callback is not None:
+                progress_callback(done, len(items))
+
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            for _ in range(min(limit, len(items))):
+                task_group.create_task(worker())
+    except ExceptionGroup as group:
+        # Callers handle what func raises, not the task group's wrapper. The
+        # other workers have been cancelled by then.
+        raise group.exceptions[0]
+
+    return results
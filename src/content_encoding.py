@@ -0,0 +1,101 @@
+import importlib
+import importlib.util
+import logging
+import zlib
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+
+from exceptions import MalformedResponseError
+
+logger = logging.getLogger(__name__)
+
+
+class Decompressor(Protocol):
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError()
+
+    def flush(self) -> bytes:
+        raise NotImplementedError()
+
+
+class BrotliDecompressor:
+    def __init__(self):
+        self._decompressor = importlib.import_module("brotli").Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.process(data)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def _gzip() -> Decompressor:
+    return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+
+def _deflate() -> Decompressor:
+    return zlib.decompressobj()
+
+
+def _zstd() -> Decompressor:
+    return importlib.import_module("zstandard").ZstdDecompressor().decompressobj()
+
+
+# Preferred first. Brotli and zstd are only offered when their (optional)
+# libraries are installed, the modules are imported on the first response.
+_DECOMPRESSORS: List[Tuple[str, Optional[str], Callable[[], Decompressor]]] = [
+    ("zstd", "zstandard", _zstd),
+    ("br", "brotli", BrotliDecompressor),
+    ("gzip", None, _gzip),
+    ("deflate", None, _deflate),
+]
+DECOMPRESSORS: Dict[str, Callable[[], Decompressor]] = {
+    encoding: factory
+    for encoding, module, factory in _DECOMPRESSORS
+    if module is None or importlib.util.find_spec(module) is not None
+}
+ACCEPT_ENCODING = ", ".join(DECOMPRESSORS)
+
+
+# Legacy names from RFC 9110 that mean the same coding.
+ALIASES = {"x-gzip": "gzip"}
+
+
+class ContentDecoder:
+    def __init__(self, content_encoding: str):
+        codings = [
+            ALIASES.get(coding, coding)
+            for coding in (c.strip().lower() for c in content_encoding.split(","))
+            if coding and coding != "identity"
+        ]
+        self.content_encoding = ", ".join(codings) or "identity"
+        unsupported = [coding for coding in codings if coding not in DECOMPRESSORS]
+        if unsupported:
+            raise MalformedResponseError(
+                f"Response body is encoded with unsupported `{', '.join(unsupported)}`."
+            )
+        # Codings are listed in the order they were applied, so they are undone
+        # back to front.
+        self._decompressors: List[Decompressor] = [
+            DECOMPRESSORS[coding]() for coding in reversed(codings)
+        ]
+
+    def decode(self, chunk: bytes) -> bytes:
+        try:
+            for decompressor in self._decompressors:
+                chunk = decompressor.decompress(chunk)
+            return chunk
+        except Exception as e:
+            raise MalformedResponseError(
+                f"Response body could not be decoded as `{self.content_encoding}`: {str(e)}."
+            )
+
+    def flush(self) -> bytes:
+        try:
+            chunk = b""
+            for decompressor in self._decompressors:
+                chunk = decompressor.decompress(chunk) + decompressor.flush()
+            return chunk
+        except Exception as e:
+            raise MalformedResponseError(
+                f"Response body could not be decoded as `{self.content_encoding}`: {str(e)}."
+            )
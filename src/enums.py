@@ -7,3 +7,20 @@ class Endpoints(Enum):
     EXPORTS = "EXPORTS"
     TOKENS = "TOKENS"
     USER = "USER"
+
+
+class Transport(Enum):
+    AIOHTTP = "AIOHTTP"
+    HTTP2 = "HTTP2"
+
+
+class CircuitState(Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class ChangeType(Enum):
+    CREATED = "CREATED"
+    UPDATED = "UPDATED"
+    DELETED = "DELETED"
@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class MalformedResponseError(Exception):
     pass
 
@@ -6,17 +9,55 @@ class NotSupportedEndpointError(Exception):
     pass
 
 
-class InvalidCredentials(Exception):
+class ApiError(Exception):
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        code: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.request_id = request_id
+
+
+class InvalidCredentials(ApiError):
+    pass
+
+
+class ResourceNotFound(ApiError):
+    pass
+
+
+class PlanUpgradeRequired(ApiError):
+    pass
+
+
+class UnknownError(ApiError):
+    pass
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class ExportFailedError(Exception):
     pass
 
 
-class ResourceNotFound(Exception):
+class ArchiveFailedError(Exception):
     pass
 
 
-class PlanUpgradeRequired(Exception):
+class ArchiveExtractionError(Exception):
     pass
 
 
-class UnknownError(Exception):
+class UnsupportedZipStreamError(ArchiveExtractionError):
     pass
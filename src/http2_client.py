@@ -0,0 +1,216 @@
+import logging
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+from http_client import (
+    STREAM_CHUNK_BYTES,
+    AsyncClient,
+    HTTPClientProtocol,
+    StreamedResponse,
+    _request_id,
+    build_api_error,
+    decode_json_body,
+    is_absolute_url,
+    serialize_json,
+)
+from instrumentation import Instrumentation, RequestMetrics, current_operation
+import routes
+from timeouts import Timeouts, remaining_budget
+
+logger = logging.getLogger(__name__)
+
+# Seconds an idle pooled connection is kept open, httpx's own default.
+DEFAULT_KEEPALIVE_TIMEOUT = 5.0
+
+
+class HTTP2Client(HTTPClientProtocol):
+    ERROR_PER_STATUS_CODE_MAP = AsyncClient.ERROR_PER_STATUS_CODE_MAP
+
+    def __init__(
+        self,
+        host: str,
+        bearer_token: str,
+        max_connections: int = 10,
+        instrumentation: Optional[Instrumentation] = None,
+        timeouts: Optional[Timeouts] = None,
+        operation_timeouts: Optional[Dict[str, Timeouts]] = None,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    ):
+        self.host = host
+        self.bearer_token = bearer_token
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.instrumentation = instrumentation or Instrumentation()
+        self.timeouts = timeouts or Timeouts()
+        self.operation_timeouts = operation_timeouts or {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "HTTP2Client":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def warm_up(
+        self, n_connections: int, keepalive_timeout: Optional[float] = None
+    ) -> int:
+        if (
+            keepalive_timeout is not None
+            and keepalive_timeout != self.keepalive_timeout
+        ):
+            self.keepalive_timeout = keepalive_timeout
+            # httpx fixes the expiry per client, the pool is started anew.
+            await self.close()
+        # Every request is multiplexed over a single HTTP/2 connection, opening
+        # that one is all there is to warm up.
+        endpoint = routes.ME.path()
+        try:
+            async with self.instrumentation.measure("HEAD", endpoint) as metrics:
+                result = await self._get_client().head(endpoint)
+                metrics.status = result.status_code
+        except Exception as e:
+            logger.warning(
+                f"Connection to {self.host} could not be warmed up: {str(e)}."
+            )
+            return 0
+        return 1
+
+    async def post(
+        self, endpoint: str, headers: dict, data: dict
+    ) -> Tuple[int, dict, dict]:
+        return await self._request(
+            "POST", endpoint, headers, 200, content=serialize_json(data)
+        )
+
+    async def get(self, endpoint: str, headers: dict) -> Tuple[int, dict, dict]:
+        return await self._request("GET", endpoint, headers, 200)
+
+    async def patch(
+        self, endpoint: str, headers: dict, data: dict
+    ) -> Tuple[int, dict, dict]:
+        return await self._request(
+            "PATCH", endpoint, headers, 204, content=serialize_json(data)
+        )
+
+    async def delete(self, endpoint: str, headers: dict) -> None:
+        await self._request("DELETE", endpoint, headers, 204)
+
+    @asynccontextmanager
+    async def stream(
+        self, endpoint: str, headers: dict, chunk_size: int = STREAM_CHUNK_BYTES
+    ) -> AsyncIterator[StreamedResponse]:
+        timeouts = self.operation_timeouts.get(
+            current_operation(), replace(self.timeouts, total=None)
+        ).bounded_by(remaining_budget())
+        client = self._get_client()
+        request = client.build_request(
+            "GET",
+            endpoint,
+            headers=headers,
+            timeout=httpx.Timeout(None, connect=timeouts.connect, read=timeouts.read),
+        )
+        external = is_absolute_url(endpoint)
+        if external and "Authorization" not in headers:
+            del request.headers["Authorization"]
+        async with self.instrumentation.measure(
+            "GET", endpoint
+        ) as metrics, asyncio.timeout(timeouts.total):
+            result = await client.send(request, stream=True)
+            try:
+                metrics.status = result.status_code
+                if result.status_code != 200:
+                    raise build_api_error(
+                        self.ERROR_PER_STATUS_CODE_MAP,
+                        f"GET request to: {'' if external else self.host}{endpoint}",
+                        result.status_code,
+                        result.headers.get("Content-Type", ""),
+                        await result.aread(),
+                        _request_id(result.headers),
+                    )
+                yield StreamedResponse(
+                    result.status_code,
+                    dict(result.headers),
+                    self._count_chunks(result, chunk_size, metrics),
+                )
+            finally:
+                await result.aclose()
+
+    async def _count_chunks(
+        self, result: httpx.Response, chunk_size: int, metrics: RequestMetrics
+    ) -> AsyncIterator[bytes]:
+        metrics.content_encoding = result.headers.get("Content-Encoding", "identity")
+        async for chunk in result.aiter_bytes(chunk_size):
+            metrics.response_bytes += len(chunk)
+            metrics.response_wire_bytes = result.num_bytes_downloaded
+            yield chunk
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        headers: dict,
+        expected_status: int,
+        **kwargs,
+    ) -> Tuple[int, dict, dict]:
+        timeouts = self.operation_timeouts.get(
+            current_operation(), self.timeouts
+        ).bounded_by(remaining_budget())
+        async with self.instrumentation.measure(
+            method, endpoint
+        ) as metrics, asyncio.timeout(timeouts.total):
+            send = getattr(self._get_client(), method.lower())
+            result: httpx.Response = await send(
+                endpoint,
+                headers=headers,
+                timeout=httpx.Timeout(
+                    None, connect=timeouts.connect, read=timeouts.read
+                ),
+                **kwargs,
+            )
+            metrics.status = result.status_code
+            metrics.request_bytes = len(result.request.content)
+            metrics.response_bytes = len(result.content)
+            # httpx negotiates and decodes gzip, br and zstd on its own.
+            metrics.response_wire_bytes = result.num_bytes_downloaded
+            metrics.content_encoding = result.headers.get(
+                "Content-Encoding", "identity"
+            )
+
+        content_type = result.headers.get("Content-Type", "")
+        request_description = f"{method} request to: {self.host}{endpoint}"
+        if result.status_code != expected_status:
+            raise build_api_error(
+                self.ERROR_PER_STATUS_CODE_MAP,
+                request_description,
+                result.status_code,
+                content_type,
+                result.content,
+                _request_id(result.headers),
+            )
+        response_body = decode_json_body(
+            request_description, content_type, result.content
+        )
+        return result.status_code, response_body, dict(result.headers)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.host,
+                http2=True,
+                headers={"Authorization": f"Bearer {self.bearer_token}"},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    keepalive_expiry=self.keepalive_timeout,
+                ),
+            )
+            logger.debug(f"HTTP/2 client created for {self.host}.")
+        return self._client
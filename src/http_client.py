@@ -1,17 +1,153 @@
+import asyncio
+import importlib
+import json
 import logging
-from typing import Tuple, Protocol, Dict
-import aiohttp
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Tuple,
+    Protocol,
+    Dict,
+    Optional,
+    Type,
+)
+from urllib.parse import urlsplit
 
+from content_encoding import ACCEPT_ENCODING, ContentDecoder
 from exceptions import (
+    ApiError,
+    MalformedResponseError,
     InvalidCredentials,
     ResourceNotFound,
     PlanUpgradeRequired,
     UnknownError,
 )
+from instrumentation import Instrumentation, RequestMetrics, current_operation
+import routes
+from timeouts import Timeouts, deadline, remaining_budget
+
+if TYPE_CHECKING:
+    import aiohttp
 
 logger = logging.getLogger(__name__)
 
 
+# aiohttp takes a noticeable share of the start-up time, it is imported on first
+# use and then exposed as `http_client.aiohttp` like a regular import.
+def __getattr__(name: str) -> Any:
+    if name == "aiohttp":
+        module = importlib.import_module("aiohttp")
+        globals()["aiohttp"] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+MAX_ERROR_BODY_BYTES = 2048
+STREAM_CHUNK_BYTES = 1024 * 1024
+REQUEST_ID_HEADERS = ("X-Request-Id", "CF-Ray")
+# Seconds an idle pooled connection is kept open, aiohttp's own default.
+DEFAULT_KEEPALIVE_TIMEOUT = 15.0
+
+
+def serialize_json(data: Any) -> str:
+    return json.dumps(data, default=_json_default)
+
+
+def decode_json_body(request_description: str, content_type: str, body: bytes) -> Dict:
+    if not body.strip():
+        return {}
+    if content_type and "json" not in content_type:
+        raise MalformedResponseError(
+            f"{request_description} has returned a `{content_type}` body instead of JSON."
+        )
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise MalformedResponseError(
+            f"{request_description} has returned a body that is not valid JSON."
+        )
+
+
+def build_api_error(
+    error_per_status_code_map: Dict[str, Type[ApiError]],
+    request_description: str,
+    status_code: int,
+    content_type: str,
+    body: bytes,
+    request_id: Optional[str],
+) -> ApiError:
+    error_text = body[:MAX_ERROR_BODY_BYTES].decode("utf-8", errors="replace")
+    error_code = None
+    if "json" in content_type or body.lstrip().startswith(b"{"):
+        try:
+            error_body = json.loads(body)
+        except ValueError:
+            error_body = None
+        if isinstance(error_body, dict):
+            error_code = error_body.get("code")
+    error_type = error_per_status_code_map.get(str(status_code), UnknownError)
+    return error_type(
+        f"{request_description} has returned with status code: {status_code}. "
+        f'Error: "{error_text}"',
+        status=status_code,
+        code=error_code,
+        request_id=request_id,
+    )
+
+
+def _request_id(headers) -> Optional[str]:
+    for header in REQUEST_ID_HEADERS:
+        if header in headers:
+            return headers[header]
+    return None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def is_absolute_url(endpoint: str) -> bool:
+    return urlsplit(endpoint).netloc != ""
+
+
+async def _decoded_chunks(
+    response: "aiohttp.ClientResponse",
+    chunks: AsyncIterator[bytes],
+    metrics: RequestMetrics,
+) -> AsyncIterator[bytes]:
+    decoder = ContentDecoder(response.headers.get("Content-Encoding", ""))
+    metrics.content_encoding = decoder.content_encoding
+    async for chunk in chunks:
+        metrics.response_wire_bytes += len(chunk)
+        decoded = decoder.decode(chunk)
+        metrics.response_bytes += len(decoded)
+        if decoded:
+            yield decoded
+    decoded = decoder.flush()
+    metrics.response_bytes += len(decoded)
+    if decoded:
+        yield decoded
+
+
+@dataclass
+class StreamedResponse:
+    status: int
+    headers: Dict
+    chunks: AsyncIterator[bytes]
+
+    @property
+    def content_length(self) -> Optional[int]:
+        value = self.headers.get("Content-Length")
+        return int(value) if value is not None else None
+
+
 class HTTPClientProtocol(Protocol):
     async def post(
         self, endpoint: str, headers: dict, data: dict
@@ -29,6 +165,24 @@ class HTTPClientProtocol(Protocol):
     async def delete(self, endpoint: str, headers: dict) -> None:
         raise NotImplementedError()
 
+    # Absolute URLs (signed downloads, tile servers) are fetched without the ion
+    # bearer token, callers pass whatever credentials the URL needs in headers.
+    def stream(
+        self, endpoint: str, headers: dict, chunk_size: int = STREAM_CHUNK_BYTES
+    ) -> AsyncContextManager[StreamedResponse]:
+        raise NotImplementedError()
+
+    async def close(self) -> None:
+        raise NotImplementedError()
+
+    async def warm_up(
+        self, n_connections: int, keepalive_timeout: Optional[float] = None
+    ) -> int:
+        raise NotImplementedError()
+
+    def deadline(self, seconds: float) -> AsyncContextManager[None]:
+        return deadline(seconds)
+
 
 class AsyncClient(HTTPClientProtocol):
     ERROR_PER_STATUS_CODE_MAP = {
@@ -37,83 +191,217 @@ class AsyncClient(HTTPClientProtocol):
         "402": PlanUpgradeRequired,
     }
 
-    def __init__(self, host: str, bearer_token: str):
+    def __init__(
+        self,
+        host: str,
+        bearer_token: str,
+        connector: Optional["aiohttp.BaseConnector"] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        timeouts: Optional[Timeouts] = None,
+        operation_timeouts: Optional[Dict[str, Timeouts]] = None,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    ):
         self.host = host
         self.bearer_token = bearer_token
+        self.instrumentation = instrumentation or Instrumentation()
+        self.timeouts = timeouts or Timeouts()
+        self.operation_timeouts = operation_timeouts or {}
+        self.keepalive_timeout = keepalive_timeout
+        self._connector = connector
+        self._owns_connector = connector is None
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._owns_connector and self._connector is not None:
+            await self._connector.close()
+            self._connector = None
 
     async def post(
         self, endpoint: str, headers: dict, data: dict
     ) -> Tuple[int, dict, dict]:
-        async with self._build_session(headers) as s:
-            async with s.post(endpoint, json=data) as result:
-                status_code = result.status
-                result_headers: Dict = dict(result.headers)
-                response_body: Dict = await result.json()
-                if status_code != 200:
-                    error_type = self.ERROR_PER_STATUS_CODE_MAP.get(
-                        str(status_code), UnknownError
-                    )
-                    raise error_type(
-                        f"POST request to: {self.host}{endpoint} has returned with status code: {status_code}. "
-                        f'Error: "{str(result.content)}"'
-                    )
-
-        return status_code, response_body, result_headers
+        return await self._request("POST", endpoint, headers, 200, json=data)
 
     async def get(self, endpoint: str, headers: dict) -> Tuple[int, dict, dict]:
-        async with self._build_session(headers) as s:
-            async with s.get(endpoint) as result:
-                status_code = result.status
-                result_headers: Dict = dict(result.headers)
-                response_body: Dict = await result.json()
-
-                if status_code != 200:
-                    error_type = self.ERROR_PER_STATUS_CODE_MAP.get(
-                        str(status_code), UnknownError
-                    )
-                    raise error_type(
-                        f"GET request to: {self.host}{endpoint} has returned with status code: {status_code}. "
-                        f'Error: "{str(result.content)}"'
-                    )
-
-        return status_code, response_body, result_headers
+        return await self._request("GET", endpoint, headers, 200)
 
     async def patch(
         self, endpoint: str, headers: dict, data: dict
     ) -> Tuple[int, dict, dict]:
-        async with self._build_session(headers) as s:
-            async with s.patch(endpoint, json=data) as result:
+        return await self._request("PATCH", endpoint, headers, 204, json=data)
+
+    async def delete(self, endpoint: str, headers: dict) -> None:
+        await self._request("DELETE", endpoint, headers, 204)
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        headers: dict,
+        expected_status: int,
+        **kwargs,
+    ) -> Tuple[int, dict, dict]:
+        timeouts = self._timeouts_for_current_operation()
+        async with self.instrumentation.measure(
+            method, endpoint
+        ) as metrics, self._build_session(headers, timeouts) as s:
+            send = getattr(s, method.lower())
+            async with send(endpoint, **kwargs) as result:
                 status_code = result.status
+                metrics.status = status_code
+                content_type = result.headers.get("Content-Type", "")
+                request_id = _request_id(result.headers)
                 result_headers: Dict = dict(result.headers)
-                response_body: Dict = await result.json()
-
-                if status_code != 204:
-                    error_type = self.ERROR_PER_STATUS_CODE_MAP.get(
-                        str(status_code), UnknownError
-                    )
-                    raise error_type(
-                        f"PATCH request to: {self.host}{endpoint} has returned with status code: {status_code}. "
-                        f'Error: "{str(result.content)}"'
-                    )
+                body = b"".join(
+                    [
+                        chunk
+                        async for chunk in _decoded_chunks(
+                            result, result.content.iter_any(), metrics
+                        )
+                    ]
+                )
 
+        if status_code != expected_status:
+            raise build_api_error(
+                self.ERROR_PER_STATUS_CODE_MAP,
+                f"{method} request to: {self.host}{endpoint}",
+                status_code,
+                content_type,
+                body,
+                request_id,
+            )
+        response_body = decode_json_body(
+            f"{method} request to: {self.host}{endpoint}", content_type, body
+        )
         return status_code, response_body, result_headers
 
-    async def delete(self, endpoint: str, headers: dict) -> None:
-        async with self._build_session(headers) as s:
-            async with s.delete(endpoint) as result:
-                status_code = result.status
-                if status_code != 204:
-                    error_type = self.ERROR_PER_STATUS_CODE_MAP.get(
-                        str(status_code), UnknownError
-                    )
-                    raise error_type(
-                        f"DELETE request to: {self.host}{endpoint} has returned with status code: {status_code}. "
-                        f'Error: "{str(result.content)}"'
+    @asynccontextmanager
+    async def stream(
+        self, endpoint: str, headers: dict, chunk_size: int = STREAM_CHUNK_BYTES
+    ) -> AsyncIterator[StreamedResponse]:
+        # Downloads are only bounded by the read timeout unless an operation
+        # timeout or a deadline says otherwise.
+        timeouts = self._timeouts_for_current_operation(
+            default=replace(self.timeouts, total=None)
+        )
+        external = is_absolute_url(endpoint)
+        async with self.instrumentation.measure(
+            "GET", endpoint
+        ) as metrics, self._build_session(headers, timeouts, external) as s:
+            async with s.get(endpoint) as result:
+                metrics.status = result.status
+                if result.status != 200:
+                    raise build_api_error(
+                        self.ERROR_PER_STATUS_CODE_MAP,
+                        f"GET request to: {'' if external else self.host}{endpoint}",
+                        result.status,
+                        result.headers.get("Content-Type", ""),
+                        b"".join(
+                            [
+                                chunk
+                                async for chunk in _decoded_chunks(
+                                    result, result.content.iter_any(), metrics
+                                )
+                            ]
+                        ),
+                        _request_id(result.headers),
                     )
+                yield StreamedResponse(
+                    result.status,
+                    dict(result.headers),
+                    _decoded_chunks(
+                        result, result.content.iter_chunked(chunk_size), metrics
+                    ),
+                )
+
+    async def warm_up(
+        self, n_connections: int, keepalive_timeout: Optional[float] = None
+    ) -> int:
+        # Warmed connections are only held for the keep-alive window, a longer
+        # one keeps them around until the first burst of traffic arrives.
+        if keepalive_timeout is not None:
+            await self._set_keepalive_timeout(keepalive_timeout)
+        # Requests started together on an empty pool each open a connection
+        # (DNS, TCP and TLS), which then stays in the pool as keep-alive.
+        warmed_up = await asyncio.gather(
+            *(self._open_connection() for _ in range(n_connections))
+        )
+        logger.debug(f"{sum(warmed_up)} connection(s) to {self.host} warmed up.")
+        return sum(warmed_up)
+
+    async def _set_keepalive_timeout(self, keepalive_timeout: float) -> None:
+        if keepalive_timeout == self.keepalive_timeout:
+            return
+        if not self._owns_connector and self._connector is not None:
+            logger.warning(
+                "Keep-alive timeout of a connector passed in is left unchanged."
+            )
+            return
+        self.keepalive_timeout = keepalive_timeout
+        # aiohttp fixes the timeout per connector, the pool is started anew.
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+    async def _open_connection(self) -> bool:
+        endpoint = routes.ME.path()
+        try:
+            async with self.instrumentation.measure(
+                "HEAD", endpoint
+            ) as metrics, self._build_session({}) as s:
+                async with s.head(endpoint) as result:
+                    metrics.status = result.status
+        except Exception as e:
+            logger.warning(
+                f"Connection to {self.host} could not be warmed up: {str(e)}."
+            )
+            return False
+        return True
+
+    def _timeouts_for_current_operation(
+        self, default: Optional[Timeouts] = None
+    ) -> Timeouts:
+        timeouts = self.operation_timeouts.get(
+            current_operation(), default or self.timeouts
+        )
+        return timeouts.bounded_by(remaining_budget())
+
+    def _build_session(
+        self, headers: dict, timeouts: Optional[Timeouts] = None, external: bool = False
+    ) -> "aiohttp.ClientSession":
+        import aiohttp
 
-    def _build_session(self, headers: dict) -> aiohttp.ClientSession:
-        s = aiohttp.ClientSession(self.host)
+        timeouts = timeouts or self.timeouts
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._owns_connector = True
+        trace_configs = (
+            [self.instrumentation.trace_config()] if self.instrumentation.hooks else []
+        )
+        s = aiohttp.ClientSession(
+            None if external else self.host,
+            connector=self._connector,
+            connector_owner=False,
+            json_serialize=serialize_json,
+            timeout=aiohttp.ClientTimeout(
+                total=timeouts.total,
+                sock_connect=timeouts.connect,
+                sock_read=timeouts.read,
+            ),
+            trace_configs=trace_configs,
+            # Bodies are decoded chunk by chunk in `_decoded_chunks`, which also
+            # counts the bytes that came over the wire.
+            auto_decompress=False,
+        )
+        s.headers.update({"Accept-Encoding": ACCEPT_ENCODING})
         s.headers.update(headers)
-        s.headers.update({"Authorization": f"Bearer {self.bearer_token}"})
-        logger.debug(f"{len(headers) + 1} header(s) added to base session.")
+        if not external:
+            s.headers.update({"Authorization": f"Bearer {self.bearer_token}"})
+        logger.debug(f"{len(s.headers)} header(s) added to base session.")
         return s
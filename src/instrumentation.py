@@ -0,0 +1,201 @@
+import functools
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+_current_operation: ContextVar[Optional[str]] = ContextVar(
+    "current_operation", default=None
+)
+_current_metrics: ContextVar[Optional["RequestMetrics"]] = ContextVar(
+    "current_metrics", default=None
+)
+
+
+def operation(name: str):
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            token = _current_operation.set(name)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _current_operation.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+def current_operation() -> Optional[str]:
+    return _current_operation.get()
+
+
+@dataclass
+class RequestMetrics:
+    operation: Optional[str]
+    method: str
+    endpoint: str
+    started_at_ns: int = field(default_factory=time.time_ns)
+    status: Optional[int] = None
+    error: Optional[str] = None
+    request_bytes: int = 0
+    # Decoded body size, `response_wire_bytes` is what came over the wire
+    # before the `content_encoding` was undone.
+    response_bytes: int = 0
+    response_wire_bytes: int = 0
+    content_encoding: Optional[str] = None
+    duration: float = 0.0
+    pool_wait: Optional[float] = None
+    dns: Optional[float] = None
+    # TCP connect including the TLS handshake, aiohttp does not time them apart.
+    connect: Optional[float] = None
+    first_byte: Optional[float] = None
+    body: Optional[float] = None
+    _phase_starts: Dict[str, float] = field(default_factory=dict, repr=False)
+
+
+class InstrumentationHook(Protocol):
+    def on_request_end(self, metrics: RequestMetrics) -> None:
+        raise NotImplementedError()
+
+
+class Instrumentation:
+    def __init__(self, hooks: Iterable[InstrumentationHook] = ()):
+        self.hooks: List[InstrumentationHook] = list(hooks)
+
+    def add_hook(self, hook: InstrumentationHook) -> None:
+        self.hooks.append(hook)
+
+    @asynccontextmanager
+    async def measure(
+        self, method: str, endpoint: str
+    ) -> AsyncIterator[RequestMetrics]:
+        metrics = RequestMetrics(
+            operation=current_operation(), method=method, endpoint=endpoint
+        )
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            yield metrics
+        except Exception as e:
+            metrics.error = type(e).__name__
+            raise
+        finally:
+            _current_metrics.reset(token)
+            metrics.duration = time.perf_counter() - started
+            if metrics.first_byte is not None:
+                metrics.body = metrics.duration - metrics.first_byte
+            self._emit(metrics)
+
+    def trace_config(self):
+        import aiohttp
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_queued_start.append(_phase_start("pool_wait"))
+        trace_config.on_connection_queued_end.append(_phase_end("pool_wait"))
+        trace_config.on_dns_resolvehost_start.append(_phase_start("dns"))
+        trace_config.on_dns_resolvehost_end.append(_phase_end("dns"))
+        trace_config.on_connection_create_start.append(_phase_start("connect"))
+        trace_config.on_connection_create_end.append(_phase_end("connect"))
+        trace_config.on_request_start.append(_phase_start("first_byte"))
+        trace_config.on_request_end.append(_phase_end("first_byte"))
+        trace_config.on_request_chunk_sent.append(_on_request_chunk_sent)
+        return trace_config
+
+    def _emit(self, metrics: RequestMetrics) -> None:
+        for hook in self.hooks:
+            try:
+                hook.on_request_end(metrics)
+            except Exception as e:
+                logger.warning(
+                    f"Instrumentation hook {hook} has failed because of {str(e)}."
+                )
+
+
+def _phase_start(phase: str):
+    async def on_phase_start(session, trace_config_ctx, params) -> None:
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics._phase_starts[phase] = time.perf_counter()
+
+    return on_phase_start
+
+
+def _phase_end(phase: str):
+    async def on_phase_end(session, trace_config_ctx, params) -> None:
+        metrics = _current_metrics.get()
+        if metrics is not None and phase in metrics._phase_starts:
+            elapsed = time.perf_counter() - metrics._phase_starts.pop(phase)
+            setattr(metrics, phase, (getattr(metrics, phase) or 0.0) + elapsed)
+
+    return on_phase_end
+
+
+async def _on_request_chunk_sent(session, trace_config_ctx, params) -> None:
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.request_bytes += len(params.chunk)
+
+
+class PrometheusHook:
+    # Expects prometheus_client-like histograms labelled with
+    # ("operation", "method", "status") and ("operation", "direction").
+    def __init__(self, duration_histogram: Any, size_histogram: Any = None):
+        self._duration_histogram = duration_histogram
+        self._size_histogram = size_histogram
+
+    def on_request_end(self, metrics: RequestMetrics) -> None:
+        operation_name = metrics.operation or "unknown"
+        status = str(metrics.status) if metrics.status else (metrics.error or "")
+        self._duration_histogram.labels(
+            operation=operation_name, method=metrics.method, status=status
+        ).observe(metrics.duration)
+        if self._size_histogram is not None:
+            self._size_histogram.labels(
+                operation=operation_name, direction="request"
+            ).observe(metrics.request_bytes)
+            self._size_histogram.labels(
+                operation=operation_name, direction="response"
+            ).observe(metrics.response_bytes)
+            self._size_histogram.labels(
+                operation=operation_name, direction="response_wire"
+            ).observe(metrics.response_wire_bytes)
+
+
+class OpenTelemetryHook:
+    # Expects an opentelemetry.trace.Tracer; spans are recorded after the fact
+    # with explicit start and end timestamps.
+    def __init__(self, tracer: Any):
+        self._tracer = tracer
+
+    def on_request_end(self, metrics: RequestMetrics) -> None:
+        attributes = {
+            "http.request.method": metrics.method,
+            "url.path": metrics.endpoint,
+            "cesium_ion.operation": metrics.operation or "unknown",
+            "http.request.body.size": metrics.request_bytes,
+            "http.response.body.size": metrics.response_bytes,
+            "cesium_ion.response_wire_bytes": metrics.response_wire_bytes,
+        }
+        if metrics.content_encoding is not None:
+            attributes["cesium_ion.content_encoding"] = metrics.content_encoding
+        if metrics.status is not None:
+            attributes["http.response.status_code"] = metrics.status
+        if metrics.error is not None:
+            attributes["error.type"] = metrics.error
+        for phase in ("pool_wait", "dns", "connect", "first_byte", "body"):
+            value = getattr(metrics, phase)
+            if value is not None:
+                attributes[f"cesium_ion.{phase}_seconds"] = value
+
+        span = self._tracer.start_span(
+            metrics.operation or f"{metrics.method} {metrics.endpoint}",
+            start_time=metrics.started_at_ns,
+            attributes=attributes,
+        )
+        span.end(end_time=metrics.started_at_ns + int(metrics.duration * 1e9))
@@ -0,0 +1,36 @@
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class Journal:
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            self._replay()
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.entries.get(key)
+
+    def record(self, key: str, **state) -> None:
+        entry = {**self.entries.get(key, {}), **state}
+        self.entries[key] = entry
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"key": key, **entry}) + "\n")
+
+    def _replay(self) -> None:
+        with open(self.path) as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(
+                        f"Skipping malformed line {line_number} of journal {self.path}."
+                    )
+                    continue
+                key = entry.pop("key")
+                self.entries[key] = entry
@@ -0,0 +1,224 @@
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from Assets.client import AssetsApiClient
+from Assets.dtos import AssetMetadata, ListAssetsQueryParameters
+from Assets.enums import AssetStatus, AssetType
+from Tokens.client import TokensApiClient
+from Tokens.dtos import ListTokensQueryParameters, TokenMetadata
+from enums import Endpoints
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    id TEXT PRIMARY KEY,
+    type TEXT,
+    status TEXT,
+    name TEXT,
+    date_added TEXT,
+    payload TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS assets_type_idx ON assets (type);
+CREATE INDEX IF NOT EXISTS assets_status_idx ON assets (status);
+CREATE INDEX IF NOT EXISTS assets_name_idx ON assets (name);
+CREATE INDEX IF NOT EXISTS assets_date_added_idx ON assets (date_added);
+
+CREATE TABLE IF NOT EXISTS tokens (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    date_added TEXT,
+    date_modified TEXT,
+    payload TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tokens_name_idx ON tokens (name);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    resource TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class SyncResult:
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+class MetadataStore:
+    def __init__(self, path: Union[str, Path]):
+        self._connection = sqlite3.connect(str(path))
+        self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    async def sync_assets(self, client: AssetsApiClient) -> SyncResult:
+        stored_payloads = self._stored_payloads("assets")
+        synced_at = time.time()
+        result = SyncResult()
+        seen_ids = set()
+
+        async for asset in client.iterate_assets(ListAssetsQueryParameters()):
+            if asset.id is None:
+                continue
+            seen_ids.add(asset.id)
+            payload = asset.json(by_alias=True)
+            stored_payload = stored_payloads.get(asset.id)
+            if stored_payload == payload:
+                result.unchanged += 1
+                continue
+            if stored_payload is None:
+                result.created += 1
+            else:
+                result.updated += 1
+            self._connection.execute(
+                "INSERT OR REPLACE INTO assets "
+                "(id, type, status, name, date_added, payload, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    asset.id,
+                    asset.type.value,
+                    asset.status.value if asset.status else None,
+                    asset.name,
+                    asset.date_added,
+                    payload,
+                    synced_at,
+                ),
+            )
+
+        result.deleted = self._delete_missing("assets", stored_payloads, seen_ids)
+        self._mark_synced(Endpoints.ASSETS, synced_at)
+        logger.debug(f"Assets metadata synced: {result}.")
+        return result
+
+    async def sync_tokens(self, client: TokensApiClient) -> SyncResult:
+        stored_payloads = self._stored_payloads("tokens")
+        synced_at = time.time()
+        result = SyncResult()
+        seen_ids = set()
+
+        async for token in client.iterate_tokens(ListTokensQueryParameters()):
+            if token.id is None:
+                continue
+            seen_ids.add(token.id)
+            payload = token.json(by_alias=True)
+            stored_payload = stored_payloads.get(token.id)
+            if stored_payload == payload:
+                result.unchanged += 1
+                continue
+            if stored_payload is None:
+                result.created += 1
+            else:
+                result.updated += 1
+            self._connection.execute(
+                "INSERT OR REPLACE INTO tokens "
+                "(id, name, date_added, date_modified, payload, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    token.id,
+                    token.name,
+                    token.date_added,
+                    token.date_modified,
+                    payload,
+                    synced_at,
+                ),
+            )
+
+        result.deleted = self._delete_missing("tokens", stored_payloads, seen_ids)
+        self._mark_synced(Endpoints.TOKENS, synced_at)
+        logger.debug(f"Tokens metadata synced: {result}.")
+        return result
+
+    def get_asset(self, asset_id: str) -> Optional[AssetMetadata]:
+        row = self._connection.execute(
+            "SELECT payload FROM assets WHERE id = ?", (asset_id,)
+        ).fetchone()
+        return AssetMetadata.parse_raw(row[0]) if row else None
+
+    def get_assets(
+        self,
+        type: Optional[AssetType] = None,
+        status: Optional[AssetStatus] = None,
+        name: Optional[str] = None,
+        date_added_from: Optional[str] = None,
+        date_added_to: Optional[str] = None,
+    ) -> List[AssetMetadata]:
+        conditions = []
+        params: List[str] = []
+        if type:
+            conditions.append("type = ?")
+            params.append(type.value)
+        if status:
+            conditions.append("status = ?")
+            params.append(status.value)
+        if name:
+            conditions.append("name = ?")
+            params.append(name)
+        if date_added_from:
+            conditions.append("date_added >= ?")
+            params.append(date_added_from)
+        if date_added_to:
+            conditions.append("date_added < ?")
+            params.append(date_added_to)
+
+        query = "SELECT payload FROM assets"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id"
+        rows = self._connection.execute(query, params).fetchall()
+        return [AssetMetadata.parse_raw(row[0]) for row in rows]
+
+    def get_token(self, token_id: str) -> Optional[TokenMetadata]:
+        row = self._connection.execute(
+            "SELECT payload FROM tokens WHERE id = ?", (token_id,)
+        ).fetchone()
+        return TokenMetadata.parse_raw(row[0]) if row else None
+
+    def get_tokens(self, name: Optional[str] = None) -> List[TokenMetadata]:
+        if name:
+            rows = self._connection.execute(
+                "SELECT payload FROM tokens WHERE name = ? ORDER BY id", (name,)
+            ).fetchall()
+        else:
+            rows = self._connection.execute(
+                "SELECT payload FROM tokens ORDER BY id"
+            ).fetchall()
+        return [TokenMetadata.parse_raw(row[0]) for row in rows]
+
+    def last_synced_at(self, resource: Endpoints) -> Optional[float]:
+        row = self._connection.execute(
+            "SELECT synced_at FROM sync_state WHERE resource = ?", (resource.value,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, resource: Endpoints, max_age: float) -> bool:
+        synced_at = self.last_synced_at(resource)
+        return synced_at is not None and time.time() - synced_at <= max_age
+
+    def _stored_payloads(self, table: str) -> Dict[str, str]:
+        rows = self._connection.execute(f"SELECT id, payload FROM {table}")
+        return {row[0]: row[1] for row in rows}
+
+    def _delete_missing(
+        self, table: str, stored_payloads: Dict[str, str], seen_ids: set
+    ) -> int:
+        missing_ids = [(id,) for id in stored_payloads if id not in seen_ids]
+        self._connection.executemany(f"DELETE FROM {table} WHERE id = ?", missing_ids)
+        return len(missing_ids)
+
+    def _mark_synced(self, resource: Endpoints, synced_at: float) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO sync_state (resource, synced_at) VALUES (?, ?)",
+            (resource.value, synced_at),
+        )
+        self._connection.commit()
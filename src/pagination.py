@@ -0,0 +1,38 @@
+import asyncio
+from contextlib import suppress
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from dtos import PaginationLinks
+from routes import relative_url
+
+T = TypeVar("T")
+
+PageFetcher = Callable[[str], Awaitable[Tuple[List[T], Optional[PaginationLinks]]]]
+
+
+async def iterate_link_pages(
+    fetch_page: PageFetcher, endpoint_url: str, prefetch: bool = False
+) -> AsyncIterator[T]:
+    next_page: Optional[asyncio.Task] = None
+    try:
+        items, pagination_links = await fetch_page(endpoint_url)
+        while True:
+            next_url = pagination_links.next if pagination_links else None
+            if next_url is not None and prefetch:
+                next_page = asyncio.create_task(fetch_page(relative_url(next_url)))
+            for item in items:
+                yield item
+            if next_url is None:
+                break
+            if next_page is not None:
+                items, pagination_links = await next_page
+                next_page = None
+            else:
+                items, pagination_links = await fetch_page(relative_url(next_url))
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+            # An abandoned page's result or error is of no interest, but its
+            # request has to be unwound before the caller moves on.
+            with suppress(asyncio.CancelledError, Exception):
+                await next_page
@@ -0,0 +1,39 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from timeouts import deadline
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def poll_until(
+    fetch: Callable[[], Awaitable[T]],
+    is_done: Callable[[T], bool],
+    interval: float = 1.0,
+    max_interval: float = 30.0,
+    backoff: float = 1.5,
+    timeout: Optional[float] = None,
+) -> T:
+    if timeout is None:
+        return await _poll(fetch, is_done, interval, max_interval, backoff)
+    async with deadline(timeout):
+        return await _poll(fetch, is_done, interval, max_interval, backoff)
+
+
+async def _poll(
+    fetch: Callable[[], Awaitable[T]],
+    is_done: Callable[[T], bool],
+    interval: float,
+    max_interval: float,
+    backoff: float,
+) -> T:
+    while True:
+        result = await fetch()
+        if is_done(result):
+            return result
+        logger.debug(f"Polled resource is not done yet, next poll in {interval}s.")
+        await asyncio.sleep(interval)
+        interval = min(interval * backoff, max_interval)
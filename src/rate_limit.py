@@ -0,0 +1,113 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
+from typing import AsyncContextManager, AsyncIterator, Callable, Optional, Tuple
+
+from http_client import STREAM_CHUNK_BYTES, HTTPClientProtocol, StreamedResponse
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    requests_per_second: Optional[float] = None
+    burst: int = 1
+    max_concurrency: Optional[int] = None
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float,
+        capacity: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RateLimitedClient(HTTPClientProtocol):
+    def __init__(self, http_client: HTTPClientProtocol, rate_limit: RateLimit):
+        self._http_client = http_client
+        self.rate_limit = rate_limit
+        self._bucket = (
+            TokenBucket(rate_limit.requests_per_second, rate_limit.burst)
+            if rate_limit.requests_per_second
+            else None
+        )
+        self._semaphore = (
+            asyncio.Semaphore(rate_limit.max_concurrency)
+            if rate_limit.max_concurrency
+            else None
+        )
+
+    @property
+    def host(self) -> str:
+        return self._http_client.host  # type: ignore[attr-defined]
+
+    async def post(
+        self, endpoint: str, headers: dict, data: dict
+    ) -> Tuple[int, dict, dict]:
+        async with self._slot():
+            return await self._http_client.post(endpoint, headers, data)
+
+    async def get(self, endpoint: str, headers: dict) -> Tuple[int, dict, dict]:
+        async with self._slot():
+            return await self._http_client.get(endpoint, headers)
+
+    async def patch(
+        self, endpoint: str, headers: dict, data: dict
+    ) -> Tuple[int, dict, dict]:
+        async with self._slot():
+            return await self._http_client.patch(endpoint, headers, data)
+
+    async def delete(self, endpoint: str, headers: dict) -> None:
+        async with self._slot():
+            await self._http_client.delete(endpoint, headers)
+
+    @asynccontextmanager
+    async def stream(
+        self, endpoint: str, headers: dict, chunk_size: int = STREAM_CHUNK_BYTES
+    ) -> AsyncIterator[StreamedResponse]:
+        async with self._slot():
+            async with self._http_client.stream(
+                endpoint, headers, chunk_size
+            ) as response:
+                yield response
+
+    async def close(self) -> None:
+        await self._http_client.close()
+
+    async def warm_up(
+        self, n_connections: int, keepalive_timeout: Optional[float] = None
+    ) -> int:
+        # Connections beyond the concurrency limit would never be used at once.
+        if self.rate_limit.max_concurrency:
+            n_connections = min(n_connections, self.rate_limit.max_concurrency)
+        return await self._http_client.warm_up(n_connections, keepalive_timeout)
+
+    def deadline(self, seconds: float) -> AsyncContextManager[None]:
+        return self._http_client.deadline(seconds)
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        async with self._semaphore or nullcontext():
+            if self._bucket is not None:
+                await self._bucket.acquire()
+            yield
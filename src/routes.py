@@ -0,0 +1,60 @@
+from functools import lru_cache
+from string import Formatter
+from typing import Any, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlsplit
+
+QueryItems = Tuple[Tuple[str, str], ...]
+
+
+class Route:
+    def __init__(self, template: str):
+        self.template = template
+        self._parts: List[Tuple[str, Optional[str]]] = [
+            (literal, field_name)
+            for literal, field_name, _, _ in Formatter().parse(template)
+        ]
+
+    def path(self, **path_params: Any) -> str:
+        path = ""
+        for literal, field_name in self._parts:
+            path += literal
+            if field_name is not None:
+                path += quote(str(path_params[field_name]), safe="")
+        return path
+
+    def __repr__(self) -> str:
+        return f"Route({self.template!r})"
+
+
+ASSETS = Route("/v1/assets")
+ASSET = Route("/v1/assets/{asset_id}")
+ASSET_ENDPOINT = Route("/v1/assets/{asset_id}/endpoint")
+ARCHIVES = Route("/v1/assets/{asset_id}/archives")
+ARCHIVE = Route("/v1/assets/{asset_id}/archives/{archive_id}")
+ARCHIVE_DOWNLOAD = Route("/v1/assets/{asset_id}/archives/{archive_id}/download")
+EXPORTS = Route("/v1/assets/{asset_id}/exports")
+EXPORT = Route("/v1/assets/{asset_id}/exports/{export_id}")
+TOKENS = Route("/v2/tokens")
+TOKEN = Route("/v2/tokens/{token_id}")
+DEFAULT_TOKEN = Route("/v2/tokens/default")
+ME = Route("/v1/me")
+
+
+def encode_query(query_items: QueryItems) -> str:
+    return urlencode(query_items, quote_via=quote)
+
+
+# Listing DTOs only change `page` while paginating, everything else is encoded
+# once per distinct query.
+@lru_cache(maxsize=256)
+def encode_query_fragment(query_items: QueryItems) -> str:
+    if not query_items:
+        return ""
+    return "&" + encode_query(query_items)
+
+
+def relative_url(url: str) -> str:
+    # ion may hand out absolute URLs (Link headers, onComplete), transports are
+    # bound to the host and expect a path.
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
@@ -0,0 +1,777 @@
+import asyncio
+import gzip
+import hashlib
+import itertools
+import logging
+import math
+import random
+import re
+import struct
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from Assets.enums import AssetType
+
+logger = logging.getLogger(__name__)
+
+# West, south, east, north in degrees, covered by every stand-in tileset.
+TILESET_EXTENT = (-10.0, 40.0, 10.0, 60.0)
+QUANTIZED_MESH_HEADER = struct.Struct("<3d2f4d3d")
+QUANTIZED_MESH_MAX = 32767
+TERRAIN_GRID = 5
+
+
+def terrain_height(lon: float, lat: float) -> float:
+    # Stand-in terrain is a plane, so heights sampled anywhere in a tile can be
+    # checked exactly against linear interpolation.
+    return 100.0 + 2.0 * lon + 3.0 * lat
+
+
+@dataclass
+class StandInConfig:
+    asset_count: int = 1000
+    token_count: int = 100
+    exports_per_asset: int = 3
+    archives_per_asset: int = 2
+    archive_bytes: int = 1024 * 1024
+    archive_chunk_bytes: int = 64 * 1024
+    # Served instead of `archive_bytes` zeros, e.g. a real ZIP for extraction.
+    archive_content: Optional[bytes] = None
+    latency: float = 0.0
+    max_page_size: int = 1000
+    error_rate: float = 0.0
+    error_status: int = 503
+    polls_to_complete: int = 2
+    tileset_depth: int = 3
+    # Tiles on this level are split out into external tilesets.
+    external_tileset_level: Optional[int] = 2
+    tile_bytes: int = 1024
+    access_token: str = "stand-in-access-token"
+    # Tile requests an access token is good for before a new one is issued.
+    access_token_uses: Optional[int] = None
+    terrain_max_zoom: int = 8
+    # JSON bodies are compressed with whatever the client's Accept-Encoding
+    # allows from what aiohttp can encode.
+    compress_responses: bool = False
+    seed: int = 0
+
+    @property
+    def archive_size(self) -> int:
+        if self.archive_content is not None:
+            return len(self.archive_content)
+        return self.archive_bytes
+
+
+@dataclass
+class Fault:
+    path: str
+    method: Optional[str] = None
+    status: Optional[int] = None
+    delay: float = 0.0
+    body_chunk_delay: float = 0.0
+    retry_after: Optional[int] = None
+    skip: int = 0
+    times: Optional[int] = 1
+    matched: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        self._pattern = re.compile(self.path)
+
+    def applies_to(self, method: str, path: str) -> bool:
+        if self.method is not None and self.method != method:
+            return False
+        if not self._pattern.fullmatch(path):
+            return False
+        self.matched += 1
+        if self.matched <= self.skip:
+            return False
+        return self.times is None or self.matched <= self.skip + self.times
+
+
+class IonStandInServer:
+    def __init__(self, config: Optional[StandInConfig] = None):
+        self.config = config or StandInConfig()
+        self.request_count = 0
+        self.request_log: List[Tuple[str, str]] = []
+        self.faults: List[Fault] = []
+        self._random = random.Random(self.config.seed)
+        self._ids = itertools.count(self.config.asset_count + 1)
+        self._clock = itertools.count()
+        self._polls: Dict[Tuple[str, str], int] = {}
+        self.assets: Dict[int, Dict] = {
+            asset["id"]: asset for asset in self._generate_assets()
+        }
+        self.tokens: Dict[str, Dict] = {
+            token["id"]: token for token in self._generate_tokens()
+        }
+        self.archives: Dict[int, Dict[int, Dict]] = {}
+        self.exports: Dict[int, Dict[str, Dict]] = {}
+        self.access_token = self.config.access_token
+        self.access_tokens_issued = 1
+        self._access_token_uses = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+        self.app = web.Application(middlewares=[self._middleware])
+        self._add_routes()
+
+    async def __aenter__(self) -> "IonStandInServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.url = f"http://{bound_host}:{bound_port}"
+        logger.debug(f"Cesium ion stand-in server listening on {self.url}.")
+        return self.url
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def add_fault(self, fault: Fault) -> Fault:
+        self.faults.append(fault)
+        return fault
+
+    def _add_routes(self) -> None:
+        router = self.app.router
+        router.add_get("/v1/me", self._get_profile)
+        router.add_get("/v1/assets", self._list_assets)
+        router.add_post("/v1/assets", self._create_asset)
+        router.add_get("/v1/assets/{asset_id}", self._get_asset)
+        router.add_patch("/v1/assets/{asset_id}", self._modify_asset)
+        router.add_delete("/v1/assets/{asset_id}", self._delete_asset)
+        router.add_post("/v1/assets/{asset_id}/uploadComplete", self._upload_complete)
+        router.add_get("/v1/assets/{asset_id}/endpoint", self._get_endpoint)
+        router.add_get("/v1/assets/{asset_id}/archives", self._list_archives)
+        router.add_post("/v1/assets/{asset_id}/archives", self._create_archive)
+        router.add_get("/v1/assets/{asset_id}/archives/{archive_id}", self._get_archive)
+        router.add_delete(
+            "/v1/assets/{asset_id}/archives/{archive_id}", self._delete_archive
+        )
+        router.add_get(
+            "/v1/assets/{asset_id}/archives/{archive_id}/download",
+            self._download_archive,
+        )
+        router.add_get("/v1/assets/{asset_id}/exports", self._list_exports)
+        router.add_post("/v1/assets/{asset_id}/exports", self._create_export)
+        router.add_get("/v1/assets/{asset_id}/exports/{export_id}", self._get_export)
+        router.add_get("/v2/tokens", self._list_tokens)
+        router.add_post("/v2/tokens", self._create_token)
+        router.add_get("/v2/tokens/default", self._get_default_token)
+        router.add_get("/v2/tokens/{token_id}", self._get_token)
+        router.add_patch("/v2/tokens/{token_id}", self._modify_token)
+        router.add_delete("/v2/tokens/{token_id}", self._delete_token)
+        router.add_get("/tiles/{asset_id}/{path:.+}", self._get_tile)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.request_count += 1
+        self.request_log.append((request.method, request.path))
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+        if not request.headers.get("Authorization", "").startswith("Bearer "):
+            return _error(401, "InvalidCredentials", "Missing bearer token.")
+
+        for fault in self.faults:
+            if fault.applies_to(request.method, request.path):
+                return await self._apply_fault(fault, request, handler)
+
+        if self.config.error_rate and self._random.random() < self.config.error_rate:
+            return _error(self.config.error_status, "ServerError", "Injected error.")
+        response = await handler(request)
+        if (
+            self.config.compress_responses
+            and isinstance(response, web.Response)
+            and response.content_type == "application/json"
+        ):
+            response.enable_compression()
+        return response
+
+    async def _apply_fault(
+        self, fault: Fault, request: web.Request, handler
+    ) -> web.StreamResponse:
+        if fault.delay:
+            await asyncio.sleep(fault.delay)
+        if fault.status is not None:
+            response = _error(fault.status, "InjectedFault", "Scripted fault.")
+            if fault.retry_after is not None:
+                response.headers["Retry-After"] = str(fault.retry_after)
+            return response
+
+        response = await handler(request)
+        if not fault.body_chunk_delay or not isinstance(response, web.Response):
+            return response
+
+        slow_response = web.StreamResponse(
+            status=response.status, headers=response.headers
+        )
+        slow_response.content_length = len(response.body)
+        await slow_response.prepare(request)
+        for offset in range(0, len(response.body), 16):
+            await asyncio.sleep(fault.body_chunk_delay)
+            await slow_response.write(response.body[offset : offset + 16])
+        await slow_response.write_eof()
+        return slow_response
+
+    async def _get_profile(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "id": 1,
+                "scopes": ["assets:list", "assets:read", "tokens:read"],
+                "username": "stand-in",
+                "email": "stand-in@example.com",
+                "emailVerified": True,
+                "storage": {"used": 0, "available": 1, "total": 1},
+            }
+        )
+
+    async def _list_assets(self, request: web.Request) -> web.Response:
+        assets = [self._observe_asset(asset) for asset in self.assets.values()]
+        search = request.query.get("search")
+        if search:
+            assets = [a for a in assets if search.lower() in a["name"].lower()]
+        statuses = request.query.getall("status", [])
+        if statuses:
+            assets = [a for a in assets if a["status"] in statuses]
+        types = request.query.getall("type", [])
+        if types:
+            assets = [a for a in assets if a["type"] in types]
+        return self._paginated(request, assets)
+
+    async def _create_asset(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        asset_id = next(self._ids)
+        from_source = body.get("from")
+        asset = {
+            "id": asset_id,
+            "type": body["type"],
+            "name": body["name"],
+            "description": body.get("description") or "",
+            "bytes": 0,
+            "attribution": body.get("attribution") or "",
+            "dateAdded": self._now(),
+            "status": "NOT_STARTED" if from_source else "AWAITING_FILES",
+            "percentComplete": 0,
+            "archivable": False,
+            "exportable": True,
+        }
+        self.assets[asset_id] = asset
+        return web.json_response(
+            {
+                "assetMetadata": asset,
+                "uploadLocation": None
+                if from_source
+                else {
+                    "endpoint": f"{self.url}/s3",
+                    "bucket": "stand-in",
+                    "prefix": f"sources/{asset_id}/",
+                    "accessKey": "stand-in-access-key",
+                    "secretAccessKey": "stand-in-secret-access-key",
+                    "sessionToken": "stand-in-session-token",
+                },
+                "onComplete": None
+                if from_source
+                else {
+                    "method": "POST",
+                    "url": f"{self.url}/v1/assets/{asset_id}/uploadComplete",
+                    "fields": {},
+                },
+            }
+        )
+
+    async def _get_asset(self, request: web.Request) -> web.Response:
+        return web.json_response(self._observe_asset(self._find_asset(request)))
+
+    async def _modify_asset(self, request: web.Request) -> web.Response:
+        asset = self._find_asset(request)
+        body = await request.json()
+        for key in ("name", "description", "attribution"):
+            if body.get(key) is not None:
+                asset[key] = body[key]
+        return web.Response(status=204)
+
+    async def _delete_asset(self, request: web.Request) -> web.Response:
+        asset = self._find_asset(request)
+        del self.assets[asset["id"]]
+        self.archives.pop(asset["id"], None)
+        self.exports.pop(asset["id"], None)
+        return web.Response(status=204)
+
+    async def _upload_complete(self, request: web.Request) -> web.Response:
+        asset = self._find_asset(request)
+        if asset["status"] == "AWAITING_FILES":
+            asset["status"] = "NOT_STARTED"
+        return web.json_response({})
+
+    async def _get_endpoint(self, request: web.Request) -> web.Response:
+        asset = self._find_asset(request)
+        url = f"{self.url}/tiles/{asset['id']}/"
+        if asset["type"] != AssetType.TERRAIN.value:
+            url += "tileset.json?v=1"
+        return web.json_response(
+            {
+                "type": asset["type"],
+                "url": url,
+                "accessToken": self.access_token,
+                "attributions": [],
+            }
+        )
+
+    async def _get_tile(self, request: web.Request) -> web.Response:
+        asset = self._find_asset(request)
+        if request.headers["Authorization"] != f"Bearer {self.access_token}":
+            return _error(401, "InvalidCredentials", "Invalid access token.")
+        self._use_access_token()
+        path = request.match_info["path"]
+        if path.endswith("tileset.json"):
+            return web.json_response(self._tileset(path))
+        if path == "layer.json":
+            return web.json_response(self._terrain_layer())
+        if path.endswith(".terrain"):
+            try:
+                level, x, y = map(int, path[: -len(".terrain")].split("/"))
+            except ValueError:
+                raise _not_found("Tile")
+            return web.Response(
+                body=gzip.compress(_quantized_mesh(level, x, y)),
+                headers={
+                    "Content-Type": "application/vnd.quantized-mesh",
+                    "Content-Encoding": "gzip",
+                },
+            )
+        digest = hashlib.sha256(f"{asset['id']}/{path}".encode()).digest()
+        content = (digest * (self.config.tile_bytes // len(digest) + 1))[
+            : self.config.tile_bytes
+        ]
+        return web.Response(body=content, content_type="application/octet-stream")
+
+    async def _list_archives(self, request: web.Request) -> web.Response:
+        asset = self._find_asset(request)
+        return self._paginated(
+            request,
+            [
+                self._observe("archive", archive)
+                for archive in self._asset_archives(asset).values()
+            ],
+        )
+
+    async def _create_archive(self, request: web.Request) -> web.Response:
+        asset = self._find_asset(request)
+        body = await request.json()
+        archives = self._asset_archives(asset)
+        archive = {
+            "id": max(archives, default=0) + 1,
+            "assetId": asset["id"],
+            "format": body.get("format", "ZIP"),
+            "status": "NOT_STARTED",
+            "bytesArchived": 0,
+        }
+        archives[archive["id"]] = archive
+        return web.json_response(archive)
+
+    async def _get_archive(self, request: web.Request) -> web.Response:
+        return web.json_response(self._observe("archive", self._find_archive(request)))
+
+    async def _delete_archive(self, request: web.Request) -> web.Response:
+        archive = self._find_archive(request)
+        del self.archives[archive["assetId"]][archive["id"]]
+        return web.Response(status=204)
+
+    async def _download_archive(self, request: web.Request) -> web.StreamResponse:
+        archive = self._find_archive(request)
+        if archive["status"] != "COMPLETE":
+            return _error(409, "ArchiveNotReady", "Archive is not complete.")
+        content = self.config.archive_content
+        if content is None:
+            content = b"\0" * self.config.archive_bytes
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": "application/zip",
+                "Content-Length": str(len(content)),
+            }
+        )
+        await response.prepare(request)
+        chunk_bytes = self.config.archive_chunk_bytes
+        for offset in range(0, len(content), chunk_bytes):
+            await response.write(content[offset : offset + chunk_bytes])
+        await response.write_eof()
+        return response
+
+    async def _list_exports(self, request: web.Request) -> web.Response:
+        asset = self._find_asset(request)
+        return self._paginated(
+            request,
+            [
+                self._observe("export", export)
+                for export in self._asset_exports(asset).values()
+            ],
+        )
+
+    async def _create_export(self, request: web.Request) -> web.Response:
+        asset = self._find_asset(request)
+        body = await request.json()
+        if "accessKeyId" not in body or "secretAccessKey" not in body:
+            return _error(400, "InvalidRequest", "Export credentials are missing.")
+        exports = self._asset_exports(asset)
+        export = {
+            "id": str(len(exports) + 1),
+            "assetId": asset["id"],
+            "dateAdded": self._now(),
+            "status": "NOT_STARTED",
+            "bytesExported": 0,
+            "to": {"type": "S3", "bucket": body["bucket"], "prefix": body["prefix"]},
+        }
+        exports[export["id"]] = export
+        return web.json_response(export)
+
+    async def _get_export(self, request: web.Request) -> web.Response:
+        asset = self._find_asset(request)
+        export = self._asset_exports(asset).get(request.match_info["export_id"])
+        if export is None:
+            raise _not_found("Export")
+        return web.json_response(self._observe("export", export))
+
+    async def _list_tokens(self, request: web.Request) -> web.Response:
+        return self._paginated(request, list(self.tokens.values()))
+
+    async def _create_token(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        token_number = next(self._ids)
+        token = {
+            "id": _token_id(token_number),
+            "name": body.get("name"),
+            "token": f"stand-in-secret-{token_number}",
+            "dateAdded": self._now(),
+            "dateModified": self._now(),
+            "dateLastUsed": None,
+            "assetIds": body.get("assetIds"),
+            "isDefault": False,
+            "allowedUrls": body.get("allowedUrls"),
+            "scopes": body["scopes"],
+        }
+        self.tokens[token["id"]] = token
+        return web.json_response(token)
+
+    async def _get_default_token(self, request: web.Request) -> web.Response:
+        for token in self.tokens.values():
+            if token["isDefault"]:
+                return web.json_response(token)
+        raise _not_found("Token")
+
+    async def _get_token(self, request: web.Request) -> web.Response:
+        return web.json_response(self._find_token(request))
+
+    async def _modify_token(self, request: web.Request) -> web.Response:
+        token = self._find_token(request)
+        body = await request.json()
+        for key in ("name", "scopes", "assetIds", "allowedUrls"):
+            if body.get(key) is not None:
+                token[key] = body[key]
+        token["dateModified"] = self._now()
+        return web.Response(status=204)
+
+    async def _delete_token(self, request: web.Request) -> web.Response:
+        token = self._find_token(request)
+        del self.tokens[token["id"]]
+        return web.Response(status=204)
+
+    def _paginated(self, request: web.Request, items: List[Dict]) -> web.Response:
+        limit = min(int(request.query.get("limit", 1000)), self.config.max_page_size)
+        page = int(request.query.get("page", 1))
+        start = (page - 1) * limit
+        headers = {}
+        if start + limit < len(items):
+            next_url = request.url.update_query(page=page + 1, limit=limit)
+            headers["Link"] = f'<{next_url.path_qs}>; rel="next"'
+        return web.json_response(
+            {"items": items[start : start + limit]}, headers=headers
+        )
+
+    def _observe_asset(self, asset: Dict) -> Dict:
+        if asset["status"] == "AWAITING_FILES":
+            return asset
+        return self._observe("asset", asset)
+
+    def _observe(self, kind: str, resource: Dict) -> Dict:
+        if resource["status"] not in ("NOT_STARTED", "QUEUED", "IN_PROGRESS"):
+            return resource
+        key = (kind, f"{resource.get('assetId', '')}/{resource['id']}")
+        polls = self._polls.get(key, 0) + 1
+        self._polls[key] = polls
+        if polls >= self.config.polls_to_complete:
+            resource["status"] = "COMPLETE"
+            if kind == "asset":
+                resource["percentComplete"] = 100
+            elif kind == "archive":
+                resource["bytesArchived"] = self.config.archive_size
+        else:
+            resource["status"] = "IN_PROGRESS"
+            if kind == "asset":
+                resource["percentComplete"] = (
+                    100 * polls // self.config.polls_to_complete
+                )
+        return resource
+
+    def _find_asset(self, request: web.Request) -> Dict:
+        try:
+            asset_id = int(request.match_info["asset_id"])
+        except ValueError:
+            raise _not_found("Asset")
+        asset = self.assets.get(asset_id)
+        if asset is None:
+            raise _not_found("Asset")
+        return asset
+
+    def _find_archive(self, request: web.Request) -> Dict:
+        asset = self._find_asset(request)
+        try:
+            archive_id = int(request.match_info["archive_id"])
+        except ValueError:
+            raise _not_found("Archive")
+        archive = self._asset_archives(asset).get(archive_id)
+        if archive is None:
+            raise _not_found("Archive")
+        return archive
+
+    def _find_token(self, request: web.Request) -> Dict:
+        token = self.tokens.get(request.match_info["token_id"])
+        if token is None:
+            raise _not_found("Token")
+        return token
+
+    def _asset_archives(self, asset: Dict) -> Dict[int, Dict]:
+        if asset["id"] not in self.archives:
+            self.archives[asset["id"]] = {
+                archive_id: {
+                    "id": archive_id,
+                    "assetId": asset["id"],
+                    "format": "ZIP",
+                    "status": "COMPLETE",
+                    "bytesArchived": self.config.archive_size,
+                }
+                for archive_id in range(1, self.config.archives_per_asset + 1)
+            }
+        return self.archives[asset["id"]]
+
+    def _asset_exports(self, asset: Dict) -> Dict[str, Dict]:
+        if asset["id"] not in self.exports:
+            self.exports[asset["id"]] = {
+                str(export_id): {
+                    "id": str(export_id),
+                    "assetId": asset["id"],
+                    "dateAdded": asset["dateAdded"],
+                    "status": "COMPLETE",
+                    "bytesExported": asset["bytes"],
+                    "to": {
+                        "type": "S3",
+                        "bucket": "stand-in",
+                        "prefix": f"{asset['id']}/",
+                    },
+                }
+                for export_id in range(1, self.config.exports_per_asset + 1)
+            }
+        return self.exports[asset["id"]]
+
+    def _use_access_token(self) -> None:
+        self._access_token_uses += 1
+        if self._access_token_uses == self.config.access_token_uses:
+            self._access_token_uses = 0
+            self.access_tokens_issued += 1
+            self.access_token = (
+                f"{self.config.access_token}-{self.access_tokens_issued}"
+            )
+
+    def _terrain_layer(self) -> Dict:
+        return {
+            "tilejson": "2.1.0",
+            "format": "quantized-mesh-1.0",
+            "version": "1.2.0",
+            "scheme": "tms",
+            "projection": "EPSG:4326",
+            "tiles": ["{z}/{x}/{y}.terrain?v={version}"],
+            "extensions": [],
+            "minzoom": 0,
+            "maxzoom": self.config.terrain_max_zoom,
+        }
+
+    def _tileset(self, path: str) -> Dict:
+        level = x = y = 0
+        prefix = path[: -len("tileset.json")].strip("/")
+        if prefix:
+            try:
+                level, x, y = map(int, prefix.split("/")[-3:])
+            except ValueError:
+                raise _not_found("Tileset")
+        return {
+            "asset": {"version": "1.0"},
+            "geometricError": float(2 ** (self.config.tileset_depth - level + 1)),
+            "root": self._tile(level, x, y, root_level=level),
+        }
+
+    def _tile(self, level: int, x: int, y: int, root_level: int) -> Dict:
+        tile = {
+            "boundingVolume": {"region": _tile_region(level, x, y)},
+            "geometricError": float(2 ** (self.config.tileset_depth - level)),
+            "refine": "REPLACE",
+        }
+        if level == self.config.external_tileset_level and level != root_level:
+            tile["content"] = {"uri": f"{level}/{x}/{y}/tileset.json"}
+            return tile
+        tile["content"] = {"uri": f"{level}/{x}/{y}.b3dm"}
+        if level < self.config.tileset_depth:
+            tile["children"] = [
+                self._tile(level + 1, 2 * x + dx, 2 * y + dy, root_level)
+                for dy in (0, 1)
+                for dx in (0, 1)
+            ]
+        return tile
+
+    def _now(self) -> str:
+        return _format_date(
+            datetime(2024, 1, 1, tzinfo=timezone.utc)
+            + timedelta(seconds=next(self._clock))
+        )
+
+    def _generate_assets(self) -> List[Dict]:
+        asset_types = [asset_type.value for asset_type in AssetType]
+        started = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        return [
+            {
+                "id": asset_id,
+                "type": asset_types[asset_id % len(asset_types)],
+                "name": f"Asset {asset_id}",
+                "description": f"Stand-in asset number {asset_id}.",
+                "bytes": self._random.randint(0, 10**9),
+                "attribution": "",
+                "dateAdded": _format_date(started + timedelta(hours=asset_id)),
+                "status": "COMPLETE",
+                "percentComplete": 100,
+                "archivable": asset_id % 2 == 0,
+                "exportable": asset_id % 3 != 0,
+            }
+            for asset_id in range(1, self.config.asset_count + 1)
+        ]
+
+    def _generate_tokens(self) -> List[Dict]:
+        return [
+            {
+                "id": _token_id(token_number),
+                "name": f"Token {token_number}",
+                "token": f"stand-in-secret-{token_number}",
+                "dateAdded": "2021-09-10T18:29:57.583Z",
+                "dateModified": "2021-09-10T18:29:57.583Z",
+                "dateLastUsed": None,
+                "assetIds": [token_number] if token_number else None,
+                "isDefault": token_number == 0,
+                "allowedUrls": [],
+                "scopes": ["assets:read", "geocode"],
+            }
+            for token_number in range(self.config.token_count)
+        ]
+
+
+def _token_id(token_number: int) -> str:
+    return f"{token_number:08x}-0000-4000-8000-{token_number:012x}"
+
+
+def _tile_region(level: int, x: int, y: int) -> List[float]:
+    west, south, east, north = TILESET_EXTENT
+    width = (east - west) / 2**level
+    height = (north - south) / 2**level
+    return [
+        math.radians(west + x * width),
+        math.radians(south + y * height),
+        math.radians(west + (x + 1) * width),
+        math.radians(south + (y + 1) * height),
+        0.0,
+        100.0,
+    ]
+
+
+def _quantized_mesh(level: int, x: int, y: int) -> bytes:
+    size = 180.0 / 2**level
+    west, south = -180.0 + x * size, -90.0 + y * size
+    steps = [
+        round(step * QUANTIZED_MESH_MAX / (TERRAIN_GRID - 1))
+        for step in range(TERRAIN_GRID)
+    ]
+    triangles = []
+    for row in range(TERRAIN_GRID - 1):
+        for column in range(TERRAIN_GRID - 1):
+            corner = row * TERRAIN_GRID + column
+            above = corner + TERRAIN_GRID
+            triangles += [corner, corner + 1, above, corner + 1, above + 1, above]
+    # High water mark encoding needs vertices numbered in order of first use.
+    order = list(dict.fromkeys(triangles))
+    renumbered = {vertex: index for index, vertex in enumerate(order)}
+    triangles = [renumbered[vertex] for vertex in triangles]
+    us = [steps[vertex % TERRAIN_GRID] for vertex in order]
+    vs = [steps[vertex // TERRAIN_GRID] for vertex in order]
+    heights = [
+        terrain_height(
+            west + u / QUANTIZED_MESH_MAX * size,
+            south + v / QUANTIZED_MESH_MAX * size,
+        )
+        for u, v in zip(us, vs)
+    ]
+    min_height, max_height = min(heights), max(heights)
+    quantized_heights = [
+        round((height - min_height) / (max_height - min_height) * QUANTIZED_MESH_MAX)
+        for height in heights
+    ]
+    body = QUANTIZED_MESH_HEADER.pack(*[0.0] * 3, min_height, max_height, *[0.0] * 7)
+    body += struct.pack("<I", len(us))
+    for values in (us, vs, quantized_heights):
+        body += struct.pack(f"<{len(values)}H", *_zigzag_deltas(values))
+    body += struct.pack("<I", len(triangles) // 3)
+    body += struct.pack(f"<{len(triangles)}H", *_high_water_marks(triangles))
+    edges = [
+        [index for index, u in enumerate(us) if u == 0],
+        [index for index, v in enumerate(vs) if v == 0],
+        [index for index, u in enumerate(us) if u == QUANTIZED_MESH_MAX],
+        [index for index, v in enumerate(vs) if v == QUANTIZED_MESH_MAX],
+    ]
+    for edge in edges:
+        body += struct.pack(f"<I{len(edge)}H", len(edge), *edge)
+    return body
+
+
+def _zigzag_deltas(values: List[int]) -> List[int]:
+    deltas = [value - previous for previous, value in zip([0] + values, values)]
+    return [((delta << 1) ^ (delta >> 31)) & 0xFFFF for delta in deltas]
+
+
+def _high_water_marks(indices: List[int]) -> List[int]:
+    codes = []
+    highest = 0
+    for index in indices:
+        codes.append(highest - index)
+        if index == highest:
+            highest += 1
+    return codes
+
+
+def _format_date(value: datetime) -> str:
+    return value.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _error(status: int, code: str, message: str) -> web.Response:
+    return web.json_response({"code": code, "message": message}, status=status)
+
+
+def _not_found(resource: str) -> web.HTTPNotFound:
+    return web.HTTPNotFound(
+        text=f'{{"code": "ResourceNotFound", "message": "{resource} not found."}}',
+        content_type="application/json",
+    )
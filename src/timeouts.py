@@ -0,0 +1,51 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Optional
+
+from exceptions import DeadlineExceeded
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+@dataclass(frozen=True)
+class Timeouts:
+    total: Optional[float] = 300.0
+    connect: Optional[float] = 30.0
+    read: Optional[float] = None
+
+    def bounded_by(self, budget: Optional[float]) -> "Timeouts":
+        if budget is None:
+            return self
+        if budget <= 0:
+            raise DeadlineExceeded("Deadline has been exceeded before the request.")
+        total = budget if self.total is None else min(self.total, budget)
+        return replace(self, total=total)
+
+
+@asynccontextmanager
+async def deadline(seconds: float) -> AsyncIterator[None]:
+    loop = asyncio.get_running_loop()
+    expires_at = loop.time() + seconds
+    outer_expires_at = _deadline.get()
+    if outer_expires_at is not None:
+        expires_at = min(expires_at, outer_expires_at)
+
+    token = _deadline.set(expires_at)
+    try:
+        async with asyncio.timeout_at(expires_at):
+            yield
+    except TimeoutError as e:
+        if isinstance(e, DeadlineExceeded) or loop.time() < expires_at:
+            raise
+        raise DeadlineExceeded(f"Deadline of {seconds}s has been exceeded.") from e
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - asyncio.get_running_loop().time()
@@ -116,3 +116,28 @@ async def test_delete_archive() -> None:
     http_client.delete.assert_called_once_with(
         endpoint="/v1/assets/213/archives/321", headers={}
     )
+
+
+@pytest.mark.asyncio
+async def test_iterate_archives_follows_link_headers() -> None:
+    res_path = Path("Archives/fixtures/list_response.json")
+    with open(res_path.resolve()) as f:
+        res = json.load(f)
+
+    http_client = AsyncMock()
+    http_client.get.side_effect = [
+        (200, res, {"Link": '</v1/assets/1/archives?page=2>; rel="next"'}),
+        (200, res, {}),
+    ]
+
+    client = ArchivesApiClient(http_client)
+    archives = [
+        archive
+        async for archive in client.iterate_archives(ListArchivesPathParams(assetId=1))
+    ]
+
+    assert len(archives) == 2 * len(res["items"])
+    assert http_client.get.call_args_list[1].kwargs == {
+        "endpoint": "/v1/assets/1/archives?page=2",
+        "headers": {},
+    }
@@ -0,0 +1,221 @@
+import io
+import zipfile
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from Archives.client import ArchivesApiClient
+from Archives.dtos import DownloadArchivePathParams
+from Archives.extract import (
+    EntryEnd,
+    StreamingZipExtractor,
+    ZipEntry,
+    ZipStreamParser,
+    download_and_extract,
+    extract_archive_file,
+)
+from Archives.mirror import ArchiveMirror
+from Assets.client import AssetsApiClient
+from exceptions import ArchiveExtractionError, UnsupportedZipStreamError
+from http_client import AsyncClient
+from stand_in_server import IonStandInServer, StandInConfig
+
+FILES = {
+    "tileset.json": b'{"asset": {"version": "1.0"}}' * 20,
+    "tiles/0/0.b3dm": bytes(range(256)) * 40,
+    "tiles/0/1.b3dm": b"",
+}
+
+
+class UnseekableWriter(io.RawIOBase):
+    # zipfile falls back to data descriptors when it cannot seek back.
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.buffer += data
+        return len(data)
+
+
+def build_zip(
+    files: Dict[str, bytes], compression: int = zipfile.ZIP_DEFLATED, seekable=True
+) -> bytes:
+    target = io.BytesIO() if seekable else UnseekableWriter()
+    with zipfile.ZipFile(target, "w", compression=compression) as archive:
+        archive.writestr("tiles/", b"")
+        for name, content in files.items():
+            archive.writestr(name, content, compress_type=compression)
+    return bytes(target.getvalue() if seekable else target.buffer)
+
+
+def read_tree(root: Path) -> Dict[str, bytes]:
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+def chunked(data: bytes, size: int):
+    return [data[offset : offset + size] for offset in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize(
+    "compression, seekable",
+    [
+        (zipfile.ZIP_DEFLATED, True),
+        (zipfile.ZIP_STORED, True),
+        (zipfile.ZIP_DEFLATED, False),
+        (zipfile.ZIP_STORED, False),
+    ],
+)
+def test_parser_yields_entries_from_small_chunks(compression, seekable) -> None:
+    archive = build_zip(FILES, compression, seekable)
+    parser = ZipStreamParser()
+    events = []
+    for chunk in chunked(archive, 7):
+        events.extend(parser.feed(chunk))
+    parser.close()
+
+    entries = [event for event in events if isinstance(event, ZipEntry)]
+    ends = [event for event in events if isinstance(event, EntryEnd)]
+    raw = b"".join(event for event in events if isinstance(event, bytes))
+    infos = zipfile.ZipFile(io.BytesIO(archive)).infolist()
+    assert [entry.name for entry in entries] == ["tiles/", *FILES]
+    assert [end.crc for end in ends] == [info.CRC for info in infos]
+    # Data is passed on as it is stored, inflating is left to the writers.
+    assert len(raw) == sum(info.compress_size for info in infos)
+
+
+def test_parser_streams_data_descriptor_entries() -> None:
+    content = bytes(range(256)) * 4096
+    parser = ZipStreamParser()
+    buffered = []
+    for chunk in chunked(build_zip({"large.bin": content}, seekable=False), 4096):
+        parser.feed(chunk)
+        buffered.append(len(parser._buffer))
+    parser.close()
+
+    assert max(buffered) < 4096 + 24
+
+
+def test_parser_rejects_unsupported_compression() -> None:
+    parser = ZipStreamParser()
+
+    with pytest.raises(UnsupportedZipStreamError):
+        parser.feed(build_zip(FILES, zipfile.ZIP_BZIP2))
+
+
+@pytest.mark.asyncio
+async def test_extractor_writes_files(tmp_path) -> None:
+    async with StreamingZipExtractor(tmp_path, max_workers=2) as extractor:
+        for chunk in chunked(build_zip(FILES, seekable=False), 100):
+            await extractor.feed(chunk)
+        extractor.finish()
+
+    assert read_tree(tmp_path) == FILES
+    assert extractor.names == set(FILES)
+
+
+@pytest.mark.asyncio
+async def test_extractor_streams_large_entry_to_disk(tmp_path) -> None:
+    files = {"large.bin": bytes(range(256)) * 8192, **FILES}
+    async with StreamingZipExtractor(tmp_path, max_workers=2) as extractor:
+        for chunk in chunked(build_zip(files, seekable=False), 1024):
+            await extractor.feed(chunk)
+        extractor.finish()
+
+    assert read_tree(tmp_path) == files
+    assert not list(tmp_path.rglob("*.part"))
+
+
+@pytest.mark.asyncio
+async def test_extractor_reports_bad_crc_without_stalling(tmp_path) -> None:
+    archive = bytearray(build_zip({"data.bin": b"x" * 10_000}, zipfile.ZIP_STORED))
+    archive[archive.index(b"x" * 100) + 50] = ord("y")
+
+    with pytest.raises(ArchiveExtractionError, match="bad CRC"):
+        async with StreamingZipExtractor(tmp_path) as extractor:
+            for chunk in chunked(bytes(archive), 100):
+                await extractor.feed(chunk)
+            extractor.finish()
+
+    assert read_tree(tmp_path) == {}
+
+
+@pytest.mark.asyncio
+async def test_extractor_refuses_paths_outside_destination(tmp_path) -> None:
+    with pytest.raises(ArchiveExtractionError, match="points outside"):
+        async with StreamingZipExtractor(tmp_path / "out") as extractor:
+            await extractor.feed(build_zip({"../escaped.txt": b"x"}))
+
+    assert not (tmp_path / "escaped.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_extract_archive_file_from_memory_map(tmp_path) -> None:
+    archive_path = tmp_path / "archive.zip"
+    archive_path.write_bytes(build_zip(FILES, zipfile.ZIP_STORED, seekable=False))
+
+    paths = await extract_archive_file(archive_path, tmp_path / "out", max_workers=3)
+
+    assert read_tree(tmp_path / "out") == FILES
+    assert len(paths) == len(FILES)
+
+
+@pytest.mark.asyncio
+async def test_download_and_extract_falls_back_to_downloaded_file(tmp_path) -> None:
+    config = StandInConfig(
+        asset_count=1,
+        archive_content=build_zip(FILES, zipfile.ZIP_BZIP2),
+        archive_chunk_bytes=50,
+        polls_to_complete=1,
+    )
+    async with IonStandInServer(config) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            archives_client = ArchivesApiClient(http_client)
+            archive = next(iter(server._asset_archives(server.assets[1]).values()))
+            archive["status"] = "COMPLETE"
+            path_params = DownloadArchivePathParams(assetId=1, archiveId=archive["id"])
+
+            with pytest.raises(UnsupportedZipStreamError):
+                await download_and_extract(
+                    archives_client, path_params, tmp_path / "streamed"
+                )
+            await download_and_extract(
+                archives_client,
+                path_params,
+                tmp_path / "fallback",
+                archive_path=tmp_path / "archive.zip",
+            )
+
+    assert read_tree(tmp_path / "fallback") == FILES
+    assert (tmp_path / "archive.zip").read_bytes() == config.archive_content
+
+
+@pytest.mark.asyncio
+async def test_mirror_extracts_while_downloading(tmp_path) -> None:
+    config = StandInConfig(
+        asset_count=2,
+        archives_per_asset=0,
+        archive_content=build_zip(FILES, seekable=False),
+        archive_chunk_bytes=64,
+    )
+    async with IonStandInServer(config) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            mirror = ArchiveMirror(
+                AssetsApiClient(http_client),
+                ArchivesApiClient(http_client),
+                tmp_path,
+                poll_interval=0,
+                extract=True,
+            )
+            result = await mirror.run()
+
+    assert list(result.downloaded) == [2]
+    assert read_tree(mirror.extracted_path_for(2)) == FILES
+    assert (tmp_path / "2.zip").read_bytes() == config.archive_content
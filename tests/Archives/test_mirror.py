@@ -0,0 +1,57 @@
+import pytest
+
+from Archives.client import ArchivesApiClient
+from Archives.mirror import ArchiveMirror
+from Assets.client import AssetsApiClient
+from http_client import AsyncClient
+from stand_in_server import IonStandInServer, StandInConfig
+
+CONFIG = StandInConfig(
+    asset_count=4, archives_per_asset=0, archive_bytes=10_000, archive_chunk_bytes=1024
+)
+
+
+@pytest.mark.asyncio
+async def test_mirror_downloads_archivable_assets_once(tmp_path) -> None:
+    async with IonStandInServer(CONFIG) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            mirror = ArchiveMirror(
+                AssetsApiClient(http_client),
+                ArchivesApiClient(http_client),
+                tmp_path,
+                poll_interval=0,
+                chunk_size=4096,
+            )
+            first_run = await mirror.run()
+            second_run = await mirror.run()
+            server.assets[2]["name"] = "Renamed"
+            third_run = await mirror.run()
+
+    assert sorted(first_run.downloaded) == [2, 4]
+    assert first_run.failed == {}
+    assert (tmp_path / "2.zip").stat().st_size == 10_000
+    assert not list(tmp_path.glob("*.part"))
+    assert sorted(second_run.unchanged) == [2, 4]
+    assert list(third_run.downloaded) == [2]
+    assert third_run.unchanged == [4]
+
+
+@pytest.mark.asyncio
+async def test_mirror_downloads_again_when_file_is_truncated(tmp_path) -> None:
+    async with IonStandInServer(CONFIG) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            mirror = ArchiveMirror(
+                AssetsApiClient(http_client),
+                ArchivesApiClient(http_client),
+                tmp_path,
+                poll_interval=0,
+            )
+            await mirror.run()
+            (tmp_path / "4.zip").write_bytes(b"partial")
+            archives_before = len(server.archives[4])
+            result = await mirror.run()
+            archives_after = len(server.archives[4])
+
+    assert list(result.downloaded) == [4]
+    assert archives_after == archives_before
+    assert (tmp_path / "4.zip").stat().st_size == 10_000
@@ -111,7 +111,7 @@ async def test_create_a_new_asset() -> None:
     http_client.post.assert_called_once_with(
         endpoint="/v1/assets",
         headers={"Content-type": "application/json"},
-        data=req_dto.dict(),
+        data=req_dto.dict(by_alias=True, exclude_none=True),
     )
 
     assert result.asset_metadata.id == "21111"
@@ -201,7 +201,7 @@ async def test_modify_asset_info() -> None:
     http_client.patch.assert_called_once_with(
         endpoint="/v1/assets/123",
         headers={"Content-type": "application/json"},
-        data=req_dto.dict(),
+        data=req_dto.dict(by_alias=True, exclude_none=True),
     )
 
 
@@ -296,3 +296,33 @@ async def test_access_tiles_when_malformed_response() -> None:
     http_client.get.assert_called_once_with(
         endpoint="/v1/assets/123/endpoint", headers={}
     )
+
+
+@pytest.mark.asyncio
+async def test_iterate_assets_follows_pages() -> None:
+    res_path = Path("Assets/fixtures/list_response.json")
+    with open(res_path.resolve()) as f:
+        res = json.load(f)
+
+    http_client = AsyncMock()
+    http_client.get.side_effect = [
+        (
+            200,
+            res,
+            {
+                "Link": "</v1/assets?limit=1000&page=2&sortBy=ID&sortOrder=ASC>; rel='next'"
+            },
+        ),
+        (200, res, {}),
+    ]
+
+    client = AssetsApiClient(http_client)
+    result = [
+        asset async for asset in client.iterate_assets(ListAssetsQueryParameters())
+    ]
+
+    assert len(result) == 4
+    assert http_client.get.call_args_list[1].kwargs == {
+        "endpoint": "/v1/assets?limit=1000&page=2&sortBy=ID&sortOrder=ASC",
+        "headers": {},
+    }
@@ -0,0 +1,95 @@
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from Assets.client import AssetsApiClient
+from Assets.dtos import CreateAssetRequest, UploadLocation
+from Assets.enums import AssetStatus, AssetType
+from Assets.pipeline import AssetCreationPipeline
+from http_client import AsyncClient
+from stand_in_server import IonStandInServer, StandInConfig
+
+
+def from_s3(name: str) -> CreateAssetRequest:
+    return CreateAssetRequest(
+        name=name,
+        type=AssetType.THREEDTILES,
+        options={"sourceType": "3DTILES"},
+        **{
+            "from": {
+                "bucket": "source",
+                "credentials": {"accessKey": "a", "secretAccessKey": "b"},
+            }
+        },
+    )
+
+
+def awaiting_files(name: str) -> CreateAssetRequest:
+    return CreateAssetRequest(
+        name=name, type=AssetType.THREEDTILES, options={"sourceType": "3DTILES"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_creates_uploads_and_waits() -> None:
+    uploaded: List[str] = []
+    progress = []
+
+    async def uploader(request: CreateAssetRequest, location: UploadLocation) -> None:
+        uploaded.append(f"{request.name}:{location.prefix}")
+
+    requests = [from_s3(f"S3 {i}") for i in range(5)] + [awaiting_files("Upload")]
+    async with IonStandInServer(StandInConfig(asset_count=0)) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            pipeline = AssetCreationPipeline(
+                AssetsApiClient(http_client),
+                uploader=uploader,
+                create_concurrency=2,
+                queue_size=2,
+                poll_interval=0,
+                progress_callback=lambda done, total: progress.append((done, total)),
+            )
+            results = await pipeline.run(requests)
+
+    assert [result.request for result in results] == requests
+    assert all(result.status == AssetStatus.COMPLETE for result in results)
+    assert all(result.error is None for result in results)
+    assert uploaded == [f"Upload:sources/{results[-1].asset_id}/"]
+    assert progress[-1] == (6, 6)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_failures_without_stopping() -> None:
+    requests = [awaiting_files("No uploader"), from_s3("S3")]
+    async with IonStandInServer(StandInConfig(asset_count=0)) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            pipeline = AssetCreationPipeline(
+                AssetsApiClient(http_client), poll_interval=0
+            )
+            results = await pipeline.run(requests)
+
+    assert type(results[0].error) == ValueError
+    assert results[0].status == AssetStatus.AWAITING_FILES
+    assert results[1].error is None
+    assert results[1].status == AssetStatus.COMPLETE
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sends_s3_source_as_from() -> None:
+    async with IonStandInServer(StandInConfig(asset_count=0)) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            pipeline = AssetCreationPipeline(
+                AssetsApiClient(http_client), poll_interval=0
+            )
+            with patch.object(http_client, "post", wraps=http_client.post) as post:
+                results = await pipeline.run([from_s3("S3")])
+
+    body = post.call_args.kwargs["data"]
+    assert "asset_from" not in body
+    assert body["from"] == {
+        "type": "S3",
+        "bucket": "source",
+        "credentials": {"accessKey": "a", "secretAccessKey": "b"},
+    }
+    assert results[0].status == AssetStatus.COMPLETE
@@ -0,0 +1,64 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from Assets.client import AssetsApiClient
+from Assets.dtos import AssetMetadata
+from Assets.enums import AssetStatus, AssetType
+from Assets.query import AssetQuery
+
+
+def _load_assets():
+    res_path = Path("Assets/fixtures/list_response.json")
+    with open(res_path.resolve()) as f:
+        return json.load(f)
+
+
+def test_to_list_query_parameters_pushes_down_server_filters() -> None:
+    query = AssetQuery(
+        search="house",
+        status=[AssetStatus.COMPLETE],
+        type=[AssetType.THREEDTILES],
+        min_bytes=10,
+        exportable=True,
+    )
+
+    assert (
+        query.to_list_query_parameters().to_query_params()
+        == "?limit=1000&page=1&sortBy=ID&sortOrder=ASC&search=house&status=COMPLETE&type=3DTILES"
+    )
+
+
+def test_matches_evaluates_client_side_filters() -> None:
+    assets = [AssetMetadata.parse_obj(a) for a in _load_assets()["items"]]
+
+    assert [a.id for a in assets if AssetQuery(min_bytes=1).matches(a)] == ["92391"]
+    assert [a.id for a in assets if AssetQuery(archivable=False).matches(a)] == ["1"]
+    query = AssetQuery(
+        date_added_from=datetime(2019, 4, 14, 15, 26),
+        date_added_to=datetime(2019, 4, 15),
+    )
+    assert [a.id for a in assets if query.matches(a)] == ["92391"]
+
+
+@pytest.mark.asyncio
+async def test_query_assets_streams_matching_assets() -> None:
+    http_client = AsyncMock()
+    http_client.get.side_effect = [
+        (200, _load_assets(), {"Link": "</v1/assets?page=2>; rel='next'"}),
+        (200, _load_assets(), {}),
+    ]
+    client = AssetsApiClient(http_client)
+
+    result = [
+        asset
+        async for asset in client.query_assets(
+            AssetQuery(exportable=True, max_results=1)
+        )
+    ]
+
+    assert [a.id for a in result] == ["92391"]
+    http_client.get.assert_called_once()
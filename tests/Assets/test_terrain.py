@@ -0,0 +1,41 @@
+import pytest
+
+from Assets.terrain import TerrainLayer, tile_range, tiles_in_region
+from Assets.tileset import Region
+
+LAYER = {
+    "tilejson": "2.1.0",
+    "version": "1.2.0",
+    "scheme": "tms",
+    "tiles": ["{z}/{x}/{y}.terrain?v={version}"],
+    "extensions": ["octvertexnormals", "metadata"],
+    "maxzoom": 16,
+}
+
+
+def test_terrain_layer_builds_tile_paths_and_accept_header() -> None:
+    layer = TerrainLayer.parse(LAYER)
+
+    assert layer.tile_path(3, 10, 5) == "3/10/5.terrain?v=1.2.0"
+    assert layer.accept_header().startswith(
+        "application/vnd.quantized-mesh;extensions=octvertexnormals-metadata,"
+    )
+    assert layer.max_zoom == 16
+
+
+def test_terrain_layer_rejects_web_mercator() -> None:
+    with pytest.raises(ValueError):
+        TerrainLayer.parse({**LAYER, "projection": "EPSG:3857"})
+
+
+def test_tile_range_uses_geographic_tms_tiling() -> None:
+    world = Region.from_degrees(-180, -90, 180, 90)
+
+    assert tile_range(world, 0) == (0, 0, 1, 0)
+    assert tile_range(world, 2) == (0, 0, 7, 3)
+    assert list(tiles_in_region(Region.from_degrees(-10, 40, 10, 60), 2)) == [
+        (3, 2),
+        (4, 2),
+        (3, 3),
+        (4, 3),
+    ]
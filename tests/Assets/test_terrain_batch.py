@@ -0,0 +1,108 @@
+import gzip
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from Assets.client import AssetsApiClient  # noqa: E402
+from Assets.terrain import tile_range  # noqa: E402
+from Assets.terrain_batch import (  # noqa: E402
+    QUANTIZED_MESH_MAX,
+    TerrainBatchFetcher,
+    decode_quantized_mesh,
+    densify_polyline,
+    tile_coordinates,
+)
+from Assets.tileset import Region  # noqa: E402
+from exceptions import ResourceNotFound  # noqa: E402
+from http_client import AsyncClient  # noqa: E402
+from stand_in_server import (  # noqa: E402
+    Fault,
+    IonStandInServer,
+    StandInConfig,
+    _quantized_mesh,
+    terrain_height,
+)
+
+TERRAIN_ASSET_ID = 4
+
+
+def test_decode_gzipped_quantized_mesh_and_sample() -> None:
+    mesh = decode_quantized_mesh(gzip.compress(_quantized_mesh(1, 2, 1)))
+    u = np.array([0, QUANTIZED_MESH_MAX, 1000, 20000])
+    v = np.array([0, QUANTIZED_MESH_MAX, 30000, 5000])
+
+    heights = mesh.sample(u, v)
+
+    lons = 0.0 + u / QUANTIZED_MESH_MAX * 90.0
+    lats = 0.0 + v / QUANTIZED_MESH_MAX * 90.0
+    assert mesh.triangles.shape == (32, 3)
+    assert len(mesh.heights) == 25
+    np.testing.assert_allclose(heights, terrain_height(lons, lats), atol=0.01)
+
+
+def test_tile_coordinates_match_tile_range() -> None:
+    lons = np.array([-179.9, -9.0, 0.0, 179.9])
+    lats = np.array([-89.9, 41.0, 0.0, 89.9])
+
+    x, y = tile_coordinates(lons, lats, 4)
+
+    for lon, lat, tile_x, tile_y in zip(lons, lats, x, y):
+        region = Region.from_degrees(lon, lat, lon, lat)
+        assert tile_range(region, 4)[:2] == (tile_x, tile_y)
+
+
+def test_densify_polyline_keeps_vertices_and_spacing() -> None:
+    lons, lats = densify_polyline([0.0, 1.0, 1.0], [0.0, 0.0, 0.5], spacing=0.25)
+
+    assert list(lons) == [0.0, 0.25, 0.5, 0.75, 1.0, 1.0, 1.0]
+    assert list(lats) == [0.0, 0.0, 0.0, 0.0, 0.0, 0.25, 0.5]
+
+
+@pytest.mark.asyncio
+async def test_sample_points_fetches_each_tile_once() -> None:
+    random = np.random.default_rng(0)
+    lons = random.uniform(-10, 10, 500)
+    lats = random.uniform(40, 60, 500)
+
+    async with IonStandInServer(StandInConfig(asset_count=10)) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            fetcher = TerrainBatchFetcher(AssetsApiClient(http_client), http_client)
+            heights = await fetcher.sample_points(TERRAIN_ASSET_ID, lons, lats, 3)
+        terrain_requests = [
+            path for _, path in server.request_log if path.endswith(".terrain")
+        ]
+
+    x, y = tile_coordinates(lons, lats, 3)
+    assert len(terrain_requests) == len(set(zip(x, y)))
+    np.testing.assert_allclose(heights, terrain_height(lons, lats), atol=0.01)
+
+
+@pytest.mark.asyncio
+async def test_sample_polyline_returns_profile() -> None:
+    async with IonStandInServer(StandInConfig(asset_count=10)) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            fetcher = TerrainBatchFetcher(AssetsApiClient(http_client), http_client)
+            lons, lats, heights = await fetcher.sample_polyline(
+                TERRAIN_ASSET_ID, [-5.0, 5.0], [45.0, 50.0], level=5
+            )
+
+            with pytest.raises(ValueError):
+                await fetcher.fetch_tiles(TERRAIN_ASSET_ID, 9, [(0, 0)])
+
+    assert (lons[0], lats[0], lons[-1], lats[-1]) == (-5.0, 45.0, 5.0, 50.0)
+    assert len(lons) > 100
+    np.testing.assert_allclose(heights, terrain_height(lons, lats), atol=0.01)
+
+
+@pytest.mark.asyncio
+async def test_missing_tile_raises_resource_not_found() -> None:
+    async with IonStandInServer(StandInConfig(asset_count=10)) as server:
+        server.add_fault(Fault(path=r"/tiles/4/3/8/6\.terrain", status=404))
+        async with AsyncClient(server.url, "test-token") as http_client:
+            fetcher = TerrainBatchFetcher(AssetsApiClient(http_client), http_client)
+
+            with pytest.raises(ResourceNotFound):
+                await fetcher.sample_points(
+                    TERRAIN_ASSET_ID, np.array([-9.0, 11.0]), np.array([45.0, 45.0]), 3
+                )
@@ -0,0 +1,129 @@
+import pytest
+
+from Assets.client import AssetsApiClient
+from Assets.dtos import AssetEndpoints
+from Assets.enums import AssetType
+from Assets.tile_cache import TileCache, TileCacheServer, TilePrefetcher, cache_key
+from Assets.tileset import Region, TileAccess, TilesetWalker
+from exceptions import ResourceNotFound
+from http_client import AsyncClient
+from stand_in_server import IonStandInServer, StandInConfig
+
+TILESET_ASSET_ID = 7
+TERRAIN_ASSET_ID = 4
+REGION = Region.from_degrees(-9, 41, -6, 44)
+
+
+def test_cache_index_grows_and_survives_reopening(tmp_path) -> None:
+    with TileCache(tmp_path, initial_capacity=4) as cache:
+        for number in range(100):
+            cache.put(f"1/{number}.b3dm", str(number).encode())
+
+    with TileCache(tmp_path) as cache:
+        assert len(cache) == 100
+        assert all(
+            cache.get(f"1/{number}.b3dm") == str(number).encode()
+            for number in range(100)
+        )
+        assert cache.get("1/100.b3dm") is None
+        assert "1/100.b3dm" not in cache
+
+
+def test_cache_stores_identical_tiles_once(tmp_path) -> None:
+    with TileCache(tmp_path) as cache:
+        first = cache.put("4/0/0/0.terrain", b"empty tile")
+        second = cache.put("4/0/1/0.terrain", b"empty tile")
+        cache.put("4/0/0/0.terrain", b"replaced tile")
+
+        assert first == second
+        assert cache.get("4/0/1/0.terrain") == b"empty tile"
+        assert cache.get("4/0/0/0.terrain") == b"replaced tile"
+        assert len(list((tmp_path / "objects").rglob("*"))) == 4
+        assert len(cache) == 2
+
+
+def test_cache_key_mirrors_layout_under_asset_root() -> None:
+    root = "https://assets.ion.test/7/tileset.json?v=1"
+
+    assert (
+        cache_key(7, root, "https://assets.ion.test/7/1/0/0.b3dm?v=1") == "7/1/0/0.b3dm"
+    )
+    assert cache_key(7, root, "https://cdn.test/a.b3dm") == "7/cdn.test/a.b3dm"
+
+
+@pytest.mark.asyncio
+async def test_prefetch_tileset_refreshes_access_token(tmp_path) -> None:
+    config = StandInConfig(asset_count=10, access_token_uses=5)
+    async with IonStandInServer(config) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            with TileCache(tmp_path) as cache:
+                prefetcher = TilePrefetcher(
+                    AssetsApiClient(http_client), http_client, cache, concurrency=3
+                )
+                first = await prefetcher.prefetch_tileset(
+                    TILESET_ASSET_ID, region=REGION
+                )
+                second = await prefetcher.prefetch_tileset(
+                    TILESET_ASSET_ID, region=REGION
+                )
+
+                assert "7/tileset.json" in cache
+                assert "7/2/0/0/tileset.json" in cache
+
+    assert (first.fetched, first.cached, first.failed) == (7, 0, {})
+    assert first.fetched_bytes == 7 * config.tile_bytes
+    assert (second.fetched, second.cached) == (0, 7)
+    assert server.access_tokens_issued > 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_terrain_fetches_tiles_in_region(tmp_path) -> None:
+    async with IonStandInServer(StandInConfig(asset_count=10)) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            with TileCache(tmp_path) as cache:
+                prefetcher = TilePrefetcher(
+                    AssetsApiClient(http_client), http_client, cache
+                )
+                result = await prefetcher.prefetch_terrain(
+                    TERRAIN_ASSET_ID,
+                    Region.from_degrees(-10, 40, 10, 60),
+                    max_level=2,
+                )
+
+                assert "4/layer.json" in cache
+                assert "4/2/4/3.terrain" in cache
+        terrain_requests = [
+            path for _, path in server.request_log if path.endswith(".terrain")
+        ]
+
+    assert (result.fetched, result.failed) == (8, {})
+    assert len(terrain_requests) == 8
+
+
+@pytest.mark.asyncio
+async def test_cache_server_serves_prefetched_tileset(tmp_path) -> None:
+    async with IonStandInServer(StandInConfig(asset_count=10)) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            with TileCache(tmp_path) as cache:
+                prefetcher = TilePrefetcher(
+                    AssetsApiClient(http_client), http_client, cache
+                )
+                await prefetcher.prefetch_tileset(TILESET_ASSET_ID, region=REGION)
+
+                async with TileCacheServer(cache) as cache_server:
+                    endpoint = AssetEndpoints(
+                        type=AssetType.THREEDTILES,
+                        url=f"{cache_server.url}/{TILESET_ASSET_ID}/tileset.json",
+                    )
+                    walker = TilesetWalker(http_client, endpoint, region=REGION)
+                    access = TileAccess(http_client, endpoint)
+                    contents = [content async for content in walker.walk()]
+                    tiles = [await access.read(content.url) for content in contents]
+
+                    with pytest.raises(ResourceNotFound):
+                        await access.read(
+                            f"{cache_server.url}/{TILESET_ASSET_ID}/missing.b3dm"
+                        )
+
+    assert len(contents) == 7
+    assert all(len(tile) == server.config.tile_bytes for tile in tiles)
@@ -0,0 +1,123 @@
+from typing import List, Optional
+
+import pytest
+
+from Assets.client import AssetsApiClient
+from Assets.dtos import AccessTilesPathParams, AssetEndpoints
+from Assets.enums import AssetType
+from Assets.tileset import Region, TileContent, TilesetWalker, resolve_uri
+from exceptions import InvalidCredentials, UnknownError
+from http_client import AsyncClient
+from stand_in_server import Fault, IonStandInServer, StandInConfig
+
+TILESET_ASSET_ID = 7
+
+
+async def walk(
+    server: IonStandInServer,
+    access_token: Optional[str] = None,
+    **options,
+) -> List[TileContent]:
+    async with AsyncClient(server.url, "test-token") as http_client:
+        endpoint = await AssetsApiClient(http_client).access_tiles(
+            AccessTilesPathParams(assetId=TILESET_ASSET_ID)
+        )
+        if access_token is not None:
+            endpoint = endpoint.copy(update={"access_token": access_token})
+        walker = TilesetWalker(http_client, endpoint, **options)
+        return [content async for content in walker.walk()]
+
+
+def test_resolve_uri_carries_tileset_query_parameters() -> None:
+    base = "https://assets.ion.test/7/tileset.json?v=2&k=a"
+
+    assert (
+        resolve_uri(base, "0/0/0.b3dm")
+        == "https://assets.ion.test/7/0/0/0.b3dm?v=2&k=a"
+    )
+    assert resolve_uri(base, "a.b3dm?v=3") == "https://assets.ion.test/7/a.b3dm?v=3&k=a"
+    assert resolve_uri(base, "https://cdn.test/a.b3dm") == "https://cdn.test/a.b3dm"
+
+
+@pytest.mark.asyncio
+async def test_walker_follows_external_tilesets() -> None:
+    async with IonStandInServer(StandInConfig(asset_count=10)) as server:
+        contents = await walk(server, concurrency=4)
+        tileset_requests = [
+            path for _, path in server.request_log if path.endswith("tileset.json")
+        ]
+
+    assert len(contents) == 1 + 4 + 16 + 64
+    assert len({content.url for content in contents}) == len(contents)
+    assert all(content.url.endswith(".b3dm?v=1") for content in contents)
+    assert sorted({content.depth for content in contents}) == [0, 1, 2, 3]
+    assert len(tileset_requests) == 1 + 16
+
+
+@pytest.mark.asyncio
+async def test_walker_filters_by_depth() -> None:
+    async with IonStandInServer(StandInConfig(asset_count=10)) as server:
+        shallow = await walk(server, max_depth=1)
+        tileset_requests = [
+            path for _, path in server.request_log if path.endswith("tileset.json")
+        ]
+        deepest = await walk(server, min_depth=3)
+
+    assert [content.depth for content in shallow] == [0, 1, 1, 1, 1]
+    assert len(tileset_requests) == 1
+    assert len(deepest) == 64
+    assert {content.depth for content in deepest} == {3}
+
+
+@pytest.mark.asyncio
+async def test_walker_prunes_tiles_outside_region() -> None:
+    async with IonStandInServer(StandInConfig(asset_count=10)) as server:
+        contents = await walk(server, region=Region.from_degrees(-9, 41, -6, 44))
+
+    assert [content.depth for content in contents] == [0, 1, 2, 3, 3, 3, 3]
+
+
+@pytest.mark.asyncio
+async def test_walker_uses_endpoint_access_token() -> None:
+    async with IonStandInServer(StandInConfig(asset_count=10)) as server:
+        with pytest.raises(InvalidCredentials):
+            await walk(server, access_token="expired")
+
+
+@pytest.mark.asyncio
+async def test_walker_unwinds_fetches_when_one_fails() -> None:
+    async with IonStandInServer(StandInConfig(asset_count=10)) as server:
+        external_tilesets = r"/tiles/7/\d+/\d+/\d+/tileset\.json"
+        server.add_fault(Fault(path=external_tilesets, delay=1.0, times=3))
+        server.add_fault(Fault(path=external_tilesets, status=500))
+        async with AsyncClient(server.url, "test-token") as http_client:
+            endpoint = await AssetsApiClient(http_client).access_tiles(
+                AccessTilesPathParams(assetId=TILESET_ASSET_ID)
+            )
+            walker = TilesetWalker(http_client, endpoint, concurrency=4)
+            started, unwound = [], []
+            fetch_tileset = walker._fetch_tileset
+
+            async def tracked_fetch_tileset(url: str):
+                started.append(url)
+                try:
+                    return await fetch_tileset(url)
+                finally:
+                    unwound.append(url)
+
+            walker._fetch_tileset = tracked_fetch_tileset
+
+            with pytest.raises(UnknownError):
+                [content async for content in walker.walk()]
+
+            assert len(started) == 1 + 4
+            assert sorted(unwound) == sorted(started)
+
+
+def test_walker_rejects_other_asset_types() -> None:
+    endpoint = AssetEndpoints(
+        type=AssetType.TERRAIN, url="https://assets.ion.test/1/", accessToken="t"
+    )
+
+    with pytest.raises(ValueError):
+        TilesetWalker(AsyncClient("https://api.ion.test", "token"), endpoint)
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from Assets.client import AssetsApiClient
+from Exports.bulk import BulkExporter
+from Exports.client import ExportsApiClient
+from Exports.dtos import ExportAssetRequest
+from http_client import AsyncClient
+from stand_in_server import Fault, IonStandInServer, StandInConfig
+
+DESTINATION = ExportAssetRequest(
+    bucket="backups",
+    prefix="account/",
+    accessKeyId="access-key",
+    secretAccessKey="secret",
+)
+
+
+@pytest.mark.asyncio
+async def test_export_all_exports_exportable_assets(tmp_path) -> None:
+    journal_path = tmp_path / "exports.jsonl"
+    async with IonStandInServer(
+        StandInConfig(asset_count=6, exports_per_asset=0)
+    ) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            exporter = BulkExporter(
+                AssetsApiClient(http_client),
+                ExportsApiClient(http_client),
+                DESTINATION,
+                poll_interval=0,
+            )
+            result = await exporter.export_all(journal_path)
+            second_run = await exporter.export_all(journal_path)
+
+        prefixes = {
+            asset_id: export["to"]["prefix"]
+            for asset_id, exports in server.exports.items()
+            for export in exports.values()
+        }
+
+    assert sorted(result.completed) == [1, 2, 4, 5]
+    assert result.failed == {}
+    assert prefixes == {i: f"account/{i}/" for i in (1, 2, 4, 5)}
+    assert sorted(second_run.skipped) == [1, 2, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_export_resumes_submitted_exports(tmp_path) -> None:
+    journal_path = tmp_path / "exports.jsonl"
+    async with IonStandInServer(
+        StandInConfig(asset_count=2, exports_per_asset=0)
+    ) as server:
+        server.add_fault(Fault(path=r".*/exports/\d+", status=503))
+        async with AsyncClient(server.url, "test-token") as http_client:
+            exporter = BulkExporter(
+                AssetsApiClient(http_client),
+                ExportsApiClient(http_client),
+                DESTINATION,
+                poll_interval=0,
+            )
+            interrupted = await exporter.export_assets([1], journal_path)
+            resumed = await exporter.export_assets([1], journal_path)
+
+        exports_created = len(server.exports[1])
+
+    assert list(interrupted.failed) == [1]
+    assert resumed.completed == {1: "1"}
+    assert exports_created == 1
+    last_entry = json.loads(journal_path.read_text().splitlines()[-1])
+    assert last_entry["state"] == "complete"
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from pathlib import Path
 from unittest.mock import AsyncMock
@@ -99,7 +100,7 @@ async def test_export_asset() -> None:
     http_client.post.assert_called_once_with(
         endpoint="/v1/assets/123/exports",
         headers={"Content-type": "application/json"},
-        data=req_dto.dict(),
+        data=req_dto.dict(by_alias=True, exclude_none=True),
     )
 
     assert result.id == "1"
@@ -137,3 +138,64 @@ async def test_get_export_asset() -> None:
     assert result.to.type == "S3"
     assert result.to.bucket == "string"
     assert result.to.prefix == "string"
+
+
+@pytest.mark.asyncio
+async def test_iterate_exports_follows_link_headers() -> None:
+    res_path = Path("Exports/fixtures/list_response.json")
+    with open(res_path.resolve()) as f:
+        res = json.load(f)
+
+    http_client = AsyncMock()
+    http_client.get.side_effect = [
+        (
+            200,
+            res,
+            {
+                "Link": '<https://api.cesium.com/v1/assets/123/exports?page=2>; rel="next"'
+            },
+        ),
+        (200, res, {}),
+    ]
+
+    client = ExportsApiClient(http_client)
+    exports = [
+        export
+        async for export in client.iterate_exports(
+            ListExportsPathParams(assetId=123), prefetch=True
+        )
+    ]
+
+    assert len(exports) == 4
+    assert http_client.get.call_args_list[1].kwargs == {
+        "endpoint": "/v1/assets/123/exports?page=2",
+        "headers": {},
+    }
+
+
+@pytest.mark.asyncio
+async def test_closing_iteration_unwinds_prefetched_page() -> None:
+    res_path = Path("Exports/fixtures/list_response.json")
+    with open(res_path.resolve()) as f:
+        res = json.load(f)
+
+    unwound = []
+
+    async def get(endpoint: str, headers: dict):
+        if endpoint.endswith("page=2"):
+            try:
+                await asyncio.Event().wait()
+            finally:
+                unwound.append(endpoint)
+        return 200, res, {"Link": f"<{endpoint}?page=2>; rel='next'"}
+
+    http_client = AsyncMock()
+    http_client.get.side_effect = get
+
+    client = ExportsApiClient(http_client)
+    exports = client.iterate_exports(ListExportsPathParams(assetId=123), prefetch=True)
+    await exports.__anext__()
+    await asyncio.sleep(0)
+    await exports.aclose()
+
+    assert unwound == ["/v1/assets/123/exports?page=2"]
@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from Tokens.bulk import BulkTokensClient
+from Tokens.client import TokensApiClient
+from Tokens.dtos import CreateTokenRequest, DeleteTokenPathParameters
+from Tokens.enums import TokenScopes
+from exceptions import UnknownError
+
+
+def _load_token():
+    res_path = Path("Tokens/fixtures/get_response.json")
+    with open(res_path.resolve()) as f:
+        return json.load(f)
+
+
+@pytest.mark.asyncio
+async def test_create_tokens_reports_progress_and_errors() -> None:
+    http_client = AsyncMock()
+    http_client.post.side_effect = [(200, _load_token(), {}), UnknownError("boom")]
+    progress = []
+
+    client = BulkTokensClient(
+        TokensApiClient(http_client),
+        concurrency=1,
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+    requests = [
+        CreateTokenRequest(name=f"tenant-{i}", scopes=[TokenScopes.ASSETS_READ])
+        for i in range(2)
+    ]
+    result = await client.create_tokens(requests)
+
+    assert result[0].id == _load_token()["id"]
+    assert isinstance(result[1], UnknownError)
+    assert progress == [(1, 2), (2, 2)]
+
+
+@pytest.mark.asyncio
+async def test_delete_tokens() -> None:
+    http_client = AsyncMock()
+    client = BulkTokensClient(TokensApiClient(http_client), concurrency=2)
+
+    result = await client.delete_tokens(
+        [DeleteTokenPathParameters(tokenId=str(i)) for i in range(3)]
+    )
+
+    assert result == [None, None, None]
+    assert http_client.delete.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_rotate_tokens_resumes_from_journal(tmp_path: Path) -> None:
+    old_token = _load_token()
+    new_token = {**old_token, "id": "new-token-id", "token": "new-secret"}
+
+    http_client = AsyncMock()
+    http_client.get.return_value = (200, old_token, {})
+    http_client.post.return_value = (200, new_token, {})
+    swap = AsyncMock(side_effect=[RuntimeError("swap failed"), None])
+    client = BulkTokensClient(TokensApiClient(http_client))
+
+    first_run = await client.rotate_tokens(
+        [old_token["id"]], swap, tmp_path / "rotation.jsonl"
+    )
+    assert list(first_run.failed) == [old_token["id"]]
+    http_client.delete.assert_not_called()
+
+    http_client.get.side_effect = [(200, old_token, {}), (200, new_token, {})]
+    second_run = await client.rotate_tokens(
+        [old_token["id"]], swap, tmp_path / "rotation.jsonl"
+    )
+    assert second_run.rotated == {old_token["id"]: "new-token-id"}
+    assert http_client.post.call_count == 1
+    http_client.delete.assert_called_once_with(
+        endpoint=f"/v2/tokens/{old_token['id']}", headers={}
+    )
+
+    third_run = await client.rotate_tokens(
+        [old_token["id"]], swap, tmp_path / "rotation.jsonl"
+    )
+    assert third_run.skipped == [old_token["id"]]
+
+
+@pytest.mark.asyncio
+async def test_rotate_tokens_keeps_restrictions_on_the_wire(tmp_path: Path) -> None:
+    old_token = _load_token()
+    new_token = {**old_token, "id": "new-token-id", "token": "new-secret"}
+    http_client = AsyncMock()
+    http_client.get.return_value = (200, old_token, {})
+    http_client.post.return_value = (200, new_token, {})
+    client = BulkTokensClient(TokensApiClient(http_client))
+
+    await client.rotate_tokens([old_token["id"]], AsyncMock(), tmp_path / "r.jsonl")
+
+    body = http_client.post.call_args.kwargs["data"]
+    assert sorted(body) == ["allowedUrls", "assetIds", "name", "scopes"]
+    assert body["assetIds"] == old_token["assetIds"]
+    assert body["allowedUrls"] == old_token["allowedUrls"]
@@ -111,7 +111,7 @@ async def test_create_new_token() -> None:
     http_client.post.assert_called_once_with(
         endpoint="/v2/tokens",
         headers={"Content-type": "application/json"},
-        data=req_dto.dict(),
+        data=req_dto.dict(by_alias=True, exclude_none=True),
     )
 
     assert result.id == "3171672f-b6a3-43ae-90d5-0d559a7bf73b"
@@ -183,7 +183,7 @@ async def test_modify_token_info() -> None:
     http_client.patch.assert_called_once_with(
         endpoint="/v2/tokens/123",
         headers={"Content-type": "application/json"},
-        data=request_dto.dict(),
+        data=request_dto.dict(by_alias=True, exclude_none=True),
     )
 
 
@@ -224,3 +224,31 @@ async def test_get_default_token() -> None:
     assert result.date_modified == "2019-03-19T13:17:02.838Z"
     assert result.scopes == [TokenScopes.PROFILE_READ]
     assert result.asset_ids == [90, 98, 99, 100]
+
+
+@pytest.mark.asyncio
+async def test_iterate_tokens_follows_pages() -> None:
+    res_path = Path("Tokens/fixtures/list_response.json")
+    with open(res_path.resolve()) as f:
+        res = json.load(f)
+
+    http_client = AsyncMock()
+    http_client.get.side_effect = [
+        (
+            200,
+            res,
+            {"Link": "</v2/tokens?limit=1000&page=2&sortOrder=ASC>; rel='next'"},
+        ),
+        (200, {"items": None}, {}),
+    ]
+
+    client = TokensApiClient(http_client)
+    result = [
+        token async for token in client.iterate_tokens(ListTokensQueryParameters())
+    ]
+
+    assert len(result) == 2
+    assert http_client.get.call_args_list[1].kwargs == {
+        "endpoint": "/v2/tokens?limit=1000&page=2&sortOrder=ASC",
+        "headers": {},
+    }
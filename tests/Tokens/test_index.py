@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from Tokens.client import TokensApiClient
+from Tokens.dtos import ModifyTokenRequest, TokenMetadata
+from Tokens.enums import TokenScopes
+from Tokens.index import TokenAuthorizationIndex
+
+FIRST_TOKEN_ID = "58d917ab-f5df-494c-9109-66be3c53219d"
+SECOND_TOKEN_ID = "8494d9bc-a0c7-46ac-b0f5-58bdd6a9724a"
+
+
+async def _build_index() -> TokenAuthorizationIndex:
+    res_path = Path("Tokens/fixtures/list_response.json")
+    with open(res_path.resolve()) as f:
+        res = json.load(f)
+
+    http_client = AsyncMock()
+    http_client.get.return_value = (200, res, {})
+    return await TokenAuthorizationIndex.build(TokensApiClient(http_client))
+
+
+@pytest.mark.asyncio
+async def test_build_indexes_assets_and_scopes() -> None:
+    index = await _build_index()
+
+    assert len(index) == 2
+    assert index.tokens_for_asset(80) == {SECOND_TOKEN_ID}
+    assert index.tokens_for_asset(1) == frozenset()
+    assert index.tokens_for_scope(TokenScopes.ASSETS_READ) == {
+        FIRST_TOKEN_ID,
+        SECOND_TOKEN_ID,
+    }
+    assert index.can_read_asset(SECOND_TOKEN_ID, 98)
+    assert not index.can_read_asset(FIRST_TOKEN_ID, 98)
+    assert (
+        index.token_id_for_secret(index.get(SECOND_TOKEN_ID).token) == SECOND_TOKEN_ID
+    )
+
+
+@pytest.mark.asyncio
+async def test_incremental_updates() -> None:
+    index = await _build_index()
+
+    index.add(
+        TokenMetadata(
+            id="unrestricted",
+            scopes=[TokenScopes.ASSETS_READ],
+            allowedUrls=["https://example.com"],
+        )
+    )
+    assert index.tokens_for_asset(1) == {"unrestricted"}
+    assert index.tokens_for_url("https://example.com") == {"unrestricted"}
+    assert index.is_url_allowed("unrestricted", "https://example.com")
+    assert not index.is_url_allowed("unrestricted", "https://other.com")
+    assert index.is_url_allowed(SECOND_TOKEN_ID, "https://other.com")
+
+    index.apply_modification(SECOND_TOKEN_ID, ModifyTokenRequest(assetIds=[1]))
+    assert index.tokens_for_asset(80) == {"unrestricted"}
+    assert index.can_read_asset(SECOND_TOKEN_ID, 1)
+
+    index.remove("unrestricted")
+    assert index.tokens_for_asset(1) == {SECOND_TOKEN_ID}
+    assert index.tokens_for_url("https://example.com") == frozenset()
+    assert "unrestricted" not in index
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict
+
+
+class MockedStreamReader:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def iter_any(self) -> AsyncIterator[bytes]:
+        yield self.body
+
+
+@dataclass
+class MockedReturnValue:
+    headers: Dict
+    status: int
+    body: str
+
+    @property
+    def content(self) -> MockedStreamReader:
+        return MockedStreamReader(self.body.encode())
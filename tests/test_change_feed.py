@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from Assets.client import AssetsApiClient
+from Exports.client import ExportsApiClient
+from Tokens.client import TokensApiClient
+from change_feed import ChangeFeed
+from enums import ChangeType, Endpoints
+from http_client import AsyncClient
+from stand_in_server import Fault, IonStandInServer, StandInConfig
+
+CONFIG = StandInConfig(asset_count=5, token_count=3, exports_per_asset=1)
+
+
+def build_feed(http_client: AsyncClient, **options) -> ChangeFeed:
+    return ChangeFeed(
+        AssetsApiClient(http_client),
+        TokensApiClient(http_client),
+        ExportsApiClient(http_client),
+        export_asset_ids=[1, 2],
+        interval=0,
+        **options,
+    )
+
+
+def summarize(events):
+    return sorted(
+        (event.resource.value, event.change.value, event.key) for event in events
+    )
+
+
+def mutate(server: IonStandInServer) -> str:
+    server.assets[2]["name"] = "Renamed"
+    deleted_token_id = next(iter(server.tokens))
+    del server.tokens[deleted_token_id]
+    server._asset_exports(server.assets[1])["2"] = {
+        **server._asset_exports(server.assets[1])["1"],
+        "id": "2",
+    }
+    return deleted_token_id
+
+
+@pytest.mark.asyncio
+async def test_feed_publishes_differences_to_subscribers() -> None:
+    async with IonStandInServer(CONFIG) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            feed = build_feed(http_client)
+            everything = feed.subscribe()
+            assets_only = feed.subscribe([Endpoints.ASSETS])
+
+            assert await feed.poll() == []
+            deleted_token_id = mutate(server)
+            events = await feed.poll()
+
+    assert summarize(events) == [
+        ("ASSETS", "UPDATED", "2"),
+        ("EXPORTS", "CREATED", "1/2"),
+        ("TOKENS", "DELETED", deleted_token_id),
+    ]
+    assert everything.pending() == 3
+    assert assets_only.pending() == 1
+    event = await assets_only.get()
+    assert event.item.name == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_token_use_alone_is_not_a_change() -> None:
+    async with IonStandInServer(CONFIG) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            feed = build_feed(http_client)
+            subscription = feed.subscribe()
+
+            await feed.poll()
+            for token in server.tokens.values():
+                token["dateLastUsed"] = "2026-10-19T12:00:00.000Z"
+            events = await feed.poll()
+
+    assert events == []
+    assert subscription.pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_full_subscription_drops_events_without_blocking_others() -> None:
+    async with IonStandInServer(CONFIG) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            feed = build_feed(http_client)
+            stalled = feed.subscribe(maxsize=1)
+            everything = feed.subscribe()
+
+            await feed.poll()
+            mutate(server)
+            events = await feed.poll()
+
+    assert len(events) == 3
+    assert everything.pending() == 3
+    assert stalled.pending() == 1
+    assert stalled.dropped == 2
+    assert await stalled.get() == events[0]
+
+
+@pytest.mark.asyncio
+async def test_feed_resumes_from_saved_snapshot(tmp_path) -> None:
+    snapshot_path = tmp_path / "snapshot.json"
+    async with IonStandInServer(CONFIG) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            await build_feed(http_client, snapshot_path=snapshot_path).poll()
+            deleted_token_id = mutate(server)
+            events = await build_feed(http_client, snapshot_path=snapshot_path).poll()
+
+    assert summarize(events) == [
+        ("ASSETS", "UPDATED", "2"),
+        ("EXPORTS", "CREATED", "1/2"),
+        ("TOKENS", "DELETED", deleted_token_id),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_listing_keeps_previous_snapshot() -> None:
+    async with IonStandInServer(CONFIG) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            feed = build_feed(http_client, emit_initial=True)
+            initial = await feed.poll()
+            server.add_fault(Fault(path="/v2/tokens", status=500))
+            del server.assets[3]
+            failed = await feed.poll()
+            recovered = await feed.poll()
+
+    assert len(initial) == 5 + 3 + 2
+    assert {event.change for event in initial} == {ChangeType.CREATED}
+    assert summarize(failed) == [("ASSETS", "DELETED", "3")]
+    assert recovered == []
+
+
+@pytest.mark.asyncio
+async def test_run_polls_until_cancelled() -> None:
+    async with IonStandInServer(CONFIG) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            feed = ChangeFeed(AssetsApiClient(http_client), interval=0.01)
+            subscription = feed.subscribe()
+            task = asyncio.create_task(feed.run())
+            await asyncio.sleep(0.05)
+            server.assets[1]["name"] = "Renamed"
+            event = await asyncio.wait_for(subscription.get(), timeout=5)
+            task.cancel()
+
+    assert (event.change, event.key) == (ChangeType.UPDATED, "1")
@@ -0,0 +1,207 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerClient,
+    CircuitBreakerConfig,
+    PrometheusCircuitStateHook,
+)
+from User.client import UserApiClient
+from client_factory import ClientFactory
+from enums import CircuitState, Endpoints, Transport
+from exceptions import (
+    CircuitOpenError,
+    DeadlineExceeded,
+    ResourceNotFound,
+    UnknownError,
+)
+from http_client import AsyncClient
+from stand_in_server import Fault, IonStandInServer, StandInConfig
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def server_error() -> UnknownError:
+    return UnknownError("Service unavailable", status=503)
+
+
+async def fail() -> None:
+    raise server_error()
+
+
+async def succeed() -> str:
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_threshold_and_fails_fast() -> None:
+    breaker = CircuitBreaker("ion", CircuitBreakerConfig(failure_threshold=3))
+    calls = AsyncMock(side_effect=server_error())
+
+    for _ in range(3):
+        with pytest.raises(UnknownError):
+            await breaker.call(calls)
+
+    with pytest.raises(CircuitOpenError, match="Circuit `ion` is OPEN"):
+        await breaker.call(calls)
+    assert breaker.state == CircuitState.OPEN
+    assert calls.await_count == 3
+    assert breaker.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_breaker_ignores_client_errors_and_own_deadlines() -> None:
+    breaker = CircuitBreaker("ion", CircuitBreakerConfig(failure_threshold=1))
+
+    for error in (ResourceNotFound("missing", status=404), DeadlineExceeded()):
+        with pytest.raises(type(error)):
+            await breaker.call(AsyncMock(side_effect=error))
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_breaker_neither_counts_unrelated_errors() -> None:
+    breaker = CircuitBreaker("ion", CircuitBreakerConfig(failure_threshold=1))
+
+    with pytest.raises(ValueError):
+        await breaker.call(AsyncMock(side_effect=ValueError("bad payload")))
+
+    assert breaker.snapshot()["successes"] == 0
+    assert breaker.snapshot()["failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_on_http2_connection_errors() -> None:
+    httpx = pytest.importorskip("httpx")
+    async with ClientFactory(
+        "http://127.0.0.1:1",
+        "test-token",
+        transport=Transport.HTTP2,
+        circuit_breaker=CircuitBreakerConfig(failure_threshold=2),
+    ) as factory:
+        client: UserApiClient = factory.build(Endpoints.USER)
+
+        for _ in range(2):
+            with pytest.raises(httpx.TransportError):
+                await client.get_profile_info()
+        with pytest.raises(CircuitOpenError):
+            await client.get_profile_info()
+
+        snapshot = client._http_client.snapshot()
+    assert [breaker["state"] for breaker in snapshot.values()] == ["OPEN"]
+    assert [breaker["successes"] for breaker in snapshot.values()] == [0]
+
+
+@pytest.mark.asyncio
+async def test_breaker_half_open_probe_closes_on_success() -> None:
+    clock = FakeClock()
+    changes = []
+    breaker = CircuitBreaker(
+        "ion",
+        CircuitBreakerConfig(failure_threshold=1, recovery_timeout=10),
+        on_state_change=lambda name, old, new: changes.append(new),
+        clock=clock,
+    )
+    with pytest.raises(UnknownError):
+        await breaker.call(fail)
+
+    clock.now = 10
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert await breaker.call(succeed) == "ok"
+
+    assert breaker.state == CircuitState.CLOSED
+    assert changes == [CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.CLOSED]
+
+
+@pytest.mark.asyncio
+async def test_breaker_half_open_failure_reopens() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "ion",
+        CircuitBreakerConfig(failure_threshold=1, recovery_timeout=10),
+        clock=clock,
+    )
+    with pytest.raises(UnknownError):
+        await breaker.call(fail)
+    clock.now = 10
+    with pytest.raises(UnknownError):
+        await breaker.call(fail)
+
+    clock.now = 15
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.times_opened == 2
+
+
+@pytest.mark.asyncio
+async def test_deadline_on_hung_probe_keeps_circuit_half_open() -> None:
+    clock = FakeClock()
+    async with IonStandInServer(StandInConfig(asset_count=1)) as server:
+        server.add_fault(Fault(path="/v1/me", delay=1.0))
+        async with AsyncClient(server.url, "test-token") as http_client:
+            client = CircuitBreakerClient(
+                http_client,
+                CircuitBreakerConfig(failure_threshold=1, recovery_timeout=10),
+            )
+            breaker = client._breaker_for("/v1/me")
+            breaker._clock = clock
+            with pytest.raises(UnknownError):
+                await breaker.call(fail)
+            clock.now = 10
+
+            with pytest.raises(DeadlineExceeded):
+                async with client.deadline(0.05):
+                    await client.get("/v1/me", {})
+
+            assert breaker.state == CircuitState.HALF_OPEN
+            assert breaker.successes == 0
+            await client.get("/v1/me", {})
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_client_keeps_breaker_per_endpoint_family() -> None:
+    http_client = AsyncMock()
+    http_client.host = "https://api.cesium.com"
+    http_client.get.side_effect = [server_error(), (200, {}, {})]
+    client = CircuitBreakerClient(
+        http_client, CircuitBreakerConfig(failure_threshold=1)
+    )
+
+    with pytest.raises(UnknownError):
+        await client.get("/v1/assets/1", {})
+    with pytest.raises(CircuitOpenError):
+        await client.get("/v1/assets/2", {})
+    assert await client.get("/v2/tokens", {}) == (200, {}, {})
+
+    assert client.snapshot()["https://api.cesium.com/v1/assets"]["state"] == "OPEN"
+    assert client.snapshot()["https://api.cesium.com/v2/tokens"]["state"] == "CLOSED"
+
+
+def test_prometheus_hook_sets_state_gauge() -> None:
+    gauge = MagicMock()
+
+    PrometheusCircuitStateHook(gauge)("ion", CircuitState.CLOSED, CircuitState.OPEN)
+
+    gauge.labels.assert_called_once_with(circuit="ion")
+    gauge.labels.return_value.set.assert_called_once_with(2)
+
+
+def test_factory_wraps_transport_in_circuit_breaker() -> None:
+    factory = ClientFactory(
+        "https://google.com", "access_token", circuit_breaker=CircuitBreakerConfig()
+    )
+
+    result = factory.build(Endpoints.ASSETS)
+
+    assert type(result._http_client) == CircuitBreakerClient
+    assert result._http_client.host == "https://google.com"
@@ -1,9 +1,18 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
 from Tokens.client import TokensApiClient
+from circuit_breaker import CircuitBreakerConfig
 from client_factory import ClientFactory
-from enums import Endpoints
+from enums import Endpoints, Transport
 from exceptions import NotSupportedEndpointError
+from instrumentation import Instrumentation, RequestMetrics
+from rate_limit import RateLimit
+from stand_in_server import IonStandInServer, StandInConfig
 
 
 def test_build_when_success() -> None:
@@ -27,3 +36,118 @@ def test_build_when_not_supported_endpoint() -> None:
         NotSupportedEndpointError, match="Provided endpoint 'test' is not supported."
     ):
         factory.build("test")
+
+
+def test_build_shares_http_client_between_clients() -> None:
+    factory = ClientFactory("https://google.com", "access_token")
+
+    tokens_client = factory.build(Endpoints.TOKENS)
+    user_client = factory.build(Endpoints.USER)
+
+    assert tokens_client._http_client is user_client._http_client
+
+
+def test_build_with_http2_transport() -> None:
+    pytest.importorskip("httpx")
+    from http2_client import HTTP2Client
+
+    factory = ClientFactory(
+        "https://google.com", "access_token", transport=Transport.HTTP2
+    )
+    result = factory.build(Endpoints.ASSETS)
+
+    assert type(result._http_client) == HTTP2Client
+    assert result._http_client.host == "https://google.com"
+
+
+@pytest.mark.asyncio
+async def test_factory_context_closes_shared_connector() -> None:
+    async with ClientFactory("https://google.com", "access_token") as factory:
+        http_client = factory.build(Endpoints.USER)._http_client
+        async with http_client._build_session({}):
+            connector = http_client._connector
+
+    assert connector.closed
+    assert factory._http_client is None
+
+
+class RecordingHook:
+    def __init__(self):
+        self.metrics = []
+
+    def on_request_end(self, metrics: RequestMetrics) -> None:
+        self.metrics.append(metrics)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pre_opens_pooled_connections() -> None:
+    hook = RecordingHook()
+    async with IonStandInServer(StandInConfig(asset_count=1)) as server:
+        async with ClientFactory(
+            server.url,
+            "test-token",
+            instrumentation=Instrumentation([hook]),
+            circuit_breaker=CircuitBreakerConfig(),
+            rate_limit=RateLimit(max_concurrency=4),
+        ) as factory:
+            warmed_up = await factory.warm_up(8)
+            user_client = factory.build(Endpoints.USER)
+            await asyncio.gather(*(user_client.get_profile_info() for _ in range(4)))
+
+    warm_up_metrics, request_metrics = hook.metrics[:4], hook.metrics[4:]
+    assert warmed_up == 4
+    assert [metrics.method for metrics in warm_up_metrics] == ["HEAD"] * 4
+    assert all(metrics.connect is not None for metrics in warm_up_metrics)
+    assert len(request_metrics) == 4
+    assert all(metrics.connect is None for metrics in request_metrics)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_holds_connections_past_keepalive_timeout() -> None:
+    hook = RecordingHook()
+    async with IonStandInServer(StandInConfig(asset_count=1)) as server:
+        async with ClientFactory(
+            server.url,
+            "test-token",
+            instrumentation=Instrumentation([hook]),
+            keepalive_timeout=0.1,
+        ) as factory:
+            user_client = factory.build(Endpoints.USER)
+            await factory.warm_up(2)
+            await asyncio.sleep(0.3)
+            await user_client.get_profile_info()
+
+            await factory.warm_up(2, keepalive_timeout=30)
+            await asyncio.sleep(0.3)
+            await user_client.get_profile_info()
+
+    expired, held = hook.metrics[2], hook.metrics[5]
+    assert expired.connect is not None
+    assert held.connect is None
+
+
+IMPORT_CHECK = """
+import sys
+from client_factory import ClientFactory
+import client_pool
+from enums import Endpoints
+lazy = ("aiohttp", "pydantic", "Assets.client", "User.client")
+print([name for name in lazy if name in sys.modules])
+ClientFactory("https://google.com", "access_token").build(Endpoints.USER)
+print([name for name in lazy if name in sys.modules])
+"""
+
+
+def test_import_defers_clients_and_transport() -> None:
+    src_path = Path(__file__).resolve().parents[1] / "src"
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_CHECK],
+        capture_output=True,
+        check=True,
+        text=True,
+        cwd=src_path,
+    )
+    before_build, after_build = result.stdout.splitlines()
+
+    assert before_build == "[]"
+    assert after_build == "['pydantic', 'User.client']"
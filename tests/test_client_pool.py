@@ -0,0 +1,128 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from User.client import UserApiClient
+from client_pool import ClientPool
+from enums import Endpoints, Transport
+from rate_limit import RateLimit, RateLimitedClient, TokenBucket
+from stand_in_server import IonStandInServer, StandInConfig
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_factory_and_shares_connector() -> None:
+    async with ClientPool("https://google.com") as pool:
+        first = await pool.factory("token-a")
+        second = await pool.factory("token-b")
+
+        assert await pool.factory("token-a") is first
+        assert first.connector is second.connector
+        assert first.connector is not None
+        assert not first.connector.closed
+
+    assert first.connector.closed
+    assert len(pool) == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_passes_its_rate_limit_and_rejects_a_connector() -> None:
+    rate_limit = RateLimit(max_concurrency=2)
+    async with ClientPool("https://google.com", rate_limit=rate_limit) as pool:
+        factory = await pool.factory("token-a")
+
+    assert factory.rate_limit is rate_limit
+    with pytest.raises(ValueError, match="`connector`"):
+        ClientPool("https://google.com", connector=factory.connector)
+
+
+@pytest.mark.asyncio
+async def test_pool_does_not_share_http2_transport() -> None:
+    async with ClientPool("https://google.com", transport=Transport.HTTP2) as pool:
+        factory = await pool.factory("token-a")
+
+    assert factory.connector is None
+
+
+@pytest.mark.asyncio
+async def test_pool_evicts_least_recently_used() -> None:
+    async with ClientPool("https://google.com", max_tenants=2) as pool:
+        await pool.factory("token-a")
+        await pool.factory("token-b")
+        await pool.factory("token-a")
+        await pool.factory("token-c")
+
+        assert "token-a" in pool
+        assert "token-b" not in pool
+        assert "token-c" in pool
+
+
+@pytest.mark.asyncio
+async def test_pool_closes_idle_tenants() -> None:
+    clock = FakeClock()
+    async with ClientPool("https://google.com", idle_timeout=60, clock=clock) as pool:
+        await pool.factory("token-a")
+        clock.now = 30
+        await pool.factory("token-b")
+        clock.now = 60
+
+        assert await pool.close_idle() == 1
+        assert "token-a" not in pool
+        assert "token-b" in pool
+
+
+@pytest.mark.asyncio
+async def test_pool_builds_clients_per_tenant() -> None:
+    async with IonStandInServer(StandInConfig()) as server:
+        async with ClientPool(server.url) as pool:
+            client = await pool.build("token-a", Endpoints.USER)
+            other = await pool.build("token-b", Endpoints.USER)
+            await client.get_profile_info()
+            await other.get_profile_info()
+
+    assert type(client) == UserApiClient
+    assert client._http_client.bearer_token == "token-a"
+    assert other._http_client.bearer_token == "token-b"
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_client_caps_concurrency() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def get(endpoint, headers):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return 200, {}, {}
+
+    http_client = AsyncMock()
+    http_client.get.side_effect = get
+    client = RateLimitedClient(http_client, RateLimit(max_concurrency=2))
+
+    await asyncio.gather(*(client.get("/v1/me", {}) for _ in range(6)))
+
+    assert peak == 2
+    assert http_client.get.await_count == 6
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_for_refill() -> None:
+    bucket = TokenBucket(rate=100, capacity=2)
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    for _ in range(4):
+        await bucket.acquire()
+
+    assert loop.time() - started >= 0.015
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from concurrency import map_bounded
+from exceptions import ResourceNotFound
+
+
+@pytest.mark.asyncio
+async def test_map_bounded_keeps_order_and_reports_progress() -> None:
+    progress = []
+
+    async def double(value: int) -> int:
+        await asyncio.sleep(0.01 * (5 - value))
+        return value * 2
+
+    results = await map_bounded(
+        double, range(5), limit=3, progress_callback=lambda *p: progress.append(p)
+    )
+
+    assert results == [0, 2, 4, 6, 8]
+    assert progress[-1] == (5, 5)
+
+
+@pytest.mark.asyncio
+async def test_map_bounded_raises_the_failing_call_error() -> None:
+    async def find(value: int) -> int:
+        if value == 2:
+            raise ResourceNotFound("missing", status=404)
+        return value
+
+    with pytest.raises(ResourceNotFound, match="missing"):
+        await map_bounded(find, range(5), limit=2)
+
+
+@pytest.mark.asyncio
+async def test_map_bounded_returns_exceptions_when_asked() -> None:
+    async def find(value: int) -> int:
+        if value == 2:
+            raise ResourceNotFound("missing", status=404)
+        return value
+
+    results = await map_bounded(find, range(4), limit=2, return_exceptions=True)
+
+    assert results[:2] == [0, 1]
+    assert isinstance(results[2], ResourceNotFound)
+    assert results[3] == 3
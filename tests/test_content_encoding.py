@@ -0,0 +1,51 @@
+import gzip
+import importlib.util
+import zlib
+
+import pytest
+
+from content_encoding import ACCEPT_ENCODING, ContentDecoder
+from exceptions import MalformedResponseError
+
+BODY = b'{"items": [' + b", ".join(b'{"id": %d}' % n for n in range(500)) + b"]}"
+
+
+@pytest.mark.parametrize(
+    "content_encoding,encoded",
+    [
+        ("gzip", gzip.compress(BODY)),
+        ("deflate", zlib.compress(BODY)),
+        ("x-gzip", gzip.compress(BODY)),
+        ("deflate, gzip", gzip.compress(zlib.compress(BODY))),
+        ("gzip, identity", gzip.compress(BODY)),
+        ("", BODY),
+        ("identity", BODY),
+    ],
+)
+def test_decoder_decodes_chunk_by_chunk(content_encoding: str, encoded: bytes) -> None:
+    decoder = ContentDecoder(content_encoding)
+
+    decoded = [decoder.decode(encoded[n : n + 64]) for n in range(0, len(encoded), 64)]
+
+    assert b"".join(decoded) + decoder.flush() == BODY
+    assert max(len(chunk) for chunk in decoded) < len(BODY)
+
+
+def test_decoder_raises_on_corrupt_body() -> None:
+    decoder = ContentDecoder("gzip")
+
+    with pytest.raises(MalformedResponseError, match="`gzip`"):
+        decoder.decode(b"not gzip at all")
+
+
+def test_decoder_rejects_unsupported_encoding() -> None:
+    with pytest.raises(MalformedResponseError, match="`compress`"):
+        ContentDecoder("gzip, compress")
+
+
+def test_accept_encoding_offers_installed_decoders() -> None:
+    offered = ACCEPT_ENCODING.split(", ")
+
+    assert offered[-2:] == ["gzip", "deflate"]
+    assert ("br" in offered) == (importlib.util.find_spec("brotli") is not None)
+    assert ("zstd" in offered) == (importlib.util.find_spec("zstandard") is not None)
@@ -0,0 +1,116 @@
+from unittest.mock import ANY, AsyncMock, patch
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from Archives.client import ArchivesApiClient  # noqa: E402
+from Archives.dtos import (  # noqa: E402
+    CreateArchivePathParams,
+    CreateArchiveRequest,
+    DownloadArchivePathParams,
+    GetArchivePathParams,
+)
+from exceptions import InvalidCredentials, UnknownError  # noqa: E402
+from http2_client import HTTP2Client  # noqa: E402
+from stand_in_server import IonStandInServer, StandInConfig  # noqa: E402
+
+REQUEST = httpx.Request("GET", "https://google.com/test")
+
+
+@pytest.mark.asyncio
+@patch("http2_client.httpx.AsyncClient.get", new_callable=AsyncMock)
+async def test_get(client_mock_get: AsyncMock) -> None:
+    client_mock_get.return_value = httpx.Response(
+        200, json={"test-body": True}, headers={"test": "true"}, request=REQUEST
+    )
+
+    async with HTTP2Client("https://google.com", "test-token") as client:
+        status, res, headers = await client.get("/test", {})
+        assert client._client.headers["Authorization"] == "Bearer test-token"
+
+    client_mock_get.assert_called_once_with("/test", headers={}, timeout=ANY)
+    assert status == 200
+    assert res == {"test-body": True}
+    assert headers["test"] == "true"
+
+
+@pytest.mark.asyncio
+@patch("http2_client.httpx.AsyncClient.post", new_callable=AsyncMock)
+async def test_post_while_known_error(client_mock_post: AsyncMock) -> None:
+    client_mock_post.return_value = httpx.Response(401, text="test", request=REQUEST)
+    client = HTTP2Client("https://google.com", "test-token")
+
+    with pytest.raises(
+        InvalidCredentials,
+        match='POST request to: https://google.com/test has returned with status code: 401. Error: "test"',
+    ):
+        await client.post("/test", {"Content-type": "application/json"}, {"test": True})
+
+    client_mock_post.assert_called_once_with(
+        "/test",
+        headers={"Content-type": "application/json"},
+        timeout=ANY,
+        content='{"test": true}',
+    )
+
+
+@pytest.mark.asyncio
+@patch("http2_client.httpx.AsyncClient.patch", new_callable=AsyncMock)
+async def test_patch_with_empty_body(client_mock_patch: AsyncMock) -> None:
+    client_mock_patch.return_value = httpx.Response(204, request=REQUEST)
+    client = HTTP2Client("https://google.com", "test-token")
+
+    status, res, headers = await client.patch("/test", {}, {"test": True})
+
+    assert status == 204
+    assert res == {}
+
+
+@pytest.mark.asyncio
+@patch("http2_client.httpx.AsyncClient.delete", new_callable=AsyncMock)
+async def test_delete_while_unknown_error(client_mock_delete: AsyncMock) -> None:
+    client_mock_delete.return_value = httpx.Response(500, text="test", request=REQUEST)
+    client = HTTP2Client("https://google.com", "test-token")
+
+    with pytest.raises(
+        UnknownError,
+        match='DELETE request to: https://google.com/test has returned with status code: 500. Error: "test"',
+    ):
+        await client.delete("/test", {})
+
+
+@pytest.mark.asyncio
+@patch("http2_client.httpx.AsyncClient.get", new_callable=AsyncMock)
+async def test_error_carries_cf_ray_request_id(client_mock_get: AsyncMock) -> None:
+    client_mock_get.return_value = httpx.Response(
+        500, text="test", headers={"CF-Ray": "ray-1"}, request=REQUEST
+    )
+    client = HTTP2Client("https://google.com", "test-token")
+
+    with pytest.raises(UnknownError) as error:
+        await client.get("/test", {})
+
+    assert error.value.request_id == "ray-1"
+
+
+@pytest.mark.asyncio
+async def test_stream_downloads_archive_from_stand_in(tmp_path) -> None:
+    config = StandInConfig(
+        asset_count=1, archive_bytes=5000, archive_chunk_bytes=1000, polls_to_complete=1
+    )
+    async with IonStandInServer(config) as server:
+        async with HTTP2Client(server.url, "test-token") as client:
+            archives_client = ArchivesApiClient(client)
+            archive = await archives_client.create_archive(
+                CreateArchivePathParams(assetId=1), CreateArchiveRequest()
+            )
+            path_params = GetArchivePathParams(assetId=1, archiveId=archive.id)
+            await archives_client.get_info_about_archive(path_params)
+            written = await archives_client.download_archive_to_file(
+                DownloadArchivePathParams(assetId=1, archiveId=archive.id),
+                tmp_path / "1.zip",
+            )
+
+    assert written == 5000
+    assert (tmp_path / "1.zip").stat().st_size == 5000
@@ -1,28 +1,29 @@
-from dataclasses import dataclass
-from typing import Dict
+import gzip
 from unittest.mock import MagicMock, patch
 
 import pytest
-
-from exceptions import InvalidCredentials, UnknownError
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from exceptions import (
+    InvalidCredentials,
+    MalformedResponseError,
+    ResourceNotFound,
+    UnknownError,
+)
+from Tokens.client import TokensApiClient
+from Tokens.dtos import ListTokensQueryParameters
 from http_client import AsyncClient
-
-
-@dataclass
-class MockedReturnValue:
-    headers: Dict
-    status: int
-    content: str
-
-    async def json(self):
-        return {"test-body": True}
+from instrumentation import Instrumentation, RequestMetrics
+from stand_in_server import IonStandInServer, StandInConfig
+from tests.mocks import MockedReturnValue
 
 
 @pytest.mark.asyncio
 @patch("http_client.aiohttp.ClientSession.post")
 async def test_post(client_session_mock_post: MagicMock) -> None:
     client_session_mock_post.return_value.__aenter__.return_value = MockedReturnValue(
-        {"test": True}, 200, "test"
+        {"test": True}, 200, '{"test-body": true}'
     )
     client = AsyncClient("https://google.com", "test-token")
 
@@ -74,7 +75,7 @@ async def test_post_while_unknown_error(client_session_mock_post: MagicMock) ->
 @patch("http_client.aiohttp.ClientSession.get")
 async def test_get(client_session_mock_get: MagicMock) -> None:
     client_session_mock_get.return_value.__aenter__.return_value = MockedReturnValue(
-        {"test": True}, 200, "test"
+        {"test": True}, 200, '{"test-body": true}'
     )
     client = AsyncClient("https://google.com", "test-token")
 
@@ -126,7 +127,7 @@ async def test_get_while_unknown_error(client_session_mock_get: MagicMock) -> No
 @patch("http_client.aiohttp.ClientSession.patch")
 async def test_patch(client_session_mock_patch: MagicMock) -> None:
     client_session_mock_patch.return_value.__aenter__.return_value = MockedReturnValue(
-        {"test": True}, 204, "test"
+        {"test": True}, 204, '{"test-body": true}'
     )
     client = AsyncClient("https://google.com", "test-token")
 
@@ -182,7 +183,7 @@ async def test_patch_while_unknown_error(client_session_mock_patch: MagicMock) -
 @patch("http_client.aiohttp.ClientSession.delete")
 async def test_delete(client_session_mock_delete: MagicMock) -> None:
     client_session_mock_delete.return_value.__aenter__.return_value = MockedReturnValue(
-        {"test": True}, 204, "test"
+        {"test": True}, 204, '{"test-body": true}'
     )
     client = AsyncClient("https://google.com", "test-token")
 
@@ -225,3 +226,163 @@ async def test_delete_while_unknown_error(
         await client.delete("/test", {"Content-type": "application/json"})
 
     client_session_mock_delete.assert_called_once_with("/test")
+
+
+@pytest.mark.asyncio
+@patch("http_client.aiohttp.ClientSession.get")
+async def test_requests_share_one_connector(client_session_mock_get: MagicMock) -> None:
+    client_session_mock_get.return_value.__aenter__.return_value = MockedReturnValue(
+        {"test": True}, 200, '{"test-body": true}'
+    )
+
+    async with AsyncClient("https://google.com", "test-token") as client:
+        await client.get("/test", {})
+        connector = client._connector
+        await client.get("/test", {})
+
+        assert client._connector is connector
+        assert not connector.closed
+
+    assert connector.closed
+
+
+@pytest.mark.asyncio
+@patch("http_client.aiohttp.ClientSession.get")
+async def test_get_error_carries_structured_details(
+    client_session_mock_get: MagicMock,
+) -> None:
+    client_session_mock_get.return_value.__aenter__.return_value = MockedReturnValue(
+        {"Content-Type": "application/json", "X-Request-Id": "request-1"},
+        404,
+        '{"code": "ResourceNotFound", "message": "Asset not found."}',
+    )
+    client = AsyncClient("https://google.com", "test-token")
+
+    with pytest.raises(ResourceNotFound) as error:
+        await client.get("/test", {})
+
+    assert error.value.status == 404
+    assert error.value.code == "ResourceNotFound"
+    assert error.value.request_id == "request-1"
+
+
+@pytest.mark.asyncio
+@patch("http_client.aiohttp.ClientSession.get")
+async def test_get_while_body_is_not_json(client_session_mock_get: MagicMock) -> None:
+    client_session_mock_get.return_value.__aenter__.return_value = MockedReturnValue(
+        {"Content-Type": "text/html"}, 200, "<html></html>"
+    )
+    client = AsyncClient("https://google.com", "test-token")
+
+    with pytest.raises(
+        MalformedResponseError,
+        match="GET request to: https://google.com/test has returned a `text/html` body instead of JSON.",
+    ):
+        await client.get("/test", {})
+
+
+@pytest.mark.asyncio
+@patch("http_client.aiohttp.ClientSession.patch")
+async def test_patch_with_empty_body(client_session_mock_patch: MagicMock) -> None:
+    client_session_mock_patch.return_value.__aenter__.return_value = MockedReturnValue(
+        {}, 204, ""
+    )
+    client = AsyncClient("https://google.com", "test-token")
+
+    status, res, headers = await client.patch("/test", {}, {"test": True})
+
+    assert status == 204
+    assert res == {}
+
+
+@pytest.mark.asyncio
+async def test_stream_keeps_ion_credentials_on_ion_host() -> None:
+    seen_authorization = []
+
+    async def download(request: web.Request) -> web.Response:
+        seen_authorization.append(request.headers.get("Authorization"))
+        return web.Response(body=b"x" * 10, content_type="application/zip")
+
+    app = web.Application()
+    app.router.add_get("/file.zip", download)
+    async with TestServer(app) as server:
+        host = str(server.make_url("/")).rstrip("/")
+        url = f"{host}/file.zip"
+        async with AsyncClient(host, "secret") as client:
+            async with client.stream("/file.zip", {}, chunk_size=4) as response:
+                chunks = [chunk async for chunk in response.chunks]
+            async with client.stream(url, {"X-Tile-Token": "t"}) as response:
+                body = b"".join([chunk async for chunk in response.chunks])
+
+    assert chunks == [b"xxxx", b"xxxx", b"xx"]
+    assert response.content_length == 10
+    assert body == b"x" * 10
+    assert seen_authorization == ["Bearer secret", None]
+
+
+@pytest.mark.asyncio
+async def test_stream_raises_api_error() -> None:
+    async def missing(request: web.Request) -> web.Response:
+        return web.json_response({"code": "NotFound"}, status=404)
+
+    app = web.Application()
+    app.router.add_get("/missing", missing)
+    async with TestServer(app) as server:
+        host = str(server.make_url("/")).rstrip("/")
+        async with AsyncClient(host, "secret") as client:
+            with pytest.raises(ResourceNotFound) as error:
+                async with client.stream("/missing", {}):
+                    pass
+
+    assert error.value.code == "NotFound"
+
+
+class RecordingHook:
+    def __init__(self):
+        self.metrics = []
+
+    def on_request_end(self, metrics: RequestMetrics) -> None:
+        self.metrics.append(metrics)
+
+
+@pytest.mark.asyncio
+async def test_get_decodes_compressed_listing() -> None:
+    query_params = ListTokensQueryParameters(limit=100)
+    hook = RecordingHook()
+    config = StandInConfig(token_count=100, compress_responses=True)
+    async with IonStandInServer(config) as server:
+        async with AsyncClient(
+            server.url, "test-token", instrumentation=Instrumentation([hook])
+        ) as client:
+            tokens, _ = await TokensApiClient(client).list_tokens(query_params)
+    async with IonStandInServer(StandInConfig(token_count=100)) as server:
+        async with AsyncClient(server.url, "test-token") as client:
+            uncompressed_tokens, _ = await TokensApiClient(client).list_tokens(
+                query_params
+            )
+
+    metrics = hook.metrics[0]
+    assert tokens == uncompressed_tokens
+    assert metrics.content_encoding in ("gzip", "deflate", "br", "zstd")
+    assert metrics.response_wire_bytes < metrics.response_bytes / 2
+
+
+@pytest.mark.asyncio
+async def test_stream_decodes_compressed_download() -> None:
+    body = b"tile " * 10_000
+
+    async def download(request: web.Request) -> web.Response:
+        return web.Response(
+            body=gzip.compress(body), headers={"Content-Encoding": "gzip"}
+        )
+
+    app = web.Application()
+    app.router.add_get("/tile", download)
+    async with TestServer(app) as server:
+        host = str(server.make_url("/")).rstrip("/")
+        async with AsyncClient(host, "secret") as client:
+            async with client.stream("/tile", {}, chunk_size=16) as response:
+                chunks = [chunk async for chunk in response.chunks]
+
+    assert b"".join(chunks) == body
+    assert len(chunks) > 1
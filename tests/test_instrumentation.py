@@ -0,0 +1,107 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from Tokens.client import TokensApiClient
+from http_client import AsyncClient
+from instrumentation import (
+    Instrumentation,
+    OpenTelemetryHook,
+    PrometheusHook,
+    RequestMetrics,
+    current_operation,
+    operation,
+)
+from tests.mocks import MockedReturnValue
+
+
+class RecordingHook:
+    def __init__(self):
+        self.metrics = []
+
+    def on_request_end(self, metrics: RequestMetrics) -> None:
+        self.metrics.append(metrics)
+
+
+@pytest.mark.asyncio
+async def test_operation_sets_current_operation() -> None:
+    @operation("test_operation")
+    async def wrapped():
+        return current_operation()
+
+    assert await wrapped() == "test_operation"
+    assert current_operation() is None
+
+
+@pytest.mark.asyncio
+@patch("http_client.aiohttp.ClientSession.get")
+async def test_metrics_are_keyed_by_operation(
+    client_session_mock_get: MagicMock,
+) -> None:
+    client_session_mock_get.return_value.__aenter__.return_value = MockedReturnValue(
+        {}, 200, '{"id": "1", "scopes": []}'
+    )
+    hook = RecordingHook()
+    http_client = AsyncClient(
+        "https://google.com", "test-token", instrumentation=Instrumentation([hook])
+    )
+
+    await TokensApiClient(http_client).get_default_token()
+
+    assert len(hook.metrics) == 1
+    assert hook.metrics[0].operation == "get_default_token"
+    assert hook.metrics[0].method == "GET"
+    assert hook.metrics[0].endpoint == "/v2/tokens/default"
+    assert hook.metrics[0].status == 200
+    assert hook.metrics[0].error is None
+
+
+@pytest.mark.asyncio
+async def test_trace_hooks_measure_real_requests() -> None:
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response({"id": 1, "scopes": []})
+
+    app = web.Application()
+    app.router.add_get("/v1/me", handler)
+    hook = RecordingHook()
+
+    async with TestServer(app) as server:
+        async with AsyncClient(
+            str(server.make_url("")),
+            "test-token",
+            instrumentation=Instrumentation([hook]),
+        ) as http_client:
+            await http_client.get("/v1/me", {})
+
+    metrics = hook.metrics[0]
+    assert metrics.status == 200
+    assert metrics.connect is not None
+    assert metrics.first_byte is not None
+    assert metrics.response_bytes == len(b'{"id": 1, "scopes": []}')
+
+
+def test_adapters() -> None:
+    metrics = RequestMetrics(
+        operation="list_assets",
+        method="GET",
+        endpoint="/v1/assets",
+        status=200,
+        response_bytes=10,
+        duration=0.5,
+    )
+    duration_histogram = MagicMock()
+    tracer = MagicMock()
+
+    PrometheusHook(duration_histogram).on_request_end(metrics)
+    OpenTelemetryHook(tracer).on_request_end(metrics)
+
+    duration_histogram.labels.assert_called_once_with(
+        operation="list_assets", method="GET", status="200"
+    )
+    duration_histogram.labels.return_value.observe.assert_called_once_with(0.5)
+    assert tracer.start_span.call_args.args == ("list_assets",)
+    tracer.start_span.return_value.end.assert_called_once_with(
+        end_time=metrics.started_at_ns + 500_000_000
+    )
@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from Assets.client import AssetsApiClient
+from Assets.enums import AssetType
+from Tokens.client import TokensApiClient
+from enums import Endpoints
+from metadata_store import MetadataStore
+
+
+@pytest.mark.asyncio
+async def test_sync_assets_writes_only_differences(tmp_path: Path) -> None:
+    res_path = Path("Assets/fixtures/list_response.json")
+    with open(res_path.resolve()) as f:
+        res = json.load(f)
+
+    http_client = AsyncMock()
+    http_client.get.return_value = (200, res, {})
+    store = MetadataStore(tmp_path / "metadata.sqlite")
+
+    result = await store.sync_assets(AssetsApiClient(http_client))
+    assert (result.created, result.updated, result.deleted) == (2, 0, 0)
+
+    res["items"][1]["name"] = "My Renamed House"
+    res["items"].pop(0)
+    result = await store.sync_assets(AssetsApiClient(http_client))
+    assert (result.created, result.updated, result.deleted) == (0, 1, 1)
+
+    assert store.get_asset("1") is None
+    assert store.get_asset("92391").name == "My Renamed House"
+    assert [a.id for a in store.get_assets(type=AssetType.THREEDTILES)] == ["92391"]
+    assert store.get_assets(type=AssetType.TERRAIN) == []
+    assert store.is_fresh(Endpoints.ASSETS, max_age=60)
+    assert not store.is_fresh(Endpoints.TOKENS, max_age=60)
+
+
+@pytest.mark.asyncio
+async def test_sync_tokens_persists_between_instances(tmp_path: Path) -> None:
+    res_path = Path("Tokens/fixtures/list_response.json")
+    with open(res_path.resolve()) as f:
+        res = json.load(f)
+
+    http_client = AsyncMock()
+    http_client.get.return_value = (200, res, {})
+    store = MetadataStore(tmp_path / "metadata.sqlite")
+    await store.sync_tokens(TokensApiClient(http_client))
+    store.close()
+
+    reopened_store = MetadataStore(tmp_path / "metadata.sqlite")
+    tokens = reopened_store.get_tokens()
+
+    assert [t.id for t in tokens] == [
+        "58d917ab-f5df-494c-9109-66be3c53219d",
+        "8494d9bc-a0c7-46ac-b0f5-58bdd6a9724a",
+    ]
+    assert reopened_store.get_token(tokens[1].id).asset_ids == [80, 98]
+    assert reopened_store.last_synced_at(Endpoints.TOKENS) is not None
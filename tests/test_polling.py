@@ -0,0 +1,24 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from exceptions import DeadlineExceeded
+from polling import poll_until
+
+
+@pytest.mark.asyncio
+async def test_poll_until_returns_first_done_result() -> None:
+    fetch = AsyncMock(side_effect=["QUEUED", "IN_PROGRESS", "COMPLETE"])
+
+    result = await poll_until(fetch, lambda status: status == "COMPLETE", interval=0)
+
+    assert result == "COMPLETE"
+    assert fetch.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_poll_until_raises_when_timeout_elapses() -> None:
+    fetch = AsyncMock(return_value="IN_PROGRESS")
+
+    with pytest.raises(DeadlineExceeded):
+        await poll_until(fetch, lambda status: False, interval=0.01, timeout=0.05)
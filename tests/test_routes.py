@@ -0,0 +1,37 @@
+from Assets.dtos import ListAssetsQueryParameters
+from Assets.enums import AssetStatus
+from Tokens.dtos import ListTokensQueryParameters
+from Tokens.enums import SortByType
+import routes
+
+
+def test_route_quotes_path_params() -> None:
+    assert routes.ASSET.path(asset_id=1) == "/v1/assets/1"
+    assert routes.TOKEN.path(token_id="a/b c") == "/v2/tokens/a%2Fb%20c"
+    assert (
+        routes.ARCHIVE_DOWNLOAD.path(asset_id=1, archive_id=2)
+        == "/v1/assets/1/archives/2/download"
+    )
+
+
+def test_list_assets_query_encodes_search() -> None:
+    query_params = ListAssetsQueryParameters(
+        search="roads & rails", status=[AssetStatus.COMPLETE, AssetStatus.ERROR]
+    )
+
+    assert query_params.to_query_params() == (
+        "?limit=1000&page=1&sortBy=ID&sortOrder=ASC&search=roads%20%26%20rails"
+        "&status=COMPLETE&status=ERROR"
+    )
+
+
+def test_list_tokens_query_reuses_static_fragment() -> None:
+    routes.encode_query_fragment.cache_clear()
+    query_params = ListTokensQueryParameters(search="a+b", sortBy=SortByType.NAME)
+
+    first_page = query_params.to_query_params()
+    second_page = query_params.copy(update={"page": 2}).to_query_params()
+
+    assert first_page == "?limit=1000&page=1&sortOrder=ASC&search=a%2Bb&sortBy=NAME"
+    assert second_page == "?limit=1000&page=2&sortOrder=ASC&search=a%2Bb&sortBy=NAME"
+    assert routes.encode_query_fragment.cache_info().hits == 1
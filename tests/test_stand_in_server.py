@@ -0,0 +1,174 @@
+import pytest
+
+from Assets.client import AssetsApiClient
+from Assets.dtos import (
+    AssetInfoPathParams,
+    CreateAssetRequest,
+    DeleteAssetPathParams,
+    ListAssetsQueryParameters,
+)
+from Assets.enums import AssetStatus, AssetType
+from Exports.client import ExportsApiClient
+from Exports.dtos import ListExportsPathParams
+from Tokens.client import TokensApiClient
+from Tokens.dtos import CreateTokenRequest, GetTokenInfoPathParameters
+from Tokens.enums import TokenScopes
+from User.client import UserApiClient
+from exceptions import ResourceNotFound, UnknownError
+from http_client import AsyncClient
+from stand_in_server import Fault, IonStandInServer, StandInConfig
+
+
+@pytest.mark.asyncio
+async def test_listing_follows_link_headers() -> None:
+    config = StandInConfig(asset_count=25, max_page_size=10)
+    async with IonStandInServer(config) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            client = AssetsApiClient(http_client)
+            assets = [
+                asset
+                async for asset in client.iterate_assets(ListAssetsQueryParameters())
+            ]
+
+        assert [asset.id for asset in assets] == [str(i) for i in range(1, 26)]
+        assert server.request_count == 3
+
+
+@pytest.mark.asyncio
+async def test_serves_tokens_and_profile() -> None:
+    async with IonStandInServer(StandInConfig(token_count=3)) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            default_token = await TokensApiClient(http_client).get_default_token()
+            profile = await UserApiClient(http_client).get_profile_info()
+
+    assert default_token.is_default is True
+    assert profile.username == "stand-in"
+
+
+@pytest.mark.asyncio
+async def test_errors() -> None:
+    async with IonStandInServer(StandInConfig(asset_count=1)) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            with pytest.raises(ResourceNotFound):
+                await AssetsApiClient(http_client).get_info_about_asset(
+                    AssetInfoPathParams(assetId=2)
+                )
+
+    config = StandInConfig(asset_count=1, error_rate=1.0)
+    async with IonStandInServer(config) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            with pytest.raises(UnknownError, match="status code: 503"):
+                await AssetsApiClient(http_client).get_info_about_asset(
+                    AssetInfoPathParams(assetId=1)
+                )
+
+
+@pytest.mark.asyncio
+async def test_scripted_faults_are_applied_in_order() -> None:
+    async with IonStandInServer(StandInConfig(asset_count=1)) as server:
+        fault = server.add_fault(
+            Fault(path="/v1/assets/1", method="GET", status=429, retry_after=1, skip=1)
+        )
+        server.add_fault(Fault(path="/v1/me", body_chunk_delay=0.001, times=None))
+
+        async with AsyncClient(server.url, "test-token") as http_client:
+            client = AssetsApiClient(http_client)
+            path_params = AssetInfoPathParams(assetId=1)
+            await client.get_info_about_asset(path_params)
+            with pytest.raises(UnknownError, match="status code: 429"):
+                await client.get_info_about_asset(path_params)
+            await client.get_info_about_asset(path_params)
+            profile = await UserApiClient(http_client).get_profile_info()
+
+    assert fault.matched == 3
+    assert profile.id == 1
+
+
+@pytest.mark.asyncio
+async def test_stateful_assets_progress_to_complete() -> None:
+    config = StandInConfig(asset_count=0, polls_to_complete=3)
+    async with IonStandInServer(config) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            client = AssetsApiClient(http_client)
+            created = await client.create_a_new_asset(
+                CreateAssetRequest(
+                    name="From S3",
+                    type=AssetType.THREEDTILES,
+                    options={"sourceType": "3DTILES"},
+                    **{
+                        "from": {
+                            "bucket": "source",
+                            "credentials": {"accessKey": "a", "secretAccessKey": "b"},
+                        }
+                    },
+                )
+            )
+            path_params = AssetInfoPathParams(assetId=int(created.asset_metadata.id))
+            statuses = [
+                (await client.get_info_about_asset(path_params)).status
+                for _ in range(3)
+            ]
+            await client.delete_asset(
+                DeleteAssetPathParams(assetId=path_params.asset_id)
+            )
+
+    assert created.asset_metadata.status == AssetStatus.NOT_STARTED
+    assert created.upload_location is None
+    assert statuses == [
+        AssetStatus.IN_PROGRESS,
+        AssetStatus.IN_PROGRESS,
+        AssetStatus.COMPLETE,
+    ]
+    assert server.assets == {}
+
+
+@pytest.mark.asyncio
+async def test_stand_in_only_reads_ion_wire_names() -> None:
+    source = {"bucket": "source", "credentials": {"accessKey": "a"}}
+    async with IonStandInServer(StandInConfig(asset_count=0)) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            _, created, _ = await http_client.post(
+                "/v1/assets",
+                {},
+                {"name": "n", "type": "3DTILES", "options": {}, "asset_from": source},
+            )
+            _, token, _ = await http_client.post(
+                "/v2/tokens",
+                {},
+                {"name": "n", "scopes": ["assets:read"], "asset_ids": [1]},
+            )
+
+    assert created["assetMetadata"]["status"] == "AWAITING_FILES"
+    assert token["assetIds"] is None
+
+
+@pytest.mark.asyncio
+async def test_stateful_tokens() -> None:
+    async with IonStandInServer(StandInConfig(token_count=1)) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            client = TokensApiClient(http_client)
+            created = await client.create_new_token(
+                CreateTokenRequest(name="tenant", scopes=[TokenScopes.ASSETS_READ])
+            )
+            fetched = await client.get_info_about_token(
+                GetTokenInfoPathParameters(tokenId=created.id)
+            )
+
+    assert fetched.name == "tenant"
+    assert len(server.tokens) == 2
+
+
+@pytest.mark.asyncio
+async def test_iterate_exports_with_prefetch() -> None:
+    config = StandInConfig(asset_count=1, exports_per_asset=25, max_page_size=10)
+    async with IonStandInServer(config) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            exports = [
+                export
+                async for export in ExportsApiClient(http_client).iterate_exports(
+                    ListExportsPathParams(assetId=1), prefetch=True
+                )
+            ]
+
+    assert len(exports) == 25
+    assert len({export.id for export in exports}) == 25
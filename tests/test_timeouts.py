@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from Assets.client import AssetsApiClient
+from Assets.dtos import ListAssetsQueryParameters
+from User.client import UserApiClient
+from exceptions import DeadlineExceeded
+from http_client import AsyncClient
+from stand_in_server import Fault, IonStandInServer, StandInConfig
+from timeouts import Timeouts, deadline, remaining_budget
+
+
+@pytest.mark.asyncio
+async def test_per_operation_timeout() -> None:
+    async with IonStandInServer() as server:
+        server.add_fault(Fault(path="/v1/me", delay=0.5))
+        async with AsyncClient(
+            server.url,
+            "test-token",
+            operation_timeouts={"get_profile_info": Timeouts(total=0.05)},
+        ) as http_client:
+            with pytest.raises(TimeoutError):
+                await UserApiClient(http_client).get_profile_info()
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_paginated_listing() -> None:
+    config = StandInConfig(asset_count=10, max_page_size=1, latency=0.05)
+    async with IonStandInServer(config) as server:
+        async with AsyncClient(server.url, "test-token") as http_client:
+            client = AssetsApiClient(http_client)
+            listed = []
+            with pytest.raises(DeadlineExceeded):
+                async with http_client.deadline(0.18):
+                    async for asset in client.iterate_assets(
+                        ListAssetsQueryParameters()
+                    ):
+                        listed.append(asset)
+
+    assert 1 <= len(listed) < 10
+
+
+@pytest.mark.asyncio
+async def test_nested_deadlines_keep_the_tighter_budget() -> None:
+    assert remaining_budget() is None
+    async with deadline(10):
+        async with deadline(60):
+            assert remaining_budget() <= 10
+        with pytest.raises(DeadlineExceeded):
+            async with deadline(0.01):
+                await asyncio.sleep(1)
+
+
+def test_timeouts_bounded_by_budget() -> None:
+    assert Timeouts(total=30).bounded_by(None).total == 30
+    assert Timeouts(total=30).bounded_by(5).total == 5
+    assert Timeouts(total=None).bounded_by(5).total == 5
+    with pytest.raises(DeadlineExceeded):
+        Timeouts().bounded_by(0)